@@ -1,31 +1,141 @@
+import logging
 import tkinter as tk
 from tkinter import messagebox
-from typing import Any, Optional, Tuple
+from typing import Any, Callable, Optional, Sequence, Tuple, Union
 
-import pyautogui
+from PIL import Image, ImageTk
 
-from external_service.vision_ocr_service import VisionOCRService
+from external_service.vision_ocr_service import (
+    VisionOCRService,
+    get_shared_ocr_service,
+)
 from utils.config_manager import ConfigManager
-from utils.constants import MIN_SCREENSHOT_SIZE, UIColors, UILabels, UIMessages
+from utils.constants import (
+    MIN_SCREENSHOT_SIZE,
+    SELECTION_REDRAW_INTERVAL_MS,
+    UIColors,
+    UILabels,
+    UILayout,
+    UIMessages,
+)
+from utils.screen_grabber import ScreenGrabber, create_screen_grabber
+
+# マウスイベントの state でShiftキーの押下を表すビット
+_SHIFT_MASK = 0x0001
+
+# 画面上の範囲（left, top, right, bottom）
+Bounds = Tuple[int, int, int, int]
+
+
+def ocr_regions(ocr_service: VisionOCRService, images: Sequence[Image.Image]) -> str:
+    """複数範囲の画像を1回のバッチリクエストでOCRし、選択順に改行で連結
+
+    1範囲のみの場合は大きな画像のタイル分割にも対応する perform_ocr を使う。
+    失敗した範囲はその位置に「[範囲N: OCR失敗]」を挿入して選択順を保ち、
+    全範囲が失敗した場合は最初の例外を送出する。
+    """
+    if len(images) == 1:
+        return ocr_service.perform_ocr(images[0])
+
+    results = ocr_service.perform_ocr_batch(images)
+    errors = [result for result in results if isinstance(result, Exception)]
+    if errors and len(errors) == len(results):
+        raise errors[0]
+    texts = []
+    for index, result in enumerate(results, 1):
+        if isinstance(result, Exception):
+            logging.warning(f"範囲{index}のOCRに失敗しました: {result}")
+            texts.append(UIMessages.CAPTURE_REGION_FAILED.format(index=index))
+        else:
+            texts.append(result.rstrip("\n"))
+    logging.info(f"複数範囲のOCRが完了しました: {len(images)}範囲")
+    return "\n".join(texts)
 
 
 class ScreenCapture:
-    """画面の矩形領域を選択してOCR処理を行う"""
+    """画面の矩形領域を選択してOCR処理を行う
+
+    master を指定した場合はそのウィンドウが所有するToplevelとしてオーバーレイを作成し、
+    start() で表示・選択後に非表示にして再利用する（mainloopを別に実行しない）。
+    省略した場合は独自のTkルートを作成し、呼び出し元が root.mainloop() を実行する。
+
+    freeze_screen が有効な場合は表示時に画面全体を一度だけ撮影して背景に表示し、
+    選択範囲はその画像から切り出す（マウスを離した後の撮影を行わない）。
 
-    def __init__(self) -> None:
-        self.root: tk.Tk = tk.Tk()
-        self.ocr_service = VisionOCRService()
+    Shift+ドラッグで範囲を追加し、Shiftを押さずに範囲を選択するかEnterキーで確定する。
+    確定した範囲の画像は選択順に screenshots へ格納する。
+
+    Args:
+        ocr_service: OCRサービス（省略時は共有インスタンス）
+        capture_only: True の場合はスクリーンショットの取得のみ行い、OCRは呼び出し元に任せる
+        master: オーバーレイを所有するウィンドウ
+        config_manager: 設定（省略時はconfig.iniを読み込む）
+    """
+
+    def __init__(
+        self,
+        ocr_service: Optional[VisionOCRService] = None,
+        capture_only: bool = False,
+        master: Optional[tk.Misc] = None,
+        config_manager: Optional[ConfigManager] = None,
+    ) -> None:
+        self.root: Union[tk.Tk, tk.Toplevel] = (
+            tk.Toplevel(master) if master is not None else tk.Tk()
+        )
+        self.capture_only = capture_only
+        self.ocr_service = ocr_service
+        if self.ocr_service is None and not capture_only:
+            self.ocr_service = get_shared_ocr_service()
         self.result_text: Optional[str] = None
-        self._setup_window()
+        self.screenshots: list[Image.Image] = []
+        self.regions: list[Bounds] = []
+        self._on_finished: Optional[Callable[[list[Image.Image]], None]] = None
+        self._setup_window(config_manager)
         self._setup_canvas()
         self._bind_events()
+        if master is not None:
+            # 表示は start() まで行わない
+            self.root.withdraw()
+        else:
+            self._freeze_screen()
+
+    def start(self, on_finished: Callable[[list[Image.Image]], None]) -> None:
+        """オーバーレイを表示して範囲選択を開始
+
+        Args:
+            on_finished: 選択の完了・中止時に、選択順のスクリーンショット
+                （中止・失敗時は空のリスト）を受け取るコールバック
+        """
+        self._on_finished = on_finished
+        self._reset_selection()
+        self._freeze_screen()
+        self.root.deiconify()
+        self.root.attributes("-topmost", True)
+        self.root.focus_force()
+
+    def _reset_selection(self) -> None:
+        self._cancel_redraw()
+        self.canvas.itemconfigure(self.selection_rect, state=tk.HIDDEN)
+        self.canvas.itemconfigure(self.size_label, state=tk.HIDDEN)
+        self._label_size = None
+        self.start_x = self.start_y = self.end_x = self.end_y = None
+        for item in self._region_items:
+            self.canvas.delete(item)
+        self._region_items = []
+        self.regions = []
+        self.result_text = None
+        self.screenshots = []
 
-    def _setup_window(self) -> None:
+    def _setup_window(self, config_manager: Optional[ConfigManager] = None) -> None:
         try:
-            self.config_manager = ConfigManager()
+            self.config_manager = config_manager or ConfigManager()
             transparency, outline_width = (
                 self.config_manager.get_screen_capture_settings()
             )
+            self.freeze_screen: bool = self.config_manager.get_freeze_screen()
+            self.screen_grabber: ScreenGrabber = create_screen_grabber(
+                self.config_manager.get_screen_grab_backend()
+            )
         except Exception as e:
             messagebox.showerror(
                 UILabels.TITLE_CONFIG_ERROR,
@@ -33,6 +143,7 @@ class ScreenCapture:
             )
             raise
 
+        self.transparency: float = transparency
         self.root.attributes("-alpha", transparency)
         self.root.attributes("-fullscreen", True)
         self.root.attributes("-topmost", True)
@@ -54,48 +165,215 @@ class ScreenCapture:
         self.start_y: Optional[int] = None
         self.end_x: Optional[int] = None
         self.end_y: Optional[int] = None
-        self.selection_rect: Optional[int] = None
+
+        # 静止画モードの背景（選択矩形より下に描画する）
+        self.background_image: int = self.canvas.create_image(
+            0, 0, anchor=tk.NW, state=tk.HIDDEN
+        )
+        self._snapshot: Optional[Image.Image] = None
+        self._background_photo: Optional[ImageTk.PhotoImage] = None
+
+        # 選択矩形・寸法・操作説明のアイテムは一度だけ作成し、
+        # ドラッグ中は座標と文字列の更新のみ行う（アイテムの削除・再作成をしない）
+        self.selection_rect: int = self.canvas.create_rectangle(
+            0,
+            0,
+            0,
+            0,
+            outline=UIColors.SELECTION_OUTLINE,
+            width=self.outline_width,
+            state=tk.HIDDEN,
+        )
+        self.size_label: int = self.canvas.create_text(
+            0,
+            0,
+            anchor=tk.NW,
+            fill=UIColors.SELECTION_OUTLINE,
+            font=UILayout.SELECTION_LABEL_FONT,
+            state=tk.HIDDEN,
+        )
+        self.hint_label: int = self.canvas.create_text(
+            self.screen_width // 2,
+            UILayout.CAPTURE_HINT_MARGIN,
+            anchor=tk.N,
+            text=UIMessages.CAPTURE_HINT,
+            fill=UIColors.SELECTION_OUTLINE,
+            font=UILayout.SELECTION_LABEL_FONT,
+        )
+        self._pending_point: Optional[Tuple[int, int]] = None
+        self._redraw_job: Optional[str] = None
+        self._label_size: Optional[Tuple[int, int]] = None
+        # Shift+ドラッグで追加した範囲の枠と番号
+        self._region_items: list[int] = []
 
     def _bind_events(self) -> None:
         self.canvas.bind("<Button-1>", self._on_press)
         self.canvas.bind("<B1-Motion>", self._on_drag)
         self.canvas.bind("<ButtonRelease-1>", self._on_release)
         self.root.bind("<Escape>", self._cancel)
+        self.root.bind("<Return>", self._confirm)
+        # Alt+F4やウィンドウマネージャーで閉じられた場合も中止として終了する
+        self.root.protocol("WM_DELETE_WINDOW", self._cancel)
 
     def _on_press(self, event: tk.Event) -> None:
+        self._cancel_redraw()
         self.start_x = event.x
         self.start_y = event.y
-        if self.selection_rect:
-            self.canvas.delete(self.selection_rect)
+        self.canvas.coords(self.selection_rect, event.x, event.y, event.x, event.y)
+        self.canvas.itemconfigure(self.selection_rect, state=tk.NORMAL)
+        self.canvas.itemconfigure(self.size_label, state=tk.HIDDEN)
+        self._label_size = None
 
     def _on_drag(self, event: tk.Event) -> None:
-        curr_x = event.x
-        curr_y = event.y
-
-        if self.selection_rect:
-            self.canvas.delete(self.selection_rect)
-
-        if self.start_x is not None and self.start_y is not None:
-            self.selection_rect = self.canvas.create_rectangle(
-                self.start_x,
-                self.start_y,
-                curr_x,
-                curr_y,
-                outline=UIColors.SELECTION_OUTLINE,
-                width=self.outline_width,
+        # 高頻度のモーションイベントは最新の位置のみ保持し、再描画は1フレームに1回へまとめる
+        self._pending_point = (event.x, event.y)
+        if self._redraw_job is None:
+            self._redraw_job = self.root.after(
+                SELECTION_REDRAW_INTERVAL_MS, self._redraw_selection
             )
 
+    def _redraw_selection(self) -> None:
+        """保留中のカーソル位置で選択矩形と寸法表示を更新"""
+        self._redraw_job = None
+        if self._pending_point is None or self.start_x is None or self.start_y is None:
+            return
+        curr_x, curr_y = self._pending_point
+        self._pending_point = None
+
+        self.canvas.coords(
+            self.selection_rect, self.start_x, self.start_y, curr_x, curr_y
+        )
+        size = (abs(curr_x - self.start_x), abs(curr_y - self.start_y))
+        if size != self._label_size:
+            self._label_size = size
+            self.canvas.itemconfigure(
+                self.size_label,
+                text=UIMessages.CAPTURE_SIZE.format(width=size[0], height=size[1]),
+                state=tk.NORMAL,
+            )
+        margin = self.outline_width + UILayout.SELECTION_LABEL_MARGIN
+        self.canvas.coords(
+            self.size_label,
+            min(self.start_x, curr_x) + margin,
+            min(self.start_y, curr_y) + margin,
+        )
+
+    def _cancel_redraw(self) -> None:
+        if self._redraw_job is not None:
+            self.root.after_cancel(self._redraw_job)
+            self._redraw_job = None
+        self._pending_point = None
+
     def _on_release(self, event: tk.Event) -> None:
+        self._cancel_redraw()
         self.end_x = event.x
         self.end_y = event.y
+        # state は修飾キーを表す整数（一部のイベントでは文字列）
+        if isinstance(event.state, int) and event.state & _SHIFT_MASK:
+            self._add_region()
+            return
+        self._complete()
+
+    def _confirm(self, event: tk.Event) -> None:
+        """Enterキーで追加済みの範囲を確定"""
+        if self.regions:
+            self._cancel_redraw()
+            self.start_x = self.start_y = self.end_x = self.end_y = None
+            self._complete()
+
+    def _add_region(self) -> None:
+        """選択した範囲を追加済みの範囲に加え、次の範囲の選択を待つ"""
+        bounds = self._get_screenshot_bounds() if self.start_x is not None else None
+        self.canvas.itemconfigure(self.selection_rect, state=tk.HIDDEN)
+        self.canvas.itemconfigure(self.size_label, state=tk.HIDDEN)
+        self._label_size = None
+        self.start_x = self.start_y = self.end_x = self.end_y = None
+        if bounds is None:
+            return
+
+        self.regions.append(bounds)
+        left, top, right, bottom = bounds
+        margin = self.outline_width + UILayout.SELECTION_LABEL_MARGIN
+        self._region_items.append(
+            self.canvas.create_rectangle(
+                left,
+                top,
+                right,
+                bottom,
+                outline=UIColors.SELECTION_OUTLINE,
+                width=self.outline_width,
+            )
+        )
+        self._region_items.append(
+            self.canvas.create_text(
+                left + margin,
+                top + margin,
+                anchor=tk.NW,
+                text=str(len(self.regions)),
+                fill=UIColors.SELECTION_OUTLINE,
+                font=UILayout.SELECTION_LABEL_FONT,
+            )
+        )
+
+    def _complete(self) -> None:
+        """オーバーレイを閉じて選択した全範囲を撮影し、範囲選択を終了"""
         self.root.withdraw()
+        if self._snapshot is None:
+            # オーバーレイが画面から消えてから撮影する
+            self.root.update_idletasks()
         self._process_screenshot()
-        self.root.quit()
+        self._finish()
+
+    def _cancel(self, event: Optional[tk.Event] = None) -> None:
+        self._cancel_redraw()
+        self.root.withdraw()
+        self._finish()
 
-    def _cancel(self, event: tk.Event) -> None:
-        self.root.quit()
+    def _freeze_screen(self) -> None:
+        """画面全体を撮影してオーバーレイの背景に表示（撮影に失敗した場合は範囲ごとの撮影に戻す）"""
+        self._release_snapshot()
+        if self.freeze_screen:
+            try:
+                self._snapshot = self.screen_grabber.grab()
+            except Exception as e:
+                logging.warning(
+                    f"画面全体の撮影に失敗したため、範囲ごとに撮影します: {e}"
+                )
+
+        if self._snapshot is None:
+            self.root.attributes("-alpha", self.transparency)
+            return
+
+        display = self._snapshot
+        if display.size != (self.screen_width, self.screen_height):
+            # 高DPI環境では撮影画像が画面の論理サイズより大きいため、表示用のみ縮小する
+            display = display.resize(
+                (self.screen_width, self.screen_height), Image.Resampling.BILINEAR
+            )
+        self._background_photo = ImageTk.PhotoImage(display, master=self.root)
+        self.canvas.itemconfigure(
+            self.background_image, image=self._background_photo, state=tk.NORMAL
+        )
+        # 静止画が実際の画面と重なって見えるよう不透明で表示する
+        self.root.attributes("-alpha", 1.0)
+
+    def _release_snapshot(self) -> None:
+        if self._snapshot is None:
+            return
+        self.canvas.itemconfigure(self.background_image, image="", state=tk.HIDDEN)
+        self._background_photo = None
+        self._snapshot = None
+
+    def _finish(self) -> None:
+        """範囲選択を終了し、start() のコールバックへ結果を渡す"""
+        self._release_snapshot()
+        if self._on_finished is None:
+            self.root.quit()
+            return
+        on_finished, self._on_finished = self._on_finished, None
+        on_finished(self.screenshots)
 
-    def _get_screenshot_bounds(self) -> Optional[Tuple[int, int, int, int]]:
+    def _get_screenshot_bounds(self) -> Optional[Bounds]:
         """ユーザーが選択した矩形領域の座標を計算"""
         if any(c is None for c in [self.start_x, self.start_y, self.end_x, self.end_y]):
             raise ValueError(UIMessages.COORD_INVALID)
@@ -115,14 +393,38 @@ class ScreenCapture:
 
         return left, top, right, bottom
 
-    def _capture_screenshot(self, bounds: Tuple[int, int, int, int]) -> Any:
+    def _selected_regions(self) -> list[Bounds]:
+        """追加済みの範囲と最後に選択した範囲を選択順に返す（小さすぎる範囲は除く）"""
+        regions = list(self.regions)
+        if not regions or self.end_x is not None:
+            bounds = self._get_screenshot_bounds()
+            if bounds is not None:
+                regions.append(bounds)
+        return regions
+
+    def _capture_screenshot(self, bounds: Bounds) -> Any:
         left, top, right, bottom = bounds
-        return pyautogui.screenshot(region=(left, top, right - left, bottom - top))
+        if self._snapshot is not None:
+            # 静止画から切り出す（撮影画像と画面の論理サイズの比で座標を変換）
+            scale_x = self._snapshot.width / self.screen_width
+            scale_y = self._snapshot.height / self.screen_height
+            return self._snapshot.crop(
+                (
+                    round(left * scale_x),
+                    round(top * scale_y),
+                    round(right * scale_x),
+                    round(bottom * scale_y),
+                )
+            )
+        return self.screen_grabber.grab((left, top, right - left, bottom - top))
 
-    def _extract_text_from_screenshot(self, screenshot: Any) -> Optional[str]:
+    def _extract_text_from_screenshots(
+        self, screenshots: Sequence[Image.Image]
+    ) -> Optional[str]:
         """スクリーンショットからテキストを抽出、失敗時は None"""
         try:
-            text = self.ocr_service.perform_ocr(screenshot)
+            ocr_service = self.ocr_service or get_shared_ocr_service()
+            text = ocr_regions(ocr_service, screenshots)
             if not text.strip():
                 messagebox.showwarning(
                     UILabels.TITLE_OCR_RESULT, UIMessages.WARN_NO_TEXT_DETECTED
@@ -139,15 +441,18 @@ class ScreenCapture:
     def _process_screenshot(self) -> None:
         """スクリーンショットを処理してテキストを抽出し result_text に格納"""
         try:
-            bounds = self._get_screenshot_bounds()
-            if bounds is None:
+            regions = self._selected_regions()
+            if not regions:
                 messagebox.showwarning(
                     UILabels.TITLE_OCR_RESULT, UIMessages.WARN_SCREENSHOT_TOO_SMALL
                 )
                 return
 
-            screenshot = self._capture_screenshot(bounds)
-            text = self._extract_text_from_screenshot(screenshot)
+            self.screenshots = [self._capture_screenshot(bounds) for bounds in regions]
+            if self.capture_only:
+                return
+
+            text = self._extract_text_from_screenshots(self.screenshots)
             if text is not None:
                 self.result_text = text
 
@@ -1,12 +1,26 @@
+import threading
 import tkinter as tk
 from tkinter import TclError, filedialog, messagebox, scrolledtext
-from typing import List
+from typing import Any, Callable, List, Optional
 
-from app.app_screen_capture import ScreenCapture
-from external_service.vision_ocr_service import VisionOCRService
+from PIL import Image
+
+from app.app_screen_capture import ScreenCapture, ocr_regions
+from external_service.vision_ocr_service import (
+    get_shared_ocr_service,
+    reset_shared_ocr_service,
+    warm_up_shared_ocr_service,
+)
 from service import text_widget_utils
 from service.file_saver import save_text_to_file
-from service.pdf_processor import process_pdf_files
+from service.ocr_job_runner import JobContext, JobProgress, OCRJobRunner
+from service.pdf_processor import (
+    PdfProcessOptions,
+    PdfProcessStats,
+    format_job_notice,
+    format_page_result,
+    iter_pdf_pages,
+)
 from utils.config_manager import ConfigManager
 from utils.constants import (
     DEFAULT_APP_TITLE,
@@ -16,6 +30,7 @@ from utils.constants import (
     UIMessages,
 )
 from widgets.button_factory import ButtonConfig, create_buttons
+from widgets.progress_panel import ProgressPanel
 
 # 表示ラベルとAPIパラメータのマッピング
 _DETECTION_LABEL_TO_TYPE = {
@@ -38,12 +53,32 @@ class OCRApplication:
         )
         self.is_append_mode = self.config_manager.get_input_mode()
         self._detection_type = self.config_manager.get_detection_type()
+        self.job_runner = OCRJobRunner(self.root)
+        self._pdf_parts_shown = 0
+        self._screen_capture: Optional[ScreenCapture] = None
         self._initialize_application()
 
     def _initialize_application(self) -> None:
         self._setup_window_geometry()
         self._create_gui()
-        self.root.protocol("WM_DELETE_WINDOW", self.root.destroy)
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        # ウィンドウ表示後にOCRクライアントの準備をバックグラウンドで行う
+        self.root.after_idle(self._start_ocr_warm_up)
+
+    def _start_ocr_warm_up(self) -> None:
+        thread = threading.Thread(
+            target=warm_up_shared_ocr_service,
+            args=(self._detection_type,),
+            name="ocr-warm-up",
+            daemon=True,
+        )
+        thread.start()
+
+    def _on_close(self) -> None:
+        """実行中のジョブを中止し、共有OCRサービスを解放してウィンドウを閉じる"""
+        self.job_runner.cancel()
+        reset_shared_ocr_service()
+        self.root.destroy()
 
     def _setup_window_geometry(self) -> None:
         try:
@@ -64,6 +99,7 @@ class OCRApplication:
         self._create_top_buttons()
         self._create_text_area()
         self._create_bottom_buttons()
+        self.progress_panel = ProgressPanel(self.root, self.cancel_job)
 
     def _on_mode_change(self, value: str) -> None:
         """プルダウンでモードが変更されたときの処理"""
@@ -144,6 +180,7 @@ class OCRApplication:
 
     def _create_bottom_buttons(self) -> None:
         bottom_frame = tk.Frame(self.root)
+        self.bottom_frame = bottom_frame
         bottom_frame.pack(
             fill=tk.X, padx=UILayout.FRAME_PADDING, pady=UILayout.FRAME_PADDING
         )
@@ -169,32 +206,121 @@ class OCRApplication:
                 UILabels.BTN_REMOVE_SEPARATOR,
                 lambda: text_widget_utils.remove_page_separators(self.text_area),
             ),
-            ButtonConfig(UILabels.BTN_CLOSE, self.root.destroy),
+            ButtonConfig(UILabels.BTN_CLOSE, self._on_close),
         ]
 
         create_buttons(bottom_frame, bottom_buttons)
 
     def capture_screen(self) -> None:
         """画面の一部をキャプチャしてOCR処理を実行"""
-        try:
-            self.root.iconify()
-            screen_capture = ScreenCapture()
-            screen_capture.root.mainloop()
-            self.root.deiconify()
-
-            if screen_capture.result_text:
-                text_widget_utils.set_text_content(
-                    self.text_area,
-                    screen_capture.result_text,
-                    append=self.is_append_mode,
-                )
+        if self._warn_if_job_running():
+            return
 
+        try:
+            # 静止画モードの撮影にメインウィンドウ（最小化のアニメーションを含む）が
+            # 写り込まないよう、アニメーションのない withdraw で隠し、
+            # 非表示が画面に反映されてから範囲選択を開始する
+            self.root.withdraw()
+            self.root.update()
+            self._get_screen_capture().start(self._on_capture_finished)
         except Exception as e:
+            self.root.deiconify()
             messagebox.showerror(
                 UILabels.TITLE_ERROR,
                 UIMessages.ERR_UNEXPECTED.format(error=str(e)),
             )
 
+    def _get_screen_capture(self) -> ScreenCapture:
+        """範囲選択のオーバーレイを取得（初回のみ作成し、以降は表示・非表示で再利用）
+
+        オーバーレイが破棄されている場合は作成し直す。
+        """
+        if self._screen_capture is None or not self._screen_capture.root.winfo_exists():
+            self._screen_capture = ScreenCapture(
+                capture_only=True,
+                master=self.root,
+                config_manager=self.config_manager,
+            )
+        return self._screen_capture
+
+    def _on_capture_finished(self, screenshots: List[Image.Image]) -> None:
+        self.root.deiconify()
+        if screenshots:
+            self._start_capture_ocr(screenshots)
+
+    def _start_capture_ocr(self, screenshots: List[Image.Image]) -> None:
+        """キャプチャ画像のOCRをワーカースレッドで実行（複数範囲は1回のバッチリクエストで処理）"""
+        detection_type = self._detection_type
+
+        def job(context: JobContext) -> Optional[str]:
+            context.report_progress(0, 1)
+            if context.cancelled:
+                return None
+            text = ocr_regions(get_shared_ocr_service(detection_type), screenshots)
+            context.report_progress(1, 1)
+            return text
+
+        self._start_job(
+            job,
+            self._on_capture_ocr_done,
+            self._on_capture_ocr_error,
+            UIMessages.PROGRESS_OCR_RUNNING,
+        )
+
+    def _on_capture_ocr_done(self, text: Optional[str]) -> None:
+        self._finish_job()
+        if text is None:
+            return
+        if not text.strip():
+            messagebox.showwarning(
+                UILabels.TITLE_OCR_RESULT, UIMessages.WARN_NO_TEXT_DETECTED
+            )
+            return
+        text_widget_utils.set_text_content(
+            self.text_area, text, append=self.is_append_mode
+        )
+
+    def _on_capture_ocr_error(self, error: Exception) -> None:
+        self._finish_job()
+        messagebox.showerror(
+            UILabels.TITLE_OCR_ERROR,
+            UIMessages.ERR_OCR_DETECT.format(error=str(error)),
+        )
+
+    def _start_job(
+        self,
+        job: Callable[[JobContext], Any],
+        on_done: Callable[[Any], None],
+        on_error: Callable[[Exception], None],
+        status: str = "",
+        on_item: Optional[Callable[[Any], None]] = None,
+    ) -> None:
+        """進捗パネルを表示してジョブを開始"""
+        self.progress_panel.show(before=self.bottom_frame, status=status)
+        self.job_runner.submit(
+            job, on_done, on_error, self._on_job_progress, on_item=on_item
+        )
+
+    def _on_job_progress(self, progress: JobProgress) -> None:
+        self.progress_panel.update_progress(
+            progress.done, progress.total, progress.eta_seconds
+        )
+
+    def _finish_job(self) -> None:
+        self.progress_panel.hide()
+
+    def _warn_if_job_running(self) -> bool:
+        """ジョブ実行中であれば警告を表示して True を返す"""
+        if not self.job_runner.is_running:
+            return False
+        messagebox.showwarning(UILabels.TITLE_WARNING, UIMessages.WARN_JOB_RUNNING)
+        return True
+
+    def cancel_job(self) -> None:
+        """実行中のジョブを中止（送信済みのAPI呼び出しの完了は待つ）"""
+        self.job_runner.cancel()
+        self.progress_panel.set_cancelling()
+
     def copy_to_clipboard(self) -> None:
         try:
             text = text_widget_utils.get_text_content(self.text_area)
@@ -233,7 +359,10 @@ class OCRApplication:
             )
 
     def select_pdf_files(self) -> None:
-        """PDFファイルを選択してOCR処理を実行"""
+        """PDFファイルを選択してOCR処理をワーカースレッドで実行"""
+        if self._warn_if_job_running():
+            return
+
         pdf_paths = filedialog.askopenfilenames(
             title=UILabels.PDF_DIALOG_TITLE,
             filetypes=[(UILabels.PDF_FILETYPE_LABEL, "*.pdf")],
@@ -241,18 +370,53 @@ class OCRApplication:
         if not pdf_paths:
             return
 
-        try:
-            ocr_service = VisionOCRService()
-            max_pages = self.config_manager.get_pdf_max_pages()
-            text = process_pdf_files(list(pdf_paths), ocr_service, max_pages)
+        detection_type = self._detection_type
+        max_pages = self.config_manager.get_pdf_max_pages()
+        options = PdfProcessOptions.from_config(self.config_manager)
+
+        stats = PdfProcessStats()
+
+        def job(context: JobContext) -> Optional[str]:
+            ocr_service = get_shared_ocr_service(detection_type)
+            pages = iter_pdf_pages(
+                list(pdf_paths),
+                ocr_service,
+                max_pages,
+                options,
+                stats,
+                progress_callback=context.report_progress,
+                cancel_event=context.cancel_event,
+            )
+            for page in pages:
+                context.post_item(format_page_result(page))
+            return format_job_notice(stats, max_pages)
+
+        self._pdf_parts_shown = 0
+        self._start_job(
+            job, self._on_pdf_done, self._on_pdf_error, on_item=self._on_pdf_page
+        )
+
+    def _on_pdf_page(self, text: str) -> None:
+        """完了したページをテキストエリアへ順に追加"""
+        if self._pdf_parts_shown == 0:
             text_widget_utils.set_text_content(
                 self.text_area, text, append=self.is_append_mode
             )
-        except Exception as e:
-            messagebox.showerror(
-                UILabels.TITLE_ERROR,
-                UIMessages.ERR_PDF_PROCESS.format(error=str(e)),
-            )
+        else:
+            text_widget_utils.insert_text(self.text_area, f"\n\n{text}")
+        self._pdf_parts_shown += 1
+
+    def _on_pdf_done(self, notice: Optional[str]) -> None:
+        self._finish_job()
+        if notice is not None:
+            self._on_pdf_page(notice)
+
+    def _on_pdf_error(self, error: Exception) -> None:
+        self._finish_job()
+        messagebox.showerror(
+            UILabels.TITLE_ERROR,
+            UIMessages.ERR_PDF_PROCESS.format(error=str(error)),
+        )
 
     def clear_screen(self) -> None:
         try:
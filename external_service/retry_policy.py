@@ -0,0 +1,138 @@
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, TypeVar
+
+from google.api_core import exceptions as api_exceptions
+
+from utils.config_manager import ConfigManager
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_INITIAL_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 8.0
+DEFAULT_BACKOFF_MULTIPLIER = 2.0
+DEFAULT_REQUEST_TIMEOUT = 30.0
+DEFAULT_DEADLINE = 60.0
+
+# 一時的な障害とみなして再試行するエラー
+# （UNAVAILABLE / DEADLINE_EXCEEDED / RESOURCE_EXHAUSTED / INTERNAL / ABORTED）
+RETRYABLE_ERRORS: tuple[type[Exception], ...] = (
+    api_exceptions.ServiceUnavailable,
+    api_exceptions.DeadlineExceeded,
+    api_exceptions.TooManyRequests,
+    api_exceptions.InternalServerError,
+    api_exceptions.Aborted,
+)
+
+# 過負荷を示すエラー（同時実行数を減らす対象）
+THROTTLING_ERRORS: tuple[type[Exception], ...] = (
+    api_exceptions.TooManyRequests,
+    api_exceptions.DeadlineExceeded,
+)
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    """エラー（またはその原因）がスロットリング・期限切れかを判定"""
+    current: Optional[BaseException] = error
+    while current is not None:
+        if isinstance(current, THROTTLING_ERRORS):
+            return True
+        current = current.__cause__
+    return False
+
+
+@dataclass
+class RetryPolicy:
+    """Vision API呼び出しの再試行ポリシー
+
+    待機時間は指数的に伸ばし（上限 max_backoff）、0〜その値の範囲でランダムに揺らす。
+
+    Attributes:
+        max_attempts: 最大試行回数（初回を含む）
+        initial_backoff: 初回の再試行までの待機時間の上限（秒）
+        max_backoff: 待機時間の上限（秒）
+        backoff_multiplier: 再試行ごとの待機時間の倍率
+        request_timeout: 1回の呼び出しのタイムアウト（秒）
+        deadline: 再試行を含めた呼び出し全体の期限（秒）
+    """
+
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    initial_backoff: float = DEFAULT_INITIAL_BACKOFF
+    max_backoff: float = DEFAULT_MAX_BACKOFF
+    backoff_multiplier: float = DEFAULT_BACKOFF_MULTIPLIER
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT
+    deadline: float = DEFAULT_DEADLINE
+
+    @classmethod
+    def from_config(cls, config: ConfigManager) -> "RetryPolicy":
+        """config.iniの[VisionRetry]セクションからポリシーを生成"""
+        return cls(
+            max_attempts=config.get_retry_max_attempts(),
+            initial_backoff=config.get_retry_initial_backoff(),
+            max_backoff=config.get_retry_max_backoff(),
+            backoff_multiplier=config.get_retry_backoff_multiplier(),
+            request_timeout=config.get_retry_request_timeout(),
+            deadline=config.get_retry_deadline(),
+        )
+
+    def backoff(self, attempt: int, rng: Optional[random.Random] = None) -> float:
+        """attempt回目の失敗後の待機時間（ジッター込み）"""
+        ceiling = min(
+            self.max_backoff,
+            self.initial_backoff * self.backoff_multiplier ** (attempt - 1),
+        )
+        return (rng or random).uniform(0, ceiling)
+
+
+def call_with_retry(
+    func: Callable[[float], T],
+    policy: RetryPolicy,
+    name: str,
+    sleep: Callable[[float], None] = time.sleep,
+    on_throttle: Optional[Callable[[], None]] = None,
+) -> T:
+    """一時的なエラーの場合に待機して再試行しながら func を呼び出す
+
+    Args:
+        func: タイムアウト秒数を受け取ってAPIを呼び出す関数
+        policy: 再試行ポリシー
+        name: ログ出力用の呼び出し名
+        sleep: 待機に用いる関数（テスト用）
+        on_throttle: スロットリング・期限切れで試行が失敗するたびに呼び出す関数
+            （再試行で成功した場合も呼び出す）
+
+    Raises:
+        Exception: 再試行対象外のエラー、または試行回数・期限を超えた場合の最後のエラー
+    """
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        remaining = policy.deadline - (time.monotonic() - started)
+        timeout = max(0.001, min(policy.request_timeout, remaining))
+        attempt_started = time.monotonic()
+        try:
+            result = func(timeout)
+        except RETRYABLE_ERRORS as e:
+            latency = time.monotonic() - attempt_started
+            logging.warning(
+                f"{name} の呼び出しに失敗しました"
+                f"（{attempt}回目, {latency:.2f}秒）: {e}"
+            )
+            if on_throttle is not None and is_throttling_error(e):
+                on_throttle()
+            delay = policy.backoff(attempt)
+            elapsed = time.monotonic() - started
+            if attempt >= policy.max_attempts or elapsed + delay >= policy.deadline:
+                raise
+            sleep(delay)
+            continue
+
+        latency = time.monotonic() - attempt_started
+        logging.info(
+            f"{name} の呼び出しが完了しました（{attempt}回目, {latency:.2f}秒）"
+        )
+        return result
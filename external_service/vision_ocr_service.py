@@ -1,53 +1,577 @@
 import io
+import logging
+import math
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Sequence
 
+import grpc
+from google.api_core import exceptions as api_exceptions
+from google.auth.transport.requests import Request
 from google.cloud import vision
 from PIL import Image
 
+from external_service.retry_policy import (
+    RETRYABLE_ERRORS,
+    RetryPolicy,
+    call_with_retry,
+)
 from utils.config_manager import ConfigManager
 from utils.constants import UIMessages
-from utils.env_loader import get_google_credentials
+from utils.env_loader import get_env_file_signature, get_google_credentials
+from utils.image_encoder import EncodedImage, ImageEncodingOptions, encode_image
+from utils.image_preprocessor import (
+    ImagePreprocessOptions,
+    convert_grayscale,
+    crop_margins,
+    preprocess_image,
+    scale_image,
+)
+from utils.ocr_cache import OCRResultCache, create_ocr_cache
+from utils.ocr_tiling import (
+    TILE_MODE_OFF,
+    OCRWord,
+    TileBox,
+    TileOptions,
+    merge_tile_words,
+    plan_tiles,
+)
+from utils.rate_limiter import TokenBucket, get_shared_rate_limiter
+
+# batch_annotate_images 1リクエストあたりの画像数上限
+MAX_BATCH_SIZE = 16
+
+# batch_annotate_images 1リクエストあたりの画像の合計バイト数の上限
+# （APIのリクエストサイズの上限に余裕を持たせた値）
+MAX_BATCH_BYTES = 8 * 1024 * 1024
+
+# バイト数の上限を超えた画像を縮小し直す際の余裕（圧縮率のばらつきを見込む）
+_BYTE_BUDGET_MARGIN = 0.9
+
+# ウォームアップ時にgRPCチャネルの接続を待つ秒数
+WARM_UP_TIMEOUT = 10.0
+
+# 検出タイプとFeature種別のマッピング
+_DETECTION_TYPE_TO_FEATURE = {
+    "text_detection": vision.Feature.Type.TEXT_DETECTION,
+    "document_text_detection": vision.Feature.Type.DOCUMENT_TEXT_DETECTION,
+}
 
 
 class VisionOCRService:
-    """Google Cloud Vision APIを使用したOCR処理"""
+    """Google Cloud Vision APIを使用したOCR処理
 
-    def __init__(self) -> None:
-        try:
-            credentials = get_google_credentials()
-            self.client = vision.ImageAnnotatorClient.from_service_account_info(
-                credentials
-            )
-        except Exception as e:
-            raise RuntimeError(UIMessages.ERR_VISION_CLIENT_INIT.format(error=e))
+    OCR結果キャッシュが有効な場合は、同一画像・同一検出タイプのAPI呼び出しを省略する。
+    APIクライアントはスレッドセーフなため、1つのインスタンスを複数スレッドから利用できる。
+
+    Args:
+        detection_type: 検出タイプ（省略時はconfig.iniの設定値）
+        cache: OCR結果キャッシュ（省略時はconfig.iniの設定から生成）
+        client: 再利用するAPIクライアント（省略時は認証情報から生成）
+        encoding: 画像のエンコード設定（省略時はconfig.iniの設定値）
+        preprocess: 画像の前処理設定（省略時はconfig.iniの設定値）
+        tiling: タイル分割OCRの設定（省略時はconfig.iniの設定値）
+        retry: API呼び出しの再試行ポリシー（省略時はconfig.iniの設定値）
+        rate_limiter: API呼び出しのレート制限（省略時はプロセス共有のもの）
+    """
+
+    def __init__(
+        self,
+        detection_type: Optional[str] = None,
+        cache: Optional[OCRResultCache] = None,
+        client: Any = None,
+        encoding: Optional[ImageEncodingOptions] = None,
+        preprocess: Optional[ImagePreprocessOptions] = None,
+        tiling: Optional[TileOptions] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+    ) -> None:
+        if client is None:
+            try:
+                credentials = get_google_credentials()
+                client = vision.ImageAnnotatorClient.from_service_account_info(
+                    credentials
+                )
+            except Exception as e:
+                raise RuntimeError(UIMessages.ERR_VISION_CLIENT_INIT.format(error=e))
+        self.client = client
         config = ConfigManager()
-        self._detection_type = config.get_detection_type()
+        self._detection_type = detection_type or config.get_detection_type()
+        self._cache = cache if cache is not None else create_ocr_cache(config)
+        self._encoding = encoding or ImageEncodingOptions.from_config(config)
+        self._preprocess = preprocess or ImagePreprocessOptions.from_config(config)
+        self._tiling = tiling or TileOptions.from_config(config)
+        self._retry = retry or RetryPolicy.from_config(config)
+        self._rate_limiter = rate_limiter or get_shared_rate_limiter(config)
+
+    @property
+    def detection_type(self) -> str:
+        return self._detection_type
+
+    @property
+    def cache(self) -> Optional[OCRResultCache]:
+        """OCR結果キャッシュ（無効な場合は None）"""
+        return self._cache
+
+    def warm_up(self, timeout: float = WARM_UP_TIMEOUT) -> None:
+        """gRPCチャネルの接続と認証トークンの取得を事前に行う
+
+        初回のOCRを定常時と同じ待ち時間で実行できるようにする。
+        """
+        transport = self.client.transport
+        grpc.channel_ready_future(transport.grpc_channel).result(timeout=timeout)
+        credentials = getattr(transport, "_credentials", None)
+        if credentials is not None and not credentials.valid:
+            credentials.refresh(Request())
+
+    def encode(self, image: Image.Image) -> EncodedImage:
+        """画像を設定のエンコード方式でアップロード用のバイト列へ変換"""
+        return encode_image(image, self._encoding)
+
+    def prepare_image(self, image: Image.Image) -> EncodedImage:
+        """前処理（余白の切り取り・縮小・グレースケール変換）を行い、バイト数の上限内でエンコード
+
+        バイト数の上限はAPIの制限による失敗を防ぐためのもので、
+        文字の高さの下限より優先して縮小する。
+        切り取り位置と縮小率は EncodedImage.to_source で元画像の座標へ戻せる。
+        """
+        cropped, offset = crop_margins(image, self._preprocess)
+        image = preprocess_image(cropped, self._preprocess)
+        encoded = self.encode(image)
+        max_bytes = self._preprocess.max_image_bytes
+        while encoded.size > max_bytes and min(image.size) > 1:
+            scale = math.sqrt(max_bytes / encoded.size) * _BYTE_BUDGET_MARGIN
+            image = scale_image(image, scale)
+            encoded = self.encode(image)
+        encoded.offset = offset
+        encoded.scale = encoded.width / cropped.width if cropped.width else 1.0
+        return encoded
 
     def perform_ocr(self, image: Image.Image) -> str:
-        """画像からテキストを抽出"""
+        """画像からテキストを抽出（設定により大きな画像はタイル分割して処理）"""
+        if self._tiling.should_tile(image.width, image.height):
+            return self.perform_ocr_tiled(image)
         try:
-            img_byte_arr = io.BytesIO()
-            image.save(img_byte_arr, format=image.format or "PNG")
-            content = img_byte_arr.getvalue()
-
-            vision_image = vision.Image(content=content)
+            encoded = self.prepare_image(image)
+        except Exception as e:
+            raise RuntimeError(UIMessages.ERR_OCR_PROCESS.format(error=e))
+        logging.info(f"OCR画像をエンコードしました: {encoded.summary()}")
+        return self.perform_ocr_bytes(encoded.content)
 
-            detect = getattr(self.client, self._detection_type)
-            response = detect(image=vision_image)  # type: ignore[attr-defined]
+    def perform_ocr_tiled(self, image: Image.Image) -> str:
+        """画像を重なりのあるタイルに分割して並列にOCRし、読み順に連結
 
-            if response.error.message:
-                raise RuntimeError(
-                    UIMessages.ERR_VISION_API.format(error=response.error.message)
+        重なり部分の単語はバウンディングボックスを用いて重複を除去する。
+        タイル単位の結果はキャッシュしない。
+        """
+        try:
+            image = convert_grayscale(image, self._preprocess)
+            tiles = plan_tiles(image.width, image.height, self._tiling)
+            crops = [image.crop(box) for box in tiles]
+            with ThreadPoolExecutor(max_workers=self._tiling.max_workers) as executor:
+                tile_words = list(
+                    executor.map(
+                        self._detect_tile_words, crops, tiles, range(len(tiles))
+                    )
                 )
+            logging.info(f"タイル分割OCRが完了しました: {len(tiles)}タイル")
 
-            if not response.text_annotations:
+            text = merge_tile_words(tiles, tile_words, image.size)
+            if not text.strip():
                 raise ValueError(UIMessages.ERR_OCR_NO_TEXT)
+            return text
+
+        except Exception as e:
+            raise RuntimeError(UIMessages.ERR_OCR_PROCESS.format(error=e))
 
-            extracted_text = response.text_annotations[0].description
+    def _detect_tile_words(
+        self, tile: Image.Image, box: TileBox, tile_index: int
+    ) -> list[OCRWord]:
+        """1タイルをOCRし、単語を画像全体の座標系で返す"""
+        encoded = self.prepare_image(tile)
 
-            if not extracted_text.strip():
-                raise ValueError(UIMessages.ERR_OCR_NO_EXTRACT)
+        response = self._call_api(
+            self._detection_type, image=vision.Image(content=encoded.content)
+        )
+        if response.error.message:
+            raise RuntimeError(
+                UIMessages.ERR_VISION_API.format(error=response.error.message)
+            )
+
+        words: list[OCRWord] = []
+        # 先頭は全文のため、2件目以降の単語単位の結果を使用する
+        for annotation in response.text_annotations[1:]:
+            vertices = annotation.bounding_poly.vertices
+            if not vertices:
+                continue
+            # 余白の切り取り・縮小を戻し、タイルの位置を加えて画像全体の座標にする
+            points = [encoded.to_source(vertex.x, vertex.y) for vertex in vertices]
+            xs = [box[0] + x for x, _ in points]
+            ys = [box[1] + y for _, y in points]
+            words.append(
+                OCRWord(
+                    text=annotation.description,
+                    left=min(xs),
+                    top=min(ys),
+                    right=max(xs),
+                    bottom=max(ys),
+                    tile_index=tile_index,
+                )
+            )
+        return words
 
-            return extracted_text
+    def perform_ocr_bytes(self, content: bytes) -> str:
+        """エンコード済みの画像バイト列（PNG・JPEGなど）からテキストを抽出"""
+        try:
+            content = self._fit_content(content)
+            cache_key = self._cache_key(content)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+            vision_image = vision.Image(content=content)
+
+            response = self._call_api(self._detection_type, image=vision_image)
+
+            text = self._extract_text(response)
+            self._cache_put(cache_key, text)
+            return text
 
         except Exception as e:
             raise RuntimeError(UIMessages.ERR_OCR_PROCESS.format(error=e))
+
+    def perform_ocr_batch(self, images: Sequence[Image.Image]) -> list[str | Exception]:
+        """複数画像をbatch_annotate_imagesでまとめてOCR処理
+
+        キャッシュにない画像のみを、MAX_BATCH_SIZE枚・MAX_BATCH_BYTES以下ごとに
+        1回のAPI呼び出しへまとめる。
+        画像単位の失敗は例外オブジェクトとして結果リストに格納し、他の画像の結果には影響させない。
+
+        Returns:
+            list[str | Exception]: 入力順の抽出テキスト、または失敗時の例外
+        """
+        contents: list[bytes | Exception] = []
+        for image in images:
+            try:
+                contents.append(self.prepare_image(image).content)
+            except Exception as e:
+                contents.append(
+                    RuntimeError(UIMessages.ERR_OCR_PROCESS.format(error=e))
+                )
+        return self._perform_batch(contents)
+
+    def perform_ocr_batch_bytes(
+        self,
+        contents: Sequence[bytes],
+        on_throttle: Optional[Callable[[], None]] = None,
+    ) -> list[str | Exception]:
+        """エンコード済みの複数画像をまとめてOCR処理（perform_ocr_batch のバイト列版）
+
+        タイル分割の設定に該当する大きな画像（高解像度で画像化した図面など）は
+        バッチに含めず、perform_ocr_tiled で縮小せずに処理する。
+
+        Args:
+            contents: エンコード済みの画像バイト列
+            on_throttle: スロットリング・期限切れで試行が失敗するたびに呼び出す関数
+                （再試行で成功した場合も呼び出す）
+        """
+        results: list[str | Exception] = [_missing_result()] * len(contents)
+        batch_indexes: list[int] = []
+        for index, content in enumerate(contents):
+            if self._should_tile_content(content):
+                results[index] = self._perform_ocr_tiled_bytes(content)
+            else:
+                batch_indexes.append(index)
+
+        batch_results = self._perform_batch(
+            [contents[index] for index in batch_indexes], on_throttle
+        )
+        for index, result in zip(batch_indexes, batch_results):
+            results[index] = result
+        return results
+
+    def _should_tile_content(self, content: bytes) -> bool:
+        """エンコード済みの画像をタイル分割してOCRするかを画像のヘッダーから判定"""
+        if self._tiling.mode == TILE_MODE_OFF:
+            return False
+        try:
+            with Image.open(io.BytesIO(content)) as image:
+                return self._tiling.should_tile(image.width, image.height)
+        except Exception:
+            # 復号できない画像はバッチ側で画像単位の失敗として扱う
+            return False
+
+    def _perform_ocr_tiled_bytes(self, content: bytes) -> str | Exception:
+        """エンコード済みの画像を復号してタイル分割OCR（失敗時は例外オブジェクトを返す）"""
+        try:
+            with Image.open(io.BytesIO(content)) as image:
+                image.load()
+                return self.perform_ocr_tiled(image)
+        except RuntimeError as e:
+            return e
+        except Exception as e:
+            return RuntimeError(UIMessages.ERR_OCR_PROCESS.format(error=e))
+
+    def _perform_batch(
+        self,
+        contents: Sequence[bytes | Exception],
+        on_throttle: Optional[Callable[[], None]] = None,
+    ) -> list[str | Exception]:
+        """キャッシュを確認し、未処理の画像を split_batches の単位でAPIへ送信"""
+        results: list[str | Exception] = [_missing_result()] * len(contents)
+        pending: list[tuple[int, bytes, Optional[str]]] = []
+
+        for index, content in enumerate(contents):
+            if isinstance(content, Exception):
+                results[index] = content
+                continue
+            try:
+                content = self._fit_content(content)
+            except Exception as e:
+                results[index] = RuntimeError(
+                    UIMessages.ERR_OCR_PROCESS.format(error=e)
+                )
+                continue
+            cache_key = self._cache_key(content)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append((index, content, cache_key))
+
+        for start, end in split_batches([len(content) for _, content, _ in pending]):
+            chunk = pending[start:end]
+            responses = self._annotate_batch(
+                [content for _, content, _ in chunk], on_throttle
+            )
+            for (index, _, cache_key), result in zip(chunk, responses):
+                results[index] = result
+                if isinstance(result, str):
+                    self._cache_put(cache_key, result)
+
+        return results
+
+    def _annotate_batch(
+        self,
+        contents: Sequence[bytes],
+        on_throttle: Optional[Callable[[], None]] = None,
+    ) -> list[str | Exception]:
+        """MAX_BATCH_SIZE枚以下の画像を1回のAPI呼び出しで処理
+
+        APIがリクエストを拒否した場合（リクエストサイズの超過など再試行対象外のエラー）は、
+        1枚の問題で他の画像まで失敗しないよう1枚ずつ送信し直す。
+        """
+        feature = vision.Feature(type_=_DETECTION_TYPE_TO_FEATURE[self._detection_type])
+        requests = [
+            vision.AnnotateImageRequest(
+                image=vision.Image(content=content), features=[feature]
+            )
+            for content in contents
+        ]
+
+        try:
+            batch_response = self._call_api(
+                "batch_annotate_images",
+                images=len(requests),
+                on_throttle=on_throttle,
+                requests=requests,
+            )
+        except Exception as e:
+            if _is_rejected_request(e) and len(contents) > 1:
+                logging.warning(
+                    f"バッチOCRに失敗したため、{len(contents)}枚を1枚ずつ送信します: {e}"
+                )
+                return [
+                    result
+                    for content in contents
+                    for result in self._annotate_batch([content], on_throttle)
+                ]
+            error = RuntimeError(UIMessages.ERR_OCR_PROCESS.format(error=e))
+            # 呼び出し元が失敗の種類（スロットリングなど）を判別できるよう原因を残す
+            error.__cause__ = e
+            return [error] * len(contents)
+
+        results: list[str | Exception] = []
+        for response in batch_response.responses:
+            try:
+                results.append(self._extract_text(response))
+            except Exception as e:
+                results.append(RuntimeError(UIMessages.ERR_OCR_PROCESS.format(error=e)))
+
+        results.extend([_missing_result()] * (len(contents) - len(results)))
+        return results
+
+    def _call_api(
+        self,
+        method: str,
+        images: int = 1,
+        on_throttle: Optional[Callable[[], None]] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """レート制限と再試行ポリシーに従ってAPIクライアントのメソッドを呼び出す
+
+        クライアント側の既定の再試行は無効にし、試行ごとのタイムアウトを指定する。
+        レート制限のトークンは再試行を含む試行ごとに画像数分を取得する。
+
+        Args:
+            method: APIクライアントのメソッド名
+            images: 送信する画像数（クォータの消費量）
+            on_throttle: スロットリング・期限切れで試行が失敗するたびに呼び出す関数
+        """
+        func = getattr(self.client, method)
+
+        def attempt(timeout: float) -> Any:
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire(images)
+            return func(retry=None, timeout=timeout, **kwargs)
+
+        return call_with_retry(attempt, self._retry, method, on_throttle=on_throttle)
+
+    def _fit_content(self, content: bytes) -> bytes:
+        """バイト数の上限を超えるエンコード済み画像のみ復号して縮小し直す"""
+        if len(content) <= self._preprocess.max_image_bytes:
+            return content
+        with Image.open(io.BytesIO(content)) as image:
+            image.load()
+            return self.prepare_image(image).content
+
+    def _cache_key(self, content: bytes) -> Optional[str]:
+        if self._cache is None:
+            return None
+        return OCRResultCache.make_key(content, self._detection_type)
+
+    def _cache_get(self, cache_key: Optional[str]) -> Optional[str]:
+        """キャッシュ済みのOCR結果を取得（参照に失敗した場合はキャッシュなしとして扱う）"""
+        if self._cache is None or cache_key is None:
+            return None
+        try:
+            return self._cache.get(cache_key)
+        except sqlite3.Error as e:
+            logging.warning(f"OCR結果のキャッシュを参照できませんでした: {e}")
+            return None
+
+    def _cache_put(self, cache_key: Optional[str], text: str) -> None:
+        """OCR結果をキャッシュへ保存（保存に失敗してもOCR結果は呼び出し元へ返す）"""
+        if self._cache is None or cache_key is None:
+            return
+        try:
+            self._cache.put(cache_key, text)
+        except sqlite3.Error as e:
+            logging.warning(f"OCR結果のキャッシュへの保存に失敗しました: {e}")
+
+    @staticmethod
+    def _extract_text(response: vision.AnnotateImageResponse) -> str:
+        """APIレスポンスから全文テキストを取り出す"""
+        if response.error.message:
+            raise RuntimeError(
+                UIMessages.ERR_VISION_API.format(error=response.error.message)
+            )
+
+        if not response.text_annotations:
+            raise ValueError(UIMessages.ERR_OCR_NO_TEXT)
+
+        extracted_text = response.text_annotations[0].description
+
+        if not extracted_text.strip():
+            raise ValueError(UIMessages.ERR_OCR_NO_EXTRACT)
+
+        return extracted_text
+
+
+_shared_lock = threading.Lock()
+_shared_service: Optional[VisionOCRService] = None
+_shared_signature: Optional[tuple[str, int, int]] = None
+
+
+def get_shared_ocr_service(detection_type: Optional[str] = None) -> VisionOCRService:
+    """プロセス全体で共有するOCRサービスを取得
+
+    APIクライアント（gRPCチャネル）はアプリケーション終了まで使い回す。
+    .envの認証情報が変更された場合はクライアントを再生成し、
+    検出タイプのみが変更された場合は既存のクライアントとキャッシュを引き継いで再生成する。
+
+    Args:
+        detection_type: 検出タイプ（省略時はconfig.iniの設定値）
+    """
+    global _shared_service, _shared_signature
+
+    if detection_type is None:
+        detection_type = ConfigManager().get_detection_type()
+    signature = get_env_file_signature()
+
+    with _shared_lock:
+        service = _shared_service
+        if service is None or signature != _shared_signature:
+            cache = service.cache if service is not None else None
+            service = VisionOCRService(detection_type, cache=cache)
+        elif service.detection_type != detection_type:
+            service = VisionOCRService(
+                detection_type, cache=service.cache, client=service.client
+            )
+        _shared_service = service
+        _shared_signature = signature
+        return service
+
+
+def warm_up_shared_ocr_service(detection_type: Optional[str] = None) -> None:
+    """共有OCRサービスを生成してAPIへの接続を確立する（バックグラウンド実行用）
+
+    失敗しても初回のOCR実行時に改めて接続されるため、ログ出力のみ行う。
+    """
+    started = time.perf_counter()
+    try:
+        get_shared_ocr_service(detection_type).warm_up()
+    except Exception as e:
+        logging.warning(f"OCRクライアントのウォームアップに失敗しました: {e}")
+        return
+    elapsed = time.perf_counter() - started
+    logging.info(f"OCRクライアントのウォームアップが完了しました: {elapsed:.2f}秒")
+
+
+def reset_shared_ocr_service() -> None:
+    """共有OCRサービスを破棄し、キャッシュを閉じる"""
+    global _shared_service, _shared_signature
+
+    with _shared_lock:
+        if _shared_service is not None and _shared_service.cache is not None:
+            _shared_service.cache.close()
+        _shared_service = None
+        _shared_signature = None
+
+
+def split_batches(sizes: Sequence[int]) -> list[tuple[int, int]]:
+    """画像のバイト数の並びを、1回のAPI呼び出しで送信する範囲（開始, 終了）に分割
+
+    1範囲あたり MAX_BATCH_SIZE 枚・合計 MAX_BATCH_BYTES 以下とする。
+    単独で MAX_BATCH_BYTES を超える画像は1枚で1範囲とする。
+    """
+    batches: list[tuple[int, int]] = []
+    start = 0
+    total = 0
+    for index, size in enumerate(sizes):
+        if index > start and (
+            index - start >= MAX_BATCH_SIZE or total + size > MAX_BATCH_BYTES
+        ):
+            batches.append((start, index))
+            start = index
+            total = 0
+        total += size
+    if start < len(sizes):
+        batches.append((start, len(sizes)))
+    return batches
+
+
+def _is_rejected_request(error: Exception) -> bool:
+    """APIがリクエストを再試行対象外のエラーで拒否したかを判定"""
+    return isinstance(error, api_exceptions.GoogleAPICallError) and not isinstance(
+        error, RETRYABLE_ERRORS
+    )
+
+
+def _missing_result() -> RuntimeError:
+    """レスポンスが得られなかった画像の結果"""
+    return RuntimeError(
+        UIMessages.ERR_OCR_PROCESS.format(error=UIMessages.ERR_OCR_NO_TEXT)
+    )
@@ -0,0 +1,82 @@
+import argparse
+import statistics
+import sys
+import time
+
+from utils.screen_grabber import (
+    SCREEN_GRAB_PILLOW,
+    SCREEN_GRAB_PYAUTOGUI,
+    Region,
+    create_screen_grabber,
+)
+
+
+def benchmark_backend(
+    backend: str, region: Region | None, repeat: int
+) -> list[float] | None:
+    """撮影方式ごとに撮影時間（ミリ秒）を計測、撮影できない場合は None"""
+    grabber = create_screen_grabber(backend)
+    try:
+        # 初回の接続・初期化の時間は除いて計測する
+        grabber.grab(region)
+    except Exception as e:
+        print(f"{backend}: 撮影できません - {e}", file=sys.stderr)
+        return None
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        grabber.grab(region)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def parse_region(value: str) -> Region:
+    try:
+        left, top, width, height = (int(v) for v in value.split(","))
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(
+            "範囲は left,top,width,height の形式で指定してください"
+        ) from e
+    return left, top, width, height
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="画面の撮影方式ごとの撮影時間を比較するスクリプト",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+使用例:
+  python -m scripts.benchmark_screen_grab                      # 画面全体を20回撮影
+  python -m scripts.benchmark_screen_grab --region 0,0,800,600 # 範囲を指定
+  xvfb-run python -m scripts.benchmark_screen_grab             # Xvfb上で計測
+        """,
+    )
+    parser.add_argument(
+        "--region",
+        type=parse_region,
+        help="撮影範囲 left,top,width,height（省略時は画面全体）",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="撮影回数（デフォルト: 20）"
+    )
+    args = parser.parse_args()
+
+    results = {}
+    for backend in (SCREEN_GRAB_PILLOW, SCREEN_GRAB_PYAUTOGUI):
+        timings = benchmark_backend(backend, args.region, args.repeat)
+        if timings is None:
+            continue
+        results[backend] = timings
+        print(
+            f"{backend:<10} 中央値 {statistics.median(timings):8.1f}ms"
+            f"  平均 {statistics.mean(timings):8.1f}ms"
+            f"  最大 {max(timings):8.1f}ms  ({args.repeat}回)"
+        )
+
+    if not results:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
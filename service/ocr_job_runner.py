@@ -0,0 +1,159 @@
+import queue
+import threading
+import time
+import tkinter as tk
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+POLL_INTERVAL_MS = 50
+
+
+@dataclass
+class JobProgress:
+    """ジョブの進捗
+
+    Attributes:
+        done: 処理済み件数
+        total: 総件数
+        elapsed: 開始からの経過秒数
+    """
+
+    done: int
+    total: int
+    elapsed: float
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """残り時間の推定秒数（推定できない場合は None）"""
+        if self.done <= 0 or self.total <= 0:
+            return None
+        return self.elapsed / self.done * max(0, self.total - self.done)
+
+
+class JobContext:
+    """ワーカースレッドで実行されるジョブに渡すコンテキスト
+
+    Attributes:
+        cancel_event: 中止要求でセットされるイベント
+    """
+
+    def __init__(
+        self, messages: "queue.Queue[tuple[str, Any]]", cancel_event: threading.Event
+    ) -> None:
+        self.cancel_event = cancel_event
+        self._messages = messages
+        self._started = time.perf_counter()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def report_progress(self, done: int, total: int) -> None:
+        """進捗をメインスレッドへ通知"""
+        elapsed = time.perf_counter() - self._started
+        self._messages.put(("progress", JobProgress(done, total, elapsed)))
+
+    def post_item(self, item: Any) -> None:
+        """途中結果をメインスレッドへ通知"""
+        self._messages.put(("item", item))
+
+
+class OCRJobRunner:
+    """OCR処理をワーカースレッドで実行し、結果をTkのメインスレッドへ受け渡す
+
+    ワーカーからの通知はキューに積まれ、root.after で定期的に取り出して
+    コールバックを呼び出す。Tkウィジェットの操作はすべてメインスレッドで行われる。
+    同時に実行できるジョブは1件のみ。
+    """
+
+    def __init__(self, root: tk.Misc, poll_interval_ms: int = POLL_INTERVAL_MS) -> None:
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self._messages: queue.Queue[tuple[str, Any]] = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._on_done: Callable[[Any], None] = lambda result: None
+        self._on_error: Callable[[Exception], None] = lambda error: None
+        self._on_progress: Optional[Callable[[JobProgress], None]] = None
+        self._on_item: Optional[Callable[[Any], None]] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+    def submit(
+        self,
+        job: Callable[[JobContext], Any],
+        on_done: Callable[[Any], None],
+        on_error: Callable[[Exception], None],
+        on_progress: Optional[Callable[[JobProgress], None]] = None,
+        on_item: Optional[Callable[[Any], None]] = None,
+    ) -> bool:
+        """ジョブをワーカースレッドで開始
+
+        on_item にはジョブが JobContext.post_item で通知した途中結果が順に渡される。
+
+        Returns:
+            bool: 開始した場合 True、他のジョブが実行中の場合 False
+        """
+        if self.is_running:
+            return False
+
+        self._messages = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._on_done = on_done
+        self._on_error = on_error
+        self._on_progress = on_progress
+        self._on_item = on_item
+
+        context = JobContext(self._messages, self._cancel_event)
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(job, context, self._messages),
+            name="ocr-job",
+            daemon=True,
+        )
+        self._thread.start()
+        self.root.after(self.poll_interval_ms, self._poll)
+        return True
+
+    def cancel(self) -> None:
+        """実行中のジョブに中止を要求"""
+        self._cancel_event.set()
+
+    @staticmethod
+    def _run(
+        job: Callable[[JobContext], Any],
+        context: JobContext,
+        messages: "queue.Queue[tuple[str, Any]]",
+    ) -> None:
+        try:
+            messages.put(("done", job(context)))
+        except Exception as e:
+            messages.put(("error", e))
+
+    def _poll(self) -> None:
+        """キューに溜まった通知をメインスレッドで処理"""
+        while True:
+            try:
+                kind, payload = self._messages.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "progress":
+                if self._on_progress is not None:
+                    self._on_progress(payload)
+                continue
+            if kind == "item":
+                if self._on_item is not None:
+                    self._on_item(payload)
+                continue
+
+            self._thread = None
+            if kind == "done":
+                self._on_done(payload)
+            else:
+                self._on_error(payload)
+            return
+
+        self.root.after(self.poll_interval_ms, self._poll)
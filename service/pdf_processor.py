@@ -1,58 +1,898 @@
-from typing import cast
+import hashlib
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Generator, Iterator, Optional, Union, cast
 
 import fitz  # PyMuPDF
 from PIL import Image
 
-from external_service.vision_ocr_service import VisionOCRService
+from external_service.retry_policy import is_throttling_error
+from external_service.vision_ocr_service import (
+    MAX_BATCH_SIZE,
+    VisionOCRService,
+    split_batches,
+)
+from utils.concurrency_limiter import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyChange,
+    get_shared_concurrency_limiter,
+    summarize_history,
+)
+from utils.config_manager import ConfigManager
 from utils.constants import UIMessages
+from utils.image_encoder import (
+    ENCODING_JPEG,
+    ENCODING_PNG,
+    ImageEncodingOptions,
+    encode_image,
+)
+from utils.image_preprocessor import (
+    DEFAULT_BINARIZE_BITS,
+    DEFAULT_CROP_PADDING,
+    ENHANCE_OFF,
+    enhance_image,
+    find_content_box,
+)
+from utils.ocr_cache import OCRResultCache
 
 DEFAULT_MAX_PAGES = 20
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_INITIAL_WORKERS = 2
+DEFAULT_LATENCY_BUDGET = 10.0
+DEFAULT_TEXT_LAYER_MIN_CHARS = 20
+DEFAULT_RENDER_DPI = 150
+DEFAULT_MAX_RENDER_PIXELS = 4_000_000
+DEFAULT_JPEG_QUALITY = 90
+DEFAULT_BLANK_PAGE_THRESHOLD = 0.0002
 
+# PDFの座標系（1ポイント = 1/72インチ）
+PDF_POINTS_PER_INCH = 72
 
-def _render_page_to_image(page: fitz.Page) -> Image.Image:
-    """PDFページをPIL Imageへ変換"""
-    pixmap = page.get_pixmap()
-    return Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+# テキストレイヤーの利用モード
+TEXT_LAYER_NEVER = "never"
+TEXT_LAYER_AUTO = "auto"
+TEXT_LAYER_ALWAYS = "always"
 
+# 画像化の解像度モード
+DPI_MODE_FIXED = "fixed"
+DPI_MODE_ADAPTIVE = "adaptive"
 
-def _ocr_page(page: fitz.Page, ocr_service: VisionOCRService) -> str:
-    """単一ページをOCR処理（失敗時はフェイルバック文言を返す）"""
+# 画像化の色空間
+COLORSPACE_GRAY = "gray"
+COLORSPACE_RGB = "rgb"
+
+# 画像化したページのエンコード形式
+IMAGE_FORMAT_PNG = "png"
+IMAGE_FORMAT_JPEG = "jpeg"
+
+# 同時実行数の制御モード
+CONCURRENCY_FIXED = "fixed"
+CONCURRENCY_ADAPTIVE = "adaptive"
+
+# ページの処理経路
+PAGE_SOURCE_TEXT_LAYER = "text_layer"
+PAGE_SOURCE_OCR = "ocr"
+PAGE_SOURCE_BLANK = "blank"
+PAGE_SOURCE_CACHE = "cache"
+PAGE_SOURCE_FAILED = "failed"
+
+# 背景（最も多い輝度）との差がこの値を超える画素をインク（文字・罫線など）とみなす
+# （薄い文字・色付きの文字や、灰色の地のスキャンでも判定できるよう背景からの差で測る）
+_INK_CONTRAST = 24
+
+
+class _BlankPage:
+    """空白と判定したページ（API呼び出し不要）"""
+
+
+_BLANK_PAGE = _BlankPage()
+
+
+@dataclass
+class _CachedPage:
+    """キャッシュから取得したOCR結果（画像化・API呼び出し不要）"""
+
+    text: str
+
+
+# 画像化前のページ（文字列=テキストレイヤーから取得済み、バイト列=エンコード済み画像、
+# _BLANK_PAGE=空白ページ、_CachedPage=キャッシュ済み、None=画像化失敗）
+_PageEntry = Union[str, bytes, _BlankPage, _CachedPage, None]
+
+# ファイルのハッシュを求める際の読み込み単位
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class PdfProcessOptions:
+    """PDF処理のオプション
+
+    Attributes:
+        batch_size: 1回のAPI呼び出しにまとめるページ数
+        max_workers: 同時に実行するAPI呼び出しの最大数（adaptiveモードでは上限）
+        concurrency_mode: 同時実行数の制御モード（fixed / adaptive）
+        initial_workers: adaptiveモードの同時実行数の初期値
+        latency_budget: adaptiveモードで同時実行数を増やす応答時間（p95）の上限（秒）
+        text_layer_mode: テキストレイヤーの利用モード（never / auto / always）
+        text_layer_min_chars: autoモードでテキストレイヤーを採用する最小文字数
+        render_dpi: ページを画像化する解像度（adaptiveモードでは上限）
+        dpi_mode: 解像度モード（fixed / adaptive）
+        max_render_pixels: adaptiveモードで1ページに許容する最大画素数
+        colorspace: 画像化の色空間（gray / rgb）
+        render_alpha: アルファチャネルを残す場合 True
+        image_format: 画像化したページのエンコード形式（png / jpeg）
+        jpeg_quality: JPEGの品質（1〜100）
+        blank_page_threshold: 空白ページとみなすインクの割合の上限（0で判定しない）
+        auto_crop: 画像化したページの周囲の余白を切り取る場合 True
+        crop_padding: 切り取った範囲の周囲に残す余白（ピクセル）
+        enhance: 画質補正モード（off / contrast / binarize、補正時はグレースケールで送信）
+        binarize_bits: binarizeモードの出力のビット深度（1 / 8）
+        page_cache: 画像化前にページ単位のOCR結果キャッシュを参照する場合 True
+    """
+
+    batch_size: int = MAX_BATCH_SIZE
+    max_workers: int = DEFAULT_MAX_WORKERS
+    concurrency_mode: str = CONCURRENCY_ADAPTIVE
+    initial_workers: int = DEFAULT_INITIAL_WORKERS
+    latency_budget: float = DEFAULT_LATENCY_BUDGET
+    text_layer_mode: str = TEXT_LAYER_AUTO
+    text_layer_min_chars: int = DEFAULT_TEXT_LAYER_MIN_CHARS
+    render_dpi: int = DEFAULT_RENDER_DPI
+    dpi_mode: str = DPI_MODE_FIXED
+    max_render_pixels: int = DEFAULT_MAX_RENDER_PIXELS
+    colorspace: str = COLORSPACE_GRAY
+    render_alpha: bool = False
+    image_format: str = IMAGE_FORMAT_PNG
+    jpeg_quality: int = DEFAULT_JPEG_QUALITY
+    blank_page_threshold: float = DEFAULT_BLANK_PAGE_THRESHOLD
+    auto_crop: bool = True
+    crop_padding: int = DEFAULT_CROP_PADDING
+    enhance: str = ENHANCE_OFF
+    binarize_bits: int = DEFAULT_BINARIZE_BITS
+    page_cache: bool = True
+
+    @classmethod
+    def from_config(cls, config: ConfigManager) -> "PdfProcessOptions":
+        """config.iniの[PDF]セクションからオプションを生成"""
+        return cls(
+            batch_size=config.get_pdf_batch_size(),
+            max_workers=config.get_pdf_max_workers(),
+            concurrency_mode=config.get_pdf_concurrency_mode(),
+            initial_workers=config.get_pdf_initial_workers(),
+            latency_budget=config.get_pdf_latency_budget(),
+            text_layer_mode=config.get_pdf_text_layer_mode(),
+            text_layer_min_chars=config.get_pdf_text_layer_min_chars(),
+            render_dpi=config.get_pdf_render_dpi(),
+            dpi_mode=config.get_pdf_dpi_mode(),
+            max_render_pixels=config.get_pdf_max_render_pixels(),
+            colorspace=config.get_pdf_colorspace(),
+            render_alpha=config.get_pdf_render_alpha(),
+            image_format=config.get_pdf_image_format(),
+            jpeg_quality=config.get_pdf_jpeg_quality(),
+            blank_page_threshold=config.get_pdf_blank_page_threshold(),
+            auto_crop=config.get_pdf_auto_crop(),
+            crop_padding=config.get_crop_padding(),
+            enhance=config.get_pdf_enhance_mode(),
+            binarize_bits=config.get_binarize_bits(),
+            page_cache=config.get_pdf_page_cache(),
+        )
+
+
+@dataclass
+class PdfProcessStats:
+    """PDF処理の集計結果
+
+    Attributes:
+        text_layer_pages: テキストレイヤーから取得したページ数（API呼び出し不要）
+        ocr_pages: Vision APIへ送信したページ数
+        blank_pages: 空白と判定してOCRを省略したページ数
+        cached_pages: キャッシュから取得したページ数（画像化・API呼び出し不要）
+        failed_pages: テキストを取得できなかったページ数
+        api_calls: Vision APIの呼び出し回数
+        text_layer_seconds: テキストレイヤーの取得に要した秒数
+        render_seconds: ページの画像化に要した秒数
+        ocr_seconds: OCRに要した秒数（バッチごとの合計）
+        cancelled: 中止要求により処理を打ち切った場合 True
+        limit_reached: 最大ページ数に達して処理を打ち切った場合 True
+        concurrency_history: adaptiveモードの同時実行数の変更履歴
+    """
+
+    text_layer_pages: int = 0
+    ocr_pages: int = 0
+    blank_pages: int = 0
+    cached_pages: int = 0
+    failed_pages: int = 0
+    api_calls: int = 0
+    text_layer_seconds: float = 0.0
+    render_seconds: float = 0.0
+    ocr_seconds: float = 0.0
+    cancelled: bool = False
+    limit_reached: bool = False
+    concurrency_history: list[ConcurrencyChange] = field(default_factory=list)
+
+    @property
+    def estimated_seconds_saved(self) -> float:
+        """テキストレイヤーの利用で短縮できたと推定される秒数"""
+        if not self.ocr_pages:
+            return 0.0
+        per_page = (self.render_seconds + self.ocr_seconds) / self.ocr_pages
+        return max(0.0, self.text_layer_pages * per_page - self.text_layer_seconds)
+
+    def summary(self) -> str:
+        """ログ出力用の集計文字列"""
+        return (
+            f"テキストレイヤー: {self.text_layer_pages}ページ, "
+            f"OCR: {self.ocr_pages}ページ（API呼び出し {self.api_calls}回）, "
+            f"空白: {self.blank_pages}ページ, "
+            f"キャッシュ: {self.cached_pages}ページ, "
+            f"失敗: {self.failed_pages}ページ, "
+            f"推定短縮時間: {self.estimated_seconds_saved:.1f}秒"
+            + (
+                f", 同時実行数: {summarize_history(self.concurrency_history)}"
+                if self.concurrency_history
+                else ""
+            )
+        )
+
+
+@dataclass
+class PdfPageResult:
+    """1ページ分の処理結果
+
+    Attributes:
+        file_path: PDFファイルパス
+        page_num: ファイル内のページ番号（1始まり）
+        text: 抽出したテキスト（失敗時はフェイルバック文言）
+        source: 処理経路（text_layer / ocr / blank / cache / failed）
+        seconds: テキストレイヤー取得・画像化・OCRに要した秒数（OCRはバッチ内で按分）
+    """
+
+    file_path: str
+    page_num: int
+    text: str
+    source: str
+    seconds: float
+
+
+@dataclass
+class _BatchResult:
+    """ワーカーで処理したバッチの結果"""
+
+    texts: list[str]
+    sources: list[str]
+    cancelled: bool = False
+    ocr_pages: int = 0
+    api_calls: int = 0
+    ocr_seconds: float = 0.0
+
+
+def hash_file(path: str) -> str:
+    """ファイル内容のSHA-256ハッシュ（16進文字列）を求める"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_page_content(page: fitz.Page) -> str:
+    """ページの描画内容のハッシュを求める
+
+    コンテンツストリームと、参照する画像・フォーム・フォント・注釈の内容から求める。
+    xref番号は含めないため、別のPDFに含まれるバイト単位で同一のページ
+    （共通の表紙など）も同じ値になる。
+    """
+    doc = page.parent
+    if doc is None:
+        raise ValueError("ドキュメントに属さないページのハッシュは求められません")
+    digest = hashlib.sha256()
+    digest.update(repr((tuple(page.rect), page.rotation)).encode("utf-8"))
+    digest.update(page.read_contents())
+
+    for xref, smask, *info in page.get_images(full=True):
+        digest.update(repr(info[:6]).encode("utf-8"))
+        for stream_xref in (xref, smask):
+            if stream_xref:
+                digest.update(doc.xref_stream_raw(stream_xref) or b"")
+    for xref, name, _, bbox in page.get_xobjects():
+        digest.update(repr((name, tuple(bbox))).encode("utf-8"))
+        digest.update(doc.xref_stream_raw(xref) or b"")
+    for _, ext, font_type, basefont, name, encoding, *_ in page.get_fonts(full=True):
+        digest.update(repr((ext, font_type, basefont, name, encoding)).encode("utf-8"))
+    for annot in page.annots():
+        digest.update(doc.xref_stream_raw(annot.xref) or b"")
+        rect = annot.rect
+        bounds = (rect.x0, rect.y0, rect.x1, rect.y1)
+        digest.update(repr((annot.type, bounds)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class _PageCache:
+    """画像化前に参照するページ単位のOCR結果キャッシュ
+
+    ファイル内容のハッシュ・ページ番号のキーと、ページの描画内容のハッシュのキーの
+    両方で保存し、どちらかが一致すれば画像化とAPI呼び出しを省略する。
+    いずれのキーにも画像化の設定と検出タイプを含める。
+    """
+
+    def __init__(
+        self, cache: OCRResultCache, options: PdfProcessOptions, detection_type: str
+    ) -> None:
+        self._cache = cache
+        self._detection_type = detection_type
+        self._settings = repr(
+            (
+                options.render_dpi,
+                options.dpi_mode,
+                options.max_render_pixels,
+                options.colorspace,
+                options.render_alpha,
+                options.image_format,
+                options.jpeg_quality,
+                options.auto_crop,
+                options.crop_padding,
+                options.enhance,
+                options.binarize_bits,
+            )
+        )
+
+    def keys(self, file_digest: str, page: fitz.Page) -> list[str]:
+        """ページのキャッシュキー（ファイル・ページ番号、描画内容）を生成"""
+        names = [
+            f"pdf-file:{file_digest}:{page.number}:{self._settings}",
+            f"pdf-page:{hash_page_content(page)}:{self._settings}",
+        ]
+        return [
+            OCRResultCache.make_key(name.encode("utf-8"), self._detection_type)
+            for name in names
+        ]
+
+    def get(self, keys: list[str]) -> Optional[str]:
+        for key in keys:
+            text = self._cache.get(key)
+            if text is not None:
+                return text
+        return None
+
+    def lookup(
+        self, file_digest: str, page: fitz.Page
+    ) -> tuple[Optional[str], list[str]]:
+        """キャッシュ済みの結果と保存用のキーを取得
+
+        キーの生成やキャッシュの参照に失敗した場合は、キャッシュを使わずに
+        画像化できるよう結果・キーとも空で返す。
+        """
+        try:
+            keys = self.keys(file_digest, page)
+            return self.get(keys), keys
+        except Exception as e:
+            logging.warning(f"ページ単位のOCR結果キャッシュを参照できませんでした: {e}")
+            return None, []
+
+    def put(self, keys: list[str], text: str) -> None:
+        """OCR結果を保存（保存に失敗してもOCR結果は呼び出し元へ返す）"""
+        try:
+            for key in keys:
+                self._cache.put(key, text)
+        except sqlite3.Error as e:
+            logging.warning(
+                f"ページ単位のOCR結果のキャッシュへの保存に失敗しました: {e}"
+            )
+
+
+def resolve_render_dpi(page: fitz.Page, options: PdfProcessOptions) -> float:
+    """ページを画像化する解像度を決定
+
+    adaptiveモードでは render_dpi を上限とし、画素数が max_render_pixels を
+    超えないように解像度を下げる。
+    """
+    dpi = float(options.render_dpi)
+    if options.dpi_mode != DPI_MODE_ADAPTIVE:
+        return dpi
+
+    area_inches = (page.rect.width * page.rect.height) / PDF_POINTS_PER_INCH**2
+    if area_inches <= 0:
+        return dpi
+    return min(dpi, math.sqrt(options.max_render_pixels / area_inches))
+
+
+def _render_page_pixmap(page: fitz.Page, options: PdfProcessOptions) -> fitz.Pixmap:
+    """PDFページを設定の解像度・色空間でPixmapへ変換"""
+    zoom = resolve_render_dpi(page, options) / PDF_POINTS_PER_INCH
+    colorspace = fitz.csRGB if options.colorspace == COLORSPACE_RGB else fitz.csGRAY
+    return page.get_pixmap(
+        matrix=fitz.Matrix(zoom, zoom),
+        colorspace=colorspace,
+        alpha=options.render_alpha,
+    )
+
+
+def _encode_pixmap(pixmap: fitz.Pixmap, options: PdfProcessOptions) -> bytes:
+    """PixmapをPIL Imageを経由せずにアップロード用のバイト列へエンコード"""
+    if options.image_format == IMAGE_FORMAT_JPEG:
+        if pixmap.alpha:
+            # JPEGはアルファチャネルを扱えないため除去する
+            pixmap = fitz.Pixmap(pixmap, 0)
+        return pixmap.tobytes("jpeg", jpg_quality=options.jpeg_quality)
+    return pixmap.tobytes("png")
+
+
+def _pixmap_to_gray(pixmap: fitz.Pixmap) -> Image.Image:
+    """Pixmapを判定用のグレースケール画像へ変換（アルファチャネルは白背景に合成）"""
+    mode = {1: "L", 2: "LA", 3: "RGB", 4: "RGBA"}.get(pixmap.n)
+    if mode is None:
+        # CMYKなどは一旦グレースケールへ変換する
+        pixmap = fitz.Pixmap(fitz.csGRAY, pixmap)
+        mode = "LA" if pixmap.alpha else "L"
+    image = Image.frombytes(mode, (pixmap.width, pixmap.height), pixmap.samples)
+    if pixmap.alpha:
+        background = Image.new("L", image.size, 255)
+        background.paste(image.convert("L"), mask=image.getchannel("A"))
+        return background
+    return image if image.mode == "L" else image.convert("L")
+
+
+def _ink_coverage(gray: Image.Image) -> float:
+    if gray.width == 0 or gray.height == 0:
+        return 0.0
+    histogram = gray.histogram()
+    background = histogram.index(max(histogram))
+    ink = sum(
+        count
+        for value, count in enumerate(histogram)
+        if abs(value - background) > _INK_CONTRAST
+    )
+    return ink / (gray.width * gray.height)
+
+
+def measure_ink_coverage(pixmap: fitz.Pixmap) -> float:
+    """Pixmapのインク（背景と明るさが異なる画素）の割合を求める（0.0〜1.0）
+
+    背景は最も多い輝度とし、そこから _INK_CONTRAST を超えて明るい・暗い画素を数える。
+
+    輝度のヒストグラムはPillowのC実装で集計するため、ページ全体でも数ミリ秒で済む。
+    アルファチャネルがある場合は白背景に合成してから判定する。
+    """
+    if pixmap.width == 0 or pixmap.height == 0:
+        return 0.0
+    return _ink_coverage(_pixmap_to_gray(pixmap))
+
+
+def _crop_pixmap(
+    pixmap: fitz.Pixmap, gray: Image.Image, options: PdfProcessOptions
+) -> fitz.Pixmap:
+    """周囲の余白を切り取ったPixmapを返す（余白がない場合はそのまま返す）"""
+    box = find_content_box(gray, options.crop_padding)
+    if box is None or box == (0, 0, pixmap.width, pixmap.height):
+        return pixmap
+    rect = fitz.IRect(box)
+    cropped = fitz.Pixmap(pixmap.colorspace, rect, pixmap.alpha)
+    cropped.copy(pixmap, rect)
+    return cropped
+
+
+def _encode_enhanced(gray: Image.Image, options: PdfProcessOptions) -> bytes:
+    """グレースケール化したページの余白の切り取り・画質補正を行ってエンコード"""
+    if options.auto_crop:
+        box = find_content_box(gray, options.crop_padding)
+        if box is not None:
+            gray = gray.crop(box)
+    image = enhance_image(gray, options.enhance, options.binarize_bits)
+    strategy = (
+        ENCODING_JPEG if options.image_format == IMAGE_FORMAT_JPEG else ENCODING_PNG
+    )
+    encoding = ImageEncodingOptions(strategy=strategy, quality=options.jpeg_quality)
+    return encode_image(image, encoding).content
+
+
+def _extract_text_layer(page: fitz.Page, options: PdfProcessOptions) -> Optional[str]:
+    """テキストレイヤーを採用する場合はその文字列を返す（OCRが必要な場合は None）"""
+    if options.text_layer_mode == TEXT_LAYER_NEVER:
+        return None
+
+    # "text" 形式の戻り値は常に文字列
+    text = cast(str, page.get_text("text"))
+    if options.text_layer_mode == TEXT_LAYER_ALWAYS:
+        return text
+    if len("".join(text.split())) >= options.text_layer_min_chars:
+        return text
+    return None
+
+
+def _render_page(page: fitz.Page, options: PdfProcessOptions) -> _PageEntry:
+    """ページを画像化してエンコード（空白ページは _BLANK_PAGE を返す）"""
+    pixmap = _render_page_pixmap(page, options)
+    enhance = options.enhance != ENHANCE_OFF
+    if options.blank_page_threshold > 0 or options.auto_crop or enhance:
+        gray = _pixmap_to_gray(pixmap)
+        # インクの割合が閾値以下のページは空白とみなす
+        threshold = options.blank_page_threshold
+        if threshold > 0 and _ink_coverage(gray) <= threshold:
+            return _BLANK_PAGE
+        if enhance:
+            return _encode_enhanced(gray, options)
+        if options.auto_crop:
+            pixmap = _crop_pixmap(pixmap, gray, options)
+    return _encode_pixmap(pixmap, options)
+
+
+def _prepare_page(
+    page: fitz.Page,
+    options: PdfProcessOptions,
+    stats: PdfProcessStats,
+    page_cache: Optional[_PageCache] = None,
+    file_digest: str = "",
+) -> tuple[_PageEntry, list[str]]:
+    """テキストレイヤーの取得、キャッシュの参照、または画像化を行う
+
+    画像化したページは、OCR結果をキャッシュへ保存するためのキーも返す。
+    PyMuPDFはスレッドセーフではないため、呼び出し元スレッドでのみ実行する。
+    """
+    started = time.perf_counter()
+    text = _extract_text_layer(page, options)
+    if text is not None:
+        stats.text_layer_seconds += time.perf_counter() - started
+        return text, []
+
+    keys: list[str] = []
     try:
-        image = _render_page_to_image(page)
-        return ocr_service.perform_ocr(image)
+        if page_cache is not None:
+            cached, keys = page_cache.lookup(file_digest, page)
+            if cached is not None:
+                return _CachedPage(cached), []
+        return _render_page(page, options), keys
     except Exception:
-        return UIMessages.PDF_OCR_FAILED
+        return None, keys
+    finally:
+        stats.render_seconds += time.perf_counter() - started
 
 
-def process_pdf_files(
+def _ocr_entries(
+    entries: list[_PageEntry],
+    ocr_service: VisionOCRService,
+    cancel_event: Optional[threading.Event] = None,
+    concurrency: Optional[AdaptiveConcurrencyLimiter] = None,
+) -> _BatchResult:
+    """画像化済みのページをまとめてOCR処理（失敗したページのみフェイルバック文言を返す）
+
+    concurrency を指定した場合は、応答時間とスロットリングの有無を記録する。
+    スロットリングは再試行の試行ごとに通知を受け、最初の失敗の時点で同時実行数を減らす。
+    """
+    result = _BatchResult(
+        texts=[UIMessages.PDF_OCR_FAILED] * len(entries),
+        sources=[PAGE_SOURCE_FAILED] * len(entries),
+    )
+    if cancel_event is not None and cancel_event.is_set():
+        result.cancelled = True
+        return result
+
+    targets: list[tuple[int, bytes]] = []
+    for index, entry in enumerate(entries):
+        if isinstance(entry, str):
+            if entry.strip():
+                result.texts[index] = entry
+                result.sources[index] = PAGE_SOURCE_TEXT_LAYER
+        elif isinstance(entry, _BlankPage):
+            result.texts[index] = UIMessages.PDF_BLANK_PAGE
+            result.sources[index] = PAGE_SOURCE_BLANK
+        elif isinstance(entry, _CachedPage):
+            result.texts[index] = entry.text
+            result.sources[index] = PAGE_SOURCE_CACHE
+        elif entry is not None:
+            targets.append((index, entry))
+
+    if not targets:
+        return result
+
+    contents = [content for _, content in targets]
+    started = time.perf_counter()
+    call_started = concurrency.now() if concurrency is not None else 0.0
+    errors: list[BaseException] = []
+    throttled = False
+
+    def report_throttle() -> None:
+        # 再試行を待たずに同時実行数を減らす（同じ呼び出しでの2回目以降は減らさない）
+        nonlocal throttled
+        throttled = True
+        if concurrency is not None:
+            concurrency.on_throttle(call_started)
+
+    try:
+        ocr_results = ocr_service.perform_ocr_batch_bytes(
+            contents, on_throttle=report_throttle
+        )
+    except Exception as e:
+        ocr_results = []
+        errors.append(e)
+    result.ocr_seconds = time.perf_counter() - started
+
+    if concurrency is not None:
+        errors.extend(r for r in ocr_results if isinstance(r, Exception))
+        if throttled or any(is_throttling_error(error) for error in errors):
+            # 再試行で成功した場合も、待機を含む応答時間で同時実行数を増やさない
+            concurrency.on_throttle(call_started)
+        else:
+            concurrency.on_success(result.ocr_seconds)
+    result.ocr_pages = len(targets)
+    result.api_calls = len(split_batches([len(content) for content in contents]))
+
+    for (index, _), ocr_result in zip(targets, ocr_results):
+        if isinstance(ocr_result, str):
+            result.texts[index] = ocr_result
+            result.sources[index] = PAGE_SOURCE_OCR
+    return result
+
+
+@dataclass
+class _PendingBatch:
+    """ワーカーへ投入済みのバッチ"""
+
+    file_path: str
+    first_page_num: int
+    prepare_seconds: list[float]
+    cache_keys: list[list[str]]
+    future: Future[_BatchResult]
+
+
+def _collect_batch(
+    batch: _PendingBatch,
+    stats: PdfProcessStats,
+    page_cache: Optional[_PageCache] = None,
+) -> Iterator[PdfPageResult]:
+    """バッチのOCR結果を集計し、ページ単位の結果を順に返す
+
+    page_cache を指定した場合は、OCRに成功したページの結果を保存する。
+    """
+    result = batch.future.result()
+    stats.ocr_pages += result.ocr_pages
+    stats.api_calls += result.api_calls
+    stats.ocr_seconds += result.ocr_seconds
+    # バッチのOCR時間はOCR対象ページで按分する
+    ocr_share = result.ocr_seconds / result.ocr_pages if result.ocr_pages else 0.0
+
+    for offset, (text, source) in enumerate(zip(result.texts, result.sources)):
+        if source == PAGE_SOURCE_TEXT_LAYER:
+            stats.text_layer_pages += 1
+        elif source == PAGE_SOURCE_BLANK:
+            stats.blank_pages += 1
+        elif source == PAGE_SOURCE_CACHE:
+            stats.cached_pages += 1
+        elif source == PAGE_SOURCE_FAILED:
+            stats.failed_pages += 1
+        seconds = batch.prepare_seconds[offset]
+        if source == PAGE_SOURCE_OCR:
+            seconds += ocr_share
+            if page_cache is not None and batch.cache_keys[offset]:
+                page_cache.put(batch.cache_keys[offset], text)
+        yield PdfPageResult(
+            file_path=batch.file_path,
+            page_num=batch.first_page_num + offset,
+            text=text,
+            source=source,
+            seconds=seconds,
+        )
+
+
+def count_pdf_pages(pdf_paths: list[str], max_pages: int = DEFAULT_MAX_PAGES) -> int:
+    """処理対象となるページ数（最大ページ数で打ち切り）を取得"""
+    total = 0
+    for pdf_path in pdf_paths:
+        if total >= max_pages:
+            break
+        with fitz.open(pdf_path) as doc:
+            total += min(len(doc), max_pages - total)
+    return total
+
+
+def iter_pdf_pages(
     pdf_paths: list[str],
     ocr_service: VisionOCRService,
     max_pages: int = DEFAULT_MAX_PAGES,
-) -> str:
-    """複数PDFファイルの全ページをOCR処理してテキストを返す
+    options: Optional[PdfProcessOptions] = None,
+    stats: Optional[PdfProcessStats] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> Generator[PdfPageResult, None, None]:
+    """複数PDFファイルの全ページをOCR処理し、完了したページから順に結果を返す
+
+    テキストレイヤーを持つページはOCRを行わずにその文字列を使用する。
+    画像化したページのインクの割合が閾値以下の場合は空白ページとしてOCRを省略し、
+    それ以外のページは周囲の余白を切り取ってから送信する。
+    OCR結果キャッシュが有効な場合は画像化の前にページ単位の結果を参照する。
+    ページの画像化は呼び出し元スレッドで行い、OCRはワーカースレッドへ投入する。
+    API呼び出しを最大 max_workers 件実行している間に次のページを画像化し、
+    1ページ画像化するたびに完了済みの先頭のバッチの結果を返す。
+    adaptiveモードでは応答時間とスロットリングに応じて同時実行数を調整し（AIMD）、
+    調整した同時実行数は次のジョブへ引き継ぐ。
+    結果はファイル順・ページ順に、先頭のバッチが完了するたびに返される。
 
     Args:
         pdf_paths: PDFファイルパスのリスト
         ocr_service: OCRサービスインスタンス
         max_pages: 処理する最大ページ数（全ファイル合計）
+        options: バッチサイズ・並列数などのオプション
+        stats: 処理経路ごとのページ数を書き込む集計オブジェクト
+        progress_callback: (処理済みページ数, 総ページ数) を受け取るコールバック
+        cancel_event: セットされると以降のAPI呼び出しを行わずに処理を打ち切る
     """
-    all_parts: list[str] = []
+    options = options or PdfProcessOptions()
+    stats = stats if stats is not None else PdfProcessStats()
+    batch_size = max(1, options.batch_size)
+    max_workers = max(1, options.max_workers)
+    concurrency: Optional[AdaptiveConcurrencyLimiter] = None
+    history_start = 0
+    if options.concurrency_mode == CONCURRENCY_ADAPTIVE:
+        # 前回までのジョブで調整した同時実行数から開始する
+        concurrency = get_shared_concurrency_limiter(
+            options.initial_workers, max_workers, options.latency_budget
+        )
+        history_start = len(concurrency.history)
+    page_cache: Optional[_PageCache] = None
+    if options.page_cache and ocr_service.cache is not None:
+        page_cache = _PageCache(ocr_service.cache, options, ocr_service.detection_type)
+    total_pages = count_pdf_pages(pdf_paths, max_pages) if progress_callback else 0
+
+    pending: deque[_PendingBatch] = deque()
     processed_pages = 0
+    collected_pages = 0
 
-    for pdf_path in pdf_paths:
-        if processed_pages >= max_pages:
-            break
-        with fitz.open(pdf_path) as doc:
-            for page_num, page in enumerate(cast(list[fitz.Page], doc), 1):
-                if processed_pages >= max_pages:
-                    break
-                footer = UIMessages.PDF_PAGE_FOOTER.format(page_num=page_num)
-                text = _ocr_page(page, ocr_service)
-                all_parts.append(f"{text}\n{footer}")
-                processed_pages += 1
-
-    if processed_pages >= max_pages:
-        warning = UIMessages.PDF_PAGE_LIMIT_WARNING.format(max_pages=max_pages)
-        all_parts.append(warning)
+    def is_cancelled() -> bool:
+        return cancel_event is not None and cancel_event.is_set()
+
+    def submit(
+        file_path: str,
+        first_page_num: int,
+        entries: list[_PageEntry],
+        prepare_seconds: list[float],
+        cache_keys: list[list[str]],
+    ) -> None:
+        future = executor.submit(
+            _ocr_entries, entries, ocr_service, cancel_event, concurrency
+        )
+        pending.append(
+            _PendingBatch(
+                file_path, first_page_num, prepare_seconds, cache_keys, future
+            )
+        )
+
+    def concurrency_limit() -> int:
+        return concurrency.limit if concurrency is not None else max_workers
+
+    def wait_for_slot() -> Iterator[PdfPageResult]:
+        # 実行中のバッチが上限に達している間は先頭から順に結果を返し、空きを待つ
+        while len(pending) >= concurrency_limit():
+            yield from collect(pending.popleft())
+
+    def drain_completed() -> Iterator[PdfPageResult]:
+        # 完了済みのバッチを先頭から順に返す（先頭が未完了の場合は待たない）
+        while pending and pending[0].future.done():
+            yield from collect(pending.popleft())
+
+    def collect(batch: _PendingBatch) -> list[PdfPageResult]:
+        nonlocal collected_pages
+        if batch.future.result().cancelled:
+            return []
+        pages = list(_collect_batch(batch, stats, page_cache))
+        collected_pages += len(pages)
+        if progress_callback:
+            progress_callback(collected_pages, total_pages)
+        return pages
+
+    if progress_callback:
+        progress_callback(0, total_pages)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for pdf_path in pdf_paths:
+            if processed_pages >= max_pages or is_cancelled():
+                break
+            file_digest = hash_file(pdf_path) if page_cache is not None else ""
+            with fitz.open(pdf_path) as doc:
+                page_count = min(len(doc), max_pages - processed_pages)
+                entries: list[_PageEntry] = []
+                prepare_seconds: list[float] = []
+                cache_keys: list[list[str]] = []
+                image_count = 0
+                for page_index in range(page_count):
+                    if is_cancelled():
+                        break
+                    started = time.perf_counter()
+                    entry, keys = _prepare_page(
+                        doc.load_page(page_index),
+                        options,
+                        stats,
+                        page_cache,
+                        file_digest,
+                    )
+                    prepare_seconds.append(time.perf_counter() - started)
+                    entries.append(entry)
+                    cache_keys.append(keys)
+                    yield from drain_completed()
+                    if isinstance(entry, bytes):
+                        image_count += 1
+                    if image_count >= batch_size:
+                        first_page_num = page_index + 2 - len(entries)
+                        yield from wait_for_slot()
+                        submit(
+                            pdf_path,
+                            first_page_num,
+                            entries,
+                            prepare_seconds,
+                            cache_keys,
+                        )
+                        entries, prepare_seconds, cache_keys = [], [], []
+                        image_count = 0
+                if entries and not is_cancelled():
+                    first_page_num = page_count + 1 - len(entries)
+                    yield from wait_for_slot()
+                    submit(
+                        pdf_path, first_page_num, entries, prepare_seconds, cache_keys
+                    )
+                processed_pages += page_count
+
+        while pending:
+            batch = pending.popleft()
+            # 中止時は未着手のバッチを取り消し、送信済みのバッチのみ回収する
+            if is_cancelled() and batch.future.cancel():
+                continue
+            yield from collect(batch)
+
+    stats.cancelled = is_cancelled()
+    stats.limit_reached = processed_pages >= max_pages
+    if concurrency is not None:
+        stats.concurrency_history = concurrency.history_since(history_start)
+    logging.info(f"PDF処理が完了しました: {stats.summary()}")
+
+
+def format_page_result(page: PdfPageResult) -> str:
+    """ページ単位の結果をページフッター付きの文字列に整形"""
+    footer = UIMessages.PDF_PAGE_FOOTER.format(page_num=page.page_num)
+    return f"{page.text}\n{footer}"
+
+
+def format_job_notice(
+    stats: PdfProcessStats, max_pages: int = DEFAULT_MAX_PAGES
+) -> Optional[str]:
+    """処理の打ち切りを知らせる末尾の文言（中止・ページ数上限）を取得"""
+    if stats.cancelled:
+        return UIMessages.PDF_CANCELLED
+    if stats.limit_reached:
+        return UIMessages.PDF_PAGE_LIMIT_WARNING.format(max_pages=max_pages)
+    return None
+
+
+def process_pdf_files(
+    pdf_paths: list[str],
+    ocr_service: VisionOCRService,
+    max_pages: int = DEFAULT_MAX_PAGES,
+    options: Optional[PdfProcessOptions] = None,
+    stats: Optional[PdfProcessStats] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> str:
+    """複数PDFファイルの全ページをOCR処理してテキストを返す
+
+    iter_pdf_pages の結果をまとめて1つの文字列にする。引数は iter_pdf_pages と同じ。
+    """
+    stats = stats if stats is not None else PdfProcessStats()
+    pages = iter_pdf_pages(
+        pdf_paths,
+        ocr_service,
+        max_pages,
+        options,
+        stats,
+        progress_callback,
+        cancel_event,
+    )
+    all_parts = [format_page_result(page) for page in pages]
+
+    notice = format_job_notice(stats, max_pages)
+    if notice is not None:
+        all_parts.append(notice)
 
     return "\n\n".join(all_parts)
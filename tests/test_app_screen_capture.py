@@ -1,8 +1,8 @@
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, call
 from PIL import Image
 
-from app.app_screen_capture import ScreenCapture
+from app.app_screen_capture import ScreenCapture, ocr_regions
 
 
 @pytest.fixture
@@ -31,6 +31,7 @@ def mock_tk(mock_canvas):
 def screen_capture(mock_tk, mock_config_manager, mock_vision_ocr, mock_canvas):
     instance = ScreenCapture()
     instance.canvas = mock_canvas
+    instance.selection_rect, instance.size_label, instance.hint_label = 1, 2, 3
     return instance
 
 
@@ -39,12 +40,14 @@ def mock_config_manager():
     with patch("app.app_screen_capture.ConfigManager") as mock:
         config_instance = mock.return_value
         config_instance.get_screen_capture_settings.return_value = (0.3, 2)
+        config_instance.get_freeze_screen.return_value = False
+        config_instance.get_screen_grab_backend.return_value = "pyautogui"
         yield config_instance
 
 
 @pytest.fixture
 def mock_vision_ocr():
-    with patch("app.app_screen_capture.VisionOCRService") as mock:
+    with patch("app.app_screen_capture.get_shared_ocr_service") as mock:
         ocr_instance = mock.return_value
         ocr_instance.perform_ocr.return_value = "テスト文字列"
         yield ocr_instance
@@ -75,24 +78,74 @@ def test_on_press(screen_capture):
 
 
 def test_on_drag(screen_capture):
-    """ドラッグ時の処理をテスト"""
-    # 初期位置の設定
+    """ドラッグ時は既存の選択矩形の座標を更新すること"""
     screen_capture.start_x = 100
     screen_capture.start_y = 200
 
-    event = Mock()
-    event.x = 300
-    event.y = 400
+    screen_capture._on_drag(Mock(x=300, y=400))
+    screen_capture._redraw_selection()
+
+    screen_capture.canvas.coords.assert_any_call(
+        screen_capture.selection_rect, 100, 200, 300, 400
+    )
+    screen_capture.canvas.create_rectangle.assert_not_called()
+    screen_capture.canvas.delete.assert_not_called()
+
+
+def test_on_drag_coalesces_motion_events(screen_capture):
+    """連続したモーションイベントは1回の再描画にまとめ、最新の位置で描画すること"""
+    screen_capture.start_x = 0
+    screen_capture.start_y = 0
+
+    for x in range(10, 60, 10):
+        screen_capture._on_drag(Mock(x=x, y=x))
+
+    screen_capture.root.after.assert_called_once()
+    _, callback = screen_capture.root.after.call_args.args
+    callback()
+
+    rect_calls = [
+        c
+        for c in screen_capture.canvas.coords.call_args_list
+        if c.args[0] == screen_capture.selection_rect
+    ]
+    assert rect_calls == [call(screen_capture.selection_rect, 0, 0, 50, 50)]
+    screen_capture.canvas.itemconfigure.assert_any_call(
+        screen_capture.size_label, text="50 × 50", state="normal"
+    )
+
 
-    # 既存の選択矩形がある場合のための初期化を追加
-    screen_capture.selection_rect = None  # この行を追加
+def test_size_label_text_updated_only_on_change(screen_capture):
+    """選択範囲の寸法が変わらない場合は寸法表示の文字列を更新しないこと"""
+    screen_capture.start_x = 0
+    screen_capture.start_y = 0
+
+    screen_capture._on_drag(Mock(x=50, y=50))
+    screen_capture._redraw_selection()
+    screen_capture._on_drag(Mock(x=50, y=50))
+    screen_capture._redraw_selection()
+
+    text_updates = [
+        c
+        for c in screen_capture.canvas.itemconfigure.call_args_list
+        if "text" in c.kwargs
+    ]
+    assert len(text_updates) == 1
+
+
+def test_release_cancels_pending_redraw(screen_capture):
+    """マウスを離した時点で保留中の再描画を取り消すこと"""
+    screen_capture.start_x = 100
+    screen_capture.start_y = 200
+    screen_capture._on_drag(Mock(x=300, y=400))
 
-    screen_capture._on_drag(event)
+    with patch("pyautogui.screenshot"):
+        screen_capture._on_release(Mock(x=300, y=400, state=0))
 
-    # 矩形が正しく作成されたことを確認
-    screen_capture.canvas.create_rectangle.assert_called_once_with(
-        100, 200, 300, 400, outline="red", width=screen_capture.outline_width
+    screen_capture.root.after_cancel.assert_called_once_with(
+        screen_capture.root.after.return_value
     )
+    assert screen_capture._redraw_job is None
 
 
 def test_process_screenshot_success(screen_capture, mock_vision_ocr):
@@ -147,3 +200,243 @@ def test_process_screenshot_ocr_error(screen_capture, mock_vision_ocr):
         mock_error.assert_called_once_with(
             "OCRエラー", "テキスト認識中にエラーが発生しました: OCRエラー"
         )
+
+
+@pytest.fixture
+def overlay_capture(mock_config_manager, mock_canvas):
+    """アプリのウィンドウが所有するToplevelとして作成したオーバーレイ"""
+    with patch("tkinter.Toplevel") as mock_toplevel:
+        toplevel = mock_toplevel.return_value
+        toplevel.winfo_screenwidth.return_value = 1920
+        toplevel.winfo_screenheight.return_value = 1080
+        master = MagicMock()
+        instance = ScreenCapture(
+            capture_only=True, master=master, config_manager=mock_config_manager
+        )
+        instance.canvas = mock_canvas
+        yield instance, mock_toplevel, master
+
+
+def test_overlay_created_hidden(overlay_capture):
+    """Toplevelとして作成され、start() まで表示されないこと"""
+    instance, mock_toplevel, master = overlay_capture
+
+    mock_toplevel.assert_called_once_with(master)
+    instance.root.withdraw.assert_called_once()
+    instance.root.deiconify.assert_not_called()
+
+
+def test_overlay_release_calls_callback(overlay_capture):
+    """選択の完了時にスクリーンショットをコールバックへ渡し、mainloopを終了しないこと"""
+    instance, _, _ = overlay_capture
+    on_finished = Mock()
+    instance.start(on_finished)
+    instance.root.deiconify.assert_called_once()
+
+    press = Mock(x=100, y=200)
+    release = Mock(x=300, y=400, state=0)
+    with patch("pyautogui.screenshot") as mock_screenshot:
+        instance._on_press(press)
+        instance._on_release(release)
+
+    on_finished.assert_called_once_with([mock_screenshot.return_value])
+    instance.root.quit.assert_not_called()
+
+
+def test_overlay_restart_resets_selection(overlay_capture, mock_canvas):
+    """再表示時に前回の選択矩形を隠し、追加した範囲と結果を破棄すること"""
+    instance, _, _ = overlay_capture
+    instance.start_x = 100
+    instance.screenshots = [Mock(spec=Image.Image)]
+    instance.regions = [(0, 0, 10, 10)]
+    instance._region_items = [4, 5]
+
+    instance.start(Mock())
+
+    mock_canvas.itemconfigure.assert_any_call(instance.selection_rect, state="hidden")
+    assert [c.args for c in mock_canvas.delete.call_args_list] == [(4,), (5,)]
+    assert instance.screenshots == []
+    assert instance.regions == []
+    assert instance.start_x is None
+
+
+def test_overlay_cancel_calls_callback(overlay_capture):
+    """Escで中止した場合は空のリストをコールバックへ渡すこと"""
+    instance, _, _ = overlay_capture
+    on_finished = Mock()
+    instance.start(on_finished)
+
+    instance._cancel(Mock())
+
+    on_finished.assert_called_once_with([])
+    instance.root.withdraw.assert_called()
+
+
+def test_overlay_close_by_window_manager_calls_callback(overlay_capture):
+    """ウィンドウマネージャーで閉じた場合も中止としてコールバックを呼ぶこと"""
+    instance, _, _ = overlay_capture
+    on_finished = Mock()
+    instance.start(on_finished)
+
+    instance.root.protocol.assert_called_once_with("WM_DELETE_WINDOW", instance._cancel)
+    close = instance.root.protocol.call_args.args[1]
+    close()
+
+    on_finished.assert_called_once_with([])
+    instance.root.withdraw.assert_called()
+
+
+@pytest.fixture
+def frozen_capture(overlay_capture, mock_config_manager):
+    """静止画モードのオーバーレイ（撮影画像は画面の論理サイズの2倍）"""
+    instance, _, _ = overlay_capture
+    instance.freeze_screen = True
+    snapshot = Image.new("RGB", (3840, 2160), "white")
+    with (
+        patch("pyautogui.screenshot", return_value=snapshot) as mock_screenshot,
+        patch("app.app_screen_capture.ImageTk.PhotoImage") as mock_photo,
+    ):
+        yield instance, mock_screenshot, mock_photo
+
+
+def test_frozen_screen_shown_as_background(frozen_capture, mock_canvas):
+    """表示時に画面全体を一度撮影し、不透明なオーバーレイの背景に表示すること"""
+    instance, mock_screenshot, mock_photo = frozen_capture
+
+    instance.start(Mock())
+
+    mock_screenshot.assert_called_once_with()
+    displayed = mock_photo.call_args.args[0]
+    assert displayed.size == (1920, 1080)
+    mock_canvas.itemconfigure.assert_any_call(
+        instance.background_image, image=mock_photo.return_value, state="normal"
+    )
+    instance.root.attributes.assert_any_call("-alpha", 1.0)
+
+
+def test_frozen_screen_crops_selection(frozen_capture):
+    """マウスを離した時は再撮影せず、静止画から選択範囲を切り出すこと"""
+    instance, mock_screenshot, _ = frozen_capture
+    on_finished = Mock()
+    instance.start(on_finished)
+
+    instance._on_press(Mock(x=100, y=200))
+    instance._on_release(Mock(x=300, y=400, state=0))
+
+    mock_screenshot.assert_called_once_with()
+    (screenshot,) = on_finished.call_args.args[0]
+    # 撮影画像は論理座標の2倍のため、切り出す範囲も2倍になる
+    assert screenshot.size == (400, 400)
+    assert instance._snapshot is None
+    instance.root.update_idletasks.assert_not_called()
+
+
+def test_frozen_screen_falls_back_on_grab_error(overlay_capture):
+    """画面全体の撮影に失敗した場合は半透明のオーバーレイで範囲ごとに撮影すること"""
+    instance, _, _ = overlay_capture
+    instance.freeze_screen = True
+    on_finished = Mock()
+
+    with patch("pyautogui.screenshot") as mock_screenshot:
+        mock_screenshot.side_effect = [OSError("grab failed"), Mock(spec=Image.Image)]
+        instance.start(on_finished)
+        instance._on_press(Mock(x=100, y=200))
+        instance._on_release(Mock(x=300, y=400, state=0))
+
+    mock_screenshot.assert_called_with(region=(100, 200, 200, 200))
+    instance.root.attributes.assert_any_call("-alpha", 0.3)
+    on_finished.assert_called_once()
+
+
+def drag(instance, start, end, shift=False):
+    """範囲をドラッグで選択（shift=True の場合はShift+ドラッグ）"""
+    instance._on_press(Mock(x=start[0], y=start[1]))
+    instance._on_drag(Mock(x=end[0], y=end[1]))
+    instance._on_release(Mock(x=end[0], y=end[1], state=0x0001 if shift else 0))
+
+
+def test_shift_drag_adds_regions_in_selection_order(frozen_capture, mock_canvas):
+    """Shift+ドラッグで範囲を追加し、最後の範囲の選択で全範囲を選択順に渡すこと"""
+    instance, mock_screenshot, _ = frozen_capture
+    on_finished = Mock()
+    instance.start(on_finished)
+
+    drag(instance, (500, 500), (600, 550), shift=True)
+    drag(instance, (10, 10), (60, 30), shift=True)
+    on_finished.assert_not_called()
+    instance.root.withdraw.assert_called_once()
+    assert instance.regions == [(500, 500, 600, 550), (10, 10, 60, 30)]
+
+    drag(instance, (100, 100), (110, 120))
+
+    screenshots = on_finished.call_args.args[0]
+    assert [image.size for image in screenshots] == [(200, 100), (100, 40), (20, 40)]
+    mock_screenshot.assert_called_once_with()
+
+
+def test_shift_drag_ignores_too_small_region(overlay_capture):
+    """小さすぎる範囲は追加しないこと"""
+    instance, _, _ = overlay_capture
+    instance.start(Mock())
+
+    drag(instance, (100, 100), (102, 102), shift=True)
+
+    assert instance.regions == []
+
+
+def test_enter_confirms_added_regions(overlay_capture):
+    """Enterキーで追加済みの範囲のみを撮影して確定すること"""
+    instance, _, _ = overlay_capture
+    on_finished = Mock()
+    instance.start(on_finished)
+    drag(instance, (100, 200), (300, 400), shift=True)
+
+    with patch("pyautogui.screenshot") as mock_screenshot:
+        instance._confirm(Mock())
+
+    mock_screenshot.assert_called_once_with(region=(100, 200, 200, 200))
+    on_finished.assert_called_once_with([mock_screenshot.return_value])
+
+
+def test_enter_without_regions_keeps_overlay(overlay_capture):
+    """範囲を追加していない場合はEnterキーで終了しないこと"""
+    instance, _, _ = overlay_capture
+    on_finished = Mock()
+    instance.start(on_finished)
+
+    instance._confirm(Mock())
+
+    on_finished.assert_not_called()
+
+
+def test_ocr_regions_single_uses_perform_ocr():
+    """1範囲のみの場合は perform_ocr で処理すること"""
+    service = Mock()
+    service.perform_ocr.return_value = "テキスト"
+    image = Mock(spec=Image.Image)
+
+    assert ocr_regions(service, [image]) == "テキスト"
+    service.perform_ocr.assert_called_once_with(image)
+    service.perform_ocr_batch.assert_not_called()
+
+
+def test_ocr_regions_batches_in_selection_order():
+    """複数範囲は1回のバッチ処理で送信し、失敗した範囲は表示して選択順に連結すること"""
+    service = Mock()
+    service.perform_ocr_batch.return_value = ["氏名\n", RuntimeError("失敗"), "住所"]
+    images = [Mock(spec=Image.Image) for _ in range(3)]
+
+    assert ocr_regions(service, images) == "氏名\n[範囲2: OCR失敗]\n住所"
+    service.perform_ocr_batch.assert_called_once_with(images)
+    service.perform_ocr.assert_not_called()
+
+
+def test_ocr_regions_all_failed_raises():
+    """全範囲が失敗した場合は最初の例外を送出すること"""
+    service = Mock()
+    error = RuntimeError("失敗")
+    service.perform_ocr_batch.return_value = [error, RuntimeError("失敗2")]
+
+    with pytest.raises(RuntimeError) as excinfo:
+        ocr_regions(service, [Mock(spec=Image.Image), Mock(spec=Image.Image)])
+    assert excinfo.value is error
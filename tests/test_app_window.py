@@ -1,7 +1,9 @@
 import pytest
+from typing import cast
 from unittest.mock import patch, MagicMock
 
 from app.app_window import OCRApplication
+from service.ocr_job_runner import OCRJobRunner
 
 
 @pytest.fixture
@@ -43,12 +45,45 @@ def mock_text_widget():
     return text_widget
 
 
+def make_capture_instance():
+    """start() で即座に選択を完了し、screenshotsをコールバックへ渡すオーバーレイのモック"""
+    capture_instance = MagicMock()
+    capture_instance.screenshots = [MagicMock(name="screenshot")]
+    capture_instance.start.side_effect = lambda on_finished: on_finished(
+        capture_instance.screenshots
+    )
+    return capture_instance
+
+
+class SyncJobRunner:
+    """ジョブを呼び出し元スレッドで即時実行するテスト用ランナー"""
+
+    is_running = False
+
+    def submit(self, job, on_done, on_error, on_progress=None, on_item=None):
+        context = MagicMock()
+        context.cancelled = False
+        if on_item is not None:
+            context.post_item.side_effect = on_item
+        try:
+            result = job(context)
+        except Exception as e:
+            on_error(e)
+        else:
+            on_done(result)
+        return True
+
+    def cancel(self):
+        pass
+
+
 @pytest.fixture
 def app(mock_config_manager, mock_text_widget):
     with (
         patch("tkinter.Tk") as mock_tk,
         patch("tkinter.scrolledtext.ScrolledText", return_value=mock_text_widget),
         patch("app.app_window.ScreenCapture"),
+        patch("app.app_window.get_shared_ocr_service"),
     ):
         # Tkインスタンスの設定
         mock_tk_instance = mock_tk.return_value
@@ -58,6 +93,7 @@ def app(mock_config_manager, mock_text_widget):
 
         app = OCRApplication()
         app.text_area = mock_text_widget
+        app.job_runner = cast(OCRJobRunner, SyncJobRunner())
         yield app
 
 
@@ -69,6 +105,16 @@ def test_initialization(app, mock_config_manager):
     mock_config_manager.get_window_geometry.assert_called_once()
 
 
+def test_start_ocr_warm_up(app):
+    """OCRクライアントのウォームアップがバックグラウンドスレッドで開始されること"""
+    with patch("app.app_window.threading.Thread") as mock_thread:
+        app._start_ocr_warm_up()
+
+    mock_thread.assert_called_once()
+    assert mock_thread.call_args.kwargs["daemon"] is True
+    mock_thread.return_value.start.assert_called_once()
+
+
 def test_on_mode_change(app):
     """プルダウンでの入力モード変更テスト"""
     app._on_mode_change("追記")
@@ -92,10 +138,13 @@ def test_append_mode(app, initial_text, new_text, expected_text):
     app.is_append_mode = True
     app.text_area._content = initial_text
 
-    mock_capture_instance = MagicMock()
-    mock_capture_instance.result_text = new_text
+    mock_capture_instance = make_capture_instance()
 
-    with patch("app.app_window.ScreenCapture", return_value=mock_capture_instance):
+    with (
+        patch("app.app_window.ScreenCapture", return_value=mock_capture_instance),
+        patch("app.app_window.get_shared_ocr_service") as mock_get_service,
+    ):
+        mock_get_service.return_value.perform_ocr.return_value = new_text
         app.capture_screen()
 
     assert app.text_area._content == expected_text
@@ -106,15 +155,179 @@ def test_overwrite_mode(app):
     app.is_append_mode = False
     app.text_area._content = "既存テキスト"
 
-    mock_capture_instance = MagicMock()
-    mock_capture_instance.result_text = "新規テキスト"
+    mock_capture_instance = make_capture_instance()
 
-    with patch("app.app_window.ScreenCapture", return_value=mock_capture_instance):
+    with (
+        patch("app.app_window.ScreenCapture", return_value=mock_capture_instance),
+        patch("app.app_window.get_shared_ocr_service") as mock_get_service,
+    ):
+        mock_get_service.return_value.perform_ocr.return_value = "新規テキスト"
         app.capture_screen()
 
     assert app.text_area._content == "新規テキスト"
 
 
+def test_capture_ocr_runs_in_job(app):
+    """キャプチャ画像のOCRがジョブとして実行され、撮影のみのモードで起動されること"""
+    mock_capture_instance = make_capture_instance()
+
+    with (
+        patch(
+            "app.app_window.ScreenCapture", return_value=mock_capture_instance
+        ) as mock_capture,
+        patch("app.app_window.get_shared_ocr_service") as mock_get_service,
+    ):
+        mock_get_service.return_value.perform_ocr.return_value = "テキスト"
+        app.capture_screen()
+
+    mock_capture.assert_called_once_with(
+        capture_only=True, master=app.root, config_manager=app.config_manager
+    )
+    mock_get_service.return_value.perform_ocr.assert_called_once_with(
+        mock_capture_instance.screenshots[0]
+    )
+
+
+def test_capture_ocr_error_shows_dialog(app):
+    """OCRエラー時はエラーダイアログを表示すること"""
+    with (
+        patch("app.app_window.ScreenCapture", return_value=make_capture_instance()),
+        patch("app.app_window.get_shared_ocr_service") as mock_get_service,
+        patch("app.app_window.messagebox.showerror") as mock_error,
+    ):
+        mock_get_service.return_value.perform_ocr.side_effect = Exception("OCRエラー")
+        app.capture_screen()
+
+    mock_error.assert_called_once_with(
+        "OCRエラー", "テキスト認識中にエラーが発生しました: OCRエラー"
+    )
+
+
+def test_capture_multiple_regions_in_one_batch(app):
+    """複数範囲のキャプチャは1回のバッチ処理でOCRし、選択順に表示すること"""
+    app.is_append_mode = False
+    mock_capture_instance = make_capture_instance()
+    mock_capture_instance.screenshots = [MagicMock(), MagicMock()]
+
+    with (
+        patch("app.app_window.ScreenCapture", return_value=mock_capture_instance),
+        patch("app.app_window.get_shared_ocr_service") as mock_get_service,
+    ):
+        mock_get_service.return_value.perform_ocr_batch.return_value = ["氏名", "住所"]
+        app.capture_screen()
+
+    mock_get_service.return_value.perform_ocr_batch.assert_called_once_with(
+        mock_capture_instance.screenshots
+    )
+    assert app.text_area._content == "氏名\n住所"
+
+
+def test_capture_overlay_reused(app):
+    """範囲選択のオーバーレイは初回のみ作成し、以降は再表示して使い回すこと"""
+    mock_capture_instance = make_capture_instance()
+
+    with (
+        patch(
+            "app.app_window.ScreenCapture", return_value=mock_capture_instance
+        ) as mock_capture,
+        patch("app.app_window.get_shared_ocr_service"),
+    ):
+        app.capture_screen()
+        app.capture_screen()
+
+    mock_capture.assert_called_once()
+    assert mock_capture_instance.start.call_count == 2
+    assert app.root.deiconify.call_count == 2
+
+
+def test_capture_overlay_recreated_after_destroyed(app):
+    """破棄されたオーバーレイは使い回さずに作成し直すこと"""
+    destroyed = make_capture_instance()
+    destroyed.root.winfo_exists.return_value = False
+    recreated = make_capture_instance()
+
+    with (
+        patch(
+            "app.app_window.ScreenCapture", side_effect=[destroyed, recreated]
+        ) as mock_capture,
+        patch("app.app_window.get_shared_ocr_service"),
+    ):
+        app.capture_screen()
+        app.capture_screen()
+
+    assert mock_capture.call_count == 2
+    recreated.start.assert_called_once()
+    assert app._screen_capture is recreated
+
+
+def test_capture_starts_after_main_window_hidden(app):
+    """メインウィンドウを隠して画面に反映してから範囲選択（撮影）を開始すること"""
+    mock_capture_instance = make_capture_instance()
+    calls_at_start = []
+
+    def start(on_finished):
+        calls_at_start.extend(name for name, *_ in app.root.method_calls)
+        on_finished([])
+
+    mock_capture_instance.start.side_effect = start
+
+    with patch("app.app_window.ScreenCapture", return_value=mock_capture_instance):
+        app.root.reset_mock()
+        app.capture_screen()
+
+    assert calls_at_start.index("withdraw") < calls_at_start.index("update")
+    assert "deiconify" not in calls_at_start
+    app.root.deiconify.assert_called_once()
+
+
+def test_capture_cancelled_skips_ocr(app):
+    """範囲選択を中止した場合はOCRを実行せずにウィンドウを元に戻すこと"""
+    mock_capture_instance = make_capture_instance()
+    mock_capture_instance.screenshots = []
+
+    with (
+        patch("app.app_window.ScreenCapture", return_value=mock_capture_instance),
+        patch("app.app_window.get_shared_ocr_service") as mock_get_service,
+    ):
+        app.capture_screen()
+
+    mock_get_service.return_value.perform_ocr.assert_not_called()
+    app.root.deiconify.assert_called_once()
+
+
+def test_capture_rejected_while_job_running(app):
+    """ジョブ実行中は新たなキャプチャを開始しないこと"""
+    app.job_runner.is_running = True
+
+    with (
+        patch("app.app_window.ScreenCapture") as mock_capture,
+        patch("app.app_window.messagebox.showwarning") as mock_warning,
+    ):
+        app.capture_screen()
+
+    mock_capture.assert_not_called()
+    mock_warning.assert_called_once()
+
+
+def test_pdf_pages_appended_as_they_arrive(app):
+    """PDFのページが完了順にテキストエリアへ追加されること"""
+    shown = []
+
+    def fake_iter_pdf_pages(*args, **kwargs):
+        for page_num in (1, 2):
+            yield MagicMock(text=f"本文{page_num}", page_num=page_num)
+            shown.append(app.text_area._content)
+
+    with (
+        patch("app.app_window.filedialog.askopenfilenames", return_value=["a.pdf"]),
+        patch("app.app_window.iter_pdf_pages", side_effect=fake_iter_pdf_pages),
+    ):
+        app.select_pdf_files()
+
+    assert shown[0] == "本文1\n--- 1ページ目 ---"
+    assert shown[1] == "本文1\n--- 1ページ目 ---\n\n本文2\n--- 2ページ目 ---"
+
+
 def test_clear_screen(app):
     """画面クリア機能のテスト"""
     app.text_area._content = "テストテキスト"
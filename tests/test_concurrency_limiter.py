@@ -0,0 +1,144 @@
+import pytest
+
+from utils import concurrency_limiter
+from utils.concurrency_limiter import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyChange,
+    get_shared_concurrency_limiter,
+    summarize_history,
+)
+
+
+class FakeClock:
+    """手動で進める時計"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_increase_after_round_trip_within_budget(clock):
+    """同時実行数分の結果が予算内であれば1ずつ増えること"""
+    limiter = AdaptiveConcurrencyLimiter(
+        initial=2, max_limit=8, latency_budget=1.0, clock=clock
+    )
+
+    limiter.on_success(0.5)
+    assert limiter.limit == 2
+    limiter.on_success(0.5)
+    assert limiter.limit == 3
+
+
+def test_no_increase_over_latency_budget(clock):
+    """応答時間のパーセンタイルが予算を超えている場合は増やさないこと"""
+    limiter = AdaptiveConcurrencyLimiter(
+        initial=2, max_limit=8, latency_budget=1.0, clock=clock
+    )
+
+    for _ in range(4):
+        limiter.on_success(2.0)
+
+    assert limiter.limit == 2
+    assert limiter.latency_percentile() == 2.0
+
+
+def test_throttle_halves_limit(clock):
+    """スロットリングを観測すると同時実行数が半分になること"""
+    limiter = AdaptiveConcurrencyLimiter(initial=8, max_limit=16, clock=clock)
+
+    limiter.on_throttle(limiter.now())
+
+    assert limiter.limit == 4
+
+
+def test_stale_throttle_ignored(clock):
+    """減らす前に開始した呼び出しの失敗では重ねて減らさないこと"""
+    limiter = AdaptiveConcurrencyLimiter(initial=8, max_limit=16, clock=clock)
+    started = limiter.now()
+    clock.now = 1.0
+
+    limiter.on_throttle(started)
+    limiter.on_throttle(started)
+    assert limiter.limit == 4
+
+    clock.now = 2.0
+    limiter.on_throttle(limiter.now())
+    assert limiter.limit == 2
+
+
+def test_limit_bounds(clock):
+    """同時実行数が下限・上限を超えないこと"""
+    limiter = AdaptiveConcurrencyLimiter(
+        initial=10, min_limit=2, max_limit=3, latency_budget=1.0, clock=clock
+    )
+    assert limiter.limit == 3
+
+    for _ in range(10):
+        limiter.on_success(0.1)
+    assert limiter.limit == 3
+
+    clock.now = 1.0
+    limiter.on_throttle(limiter.now())
+    clock.now = 2.0
+    limiter.on_throttle(limiter.now())
+    assert limiter.limit == 2
+
+
+def test_history_and_summary(clock):
+    """変更履歴が記録され、要約文字列に反映されること"""
+    limiter = AdaptiveConcurrencyLimiter(
+        initial=2, max_limit=8, latency_budget=1.0, clock=clock
+    )
+    clock.now = 1.0
+    for _ in range(5):
+        limiter.on_success(0.1)
+    clock.now = 2.0
+    limiter.on_throttle(limiter.now())
+
+    assert [change.reason for change in limiter.history] == [
+        "initial",
+        "increase",
+        "increase",
+        "decrease",
+    ]
+    assert limiter.history[1].elapsed == 1.0
+    assert limiter.summary() == "2→2（最大4, 増加2回, 減少1回）"
+
+
+def test_summarize_history_empty():
+    """履歴が空の場合は空文字列を返すこと"""
+    assert summarize_history([]) == ""
+    assert summarize_history([ConcurrencyChange(0.0, 3, "initial")]) == (
+        "3→3（最大3, 増加0回, 減少0回）"
+    )
+
+
+def test_history_since_prepends_current_limit(clock):
+    """途中からの履歴はその時点の同時実行数を先頭に付けて返すこと"""
+    limiter = AdaptiveConcurrencyLimiter(initial=2, max_limit=8, clock=clock)
+    limiter.on_throttle(limiter.now())
+    start = len(limiter.history)
+    limiter.on_throttle(limiter.now())
+
+    history = limiter.history_since(start)
+
+    assert [(c.limit, c.reason) for c in history] == [(1, "initial")]
+    assert limiter.history_since(0) == limiter.history
+
+
+def test_shared_concurrency_limiter():
+    """共有の制御が再利用され、設定が変わった場合のみ再生成されること"""
+    concurrency_limiter.reset_shared_concurrency_limiter()
+
+    limiter = get_shared_concurrency_limiter(2, 8, 10.0)
+
+    assert get_shared_concurrency_limiter(2, 8, 10.0) is limiter
+    assert get_shared_concurrency_limiter(2, 4, 10.0) is not limiter
+    concurrency_limiter.reset_shared_concurrency_limiter()
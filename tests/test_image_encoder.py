@@ -0,0 +1,86 @@
+import io
+import random
+
+import pytest
+from unittest.mock import Mock
+from PIL import Image, ImageDraw
+
+from utils.image_encoder import (
+    ImageEncodingOptions,
+    encode_image,
+    resolve_strategy,
+)
+
+
+@pytest.fixture
+def text_image():
+    # 白地に黒文字の画面キャプチャ相当の画像
+    image = Image.new("RGB", (400, 200), color="white")
+    ImageDraw.Draw(image).text((20, 80), "VisionOCR 1234", fill="black")
+    return image
+
+
+@pytest.fixture
+def photo_image():
+    # 色数の多い写真相当の画像
+    rng = random.Random(0)
+    data = bytes(rng.randrange(256) for _ in range(200 * 100 * 3))
+    return Image.frombytes("RGB", (200, 100), data)
+
+
+@pytest.mark.parametrize(
+    "strategy,expected_format",
+    [("png", "PNG"), ("fast_png", "PNG"), ("jpeg", "JPEG"), ("webp", "WEBP")],
+)
+def test_encode_image_strategies(text_image, strategy, expected_format):
+    """指定した方式でエンコードされ、サイズと時間が報告されること"""
+    encoded = encode_image(text_image, ImageEncodingOptions(strategy=strategy))
+
+    assert encoded.format == expected_format
+    assert Image.open(io.BytesIO(encoded.content)).format == expected_format
+    assert encoded.size == len(encoded.content)
+    assert encoded.seconds >= 0
+
+
+def test_fast_png_is_lossless(text_image):
+    """高速PNGでも画素が変わらないこと"""
+    encoded = encode_image(text_image, ImageEncodingOptions(strategy="fast_png"))
+
+    decoded = Image.open(io.BytesIO(encoded.content)).convert("RGB")
+    assert decoded.tobytes() == text_image.tobytes()
+
+
+def test_auto_chooses_by_content(text_image, photo_image):
+    """autoモードでは色数の少ない画像はPNG、多い画像はJPEGを選ぶこと"""
+    options = ImageEncodingOptions(strategy="auto")
+
+    assert resolve_strategy(text_image, options) == "fast_png"
+    assert resolve_strategy(photo_image, options) == "jpeg"
+
+
+def test_auto_keeps_png_for_transparency(photo_image):
+    """透過のある画像はautoモードでもPNGを選ぶこと"""
+    image = photo_image.convert("RGBA")
+
+    assert resolve_strategy(image, ImageEncodingOptions()) == "fast_png"
+
+
+def test_jpeg_converts_alpha(photo_image):
+    """JPEGでは透過チャネルを除去してエンコードされること"""
+    image = photo_image.convert("RGBA")
+
+    encoded = encode_image(image, ImageEncodingOptions(strategy="jpeg"))
+
+    assert Image.open(io.BytesIO(encoded.content)).mode == "RGB"
+
+
+def test_options_from_config():
+    """ConfigManagerから設定が生成されること"""
+    config = Mock()
+    config.get_image_encoding.return_value = "webp"
+    config.get_image_quality.return_value = 70
+    config.get_png_compress_level.return_value = 3
+
+    options = ImageEncodingOptions.from_config(config)
+
+    assert options == ImageEncodingOptions("webp", 70, 3)
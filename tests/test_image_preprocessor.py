@@ -0,0 +1,208 @@
+import pytest
+from unittest.mock import Mock
+from PIL import Image, ImageDraw
+
+from utils.image_preprocessor import (
+    ImagePreprocessOptions,
+    binarize_adaptive,
+    crop_margins,
+    enhance_image,
+    estimate_text_height,
+    find_content_box,
+    is_effectively_grayscale,
+    preprocess_image,
+    resolve_scale,
+    stretch_contrast,
+)
+
+
+def _lines_image(size, line_height, background="white", ink="black"):
+    # 指定した高さの横線（文字行相当）を並べた画像
+    image = Image.new("RGB", size, color=background)
+    draw = ImageDraw.Draw(image)
+    for top in range(line_height, size[1] - line_height, line_height * 2):
+        draw.rectangle((10, top, size[0] - 10, top + line_height - 1), fill=ink)
+    return image
+
+
+def test_estimate_text_height():
+    """文字行の高さが推定されること"""
+    assert estimate_text_height(_lines_image((400, 300), 10)) == 10
+
+
+def test_estimate_text_height_dark_background():
+    """暗い背景の画像でも文字行の高さが推定されること"""
+    image = _lines_image((400, 300), 8, background="black", ink="white")
+
+    assert estimate_text_height(image) == 8
+
+
+def test_estimate_text_height_without_text():
+    """文字行がない場合は None を返すこと"""
+    assert estimate_text_height(Image.new("RGB", (100, 100), "white")) is None
+
+
+def test_large_image_downscaled_to_megapixel_cap():
+    """画素数の上限を超える画像が上限まで縮小されること"""
+    image = _lines_image((4000, 3000), 60)
+    options = ImagePreprocessOptions(max_megapixels=3.0, min_text_height=12)
+
+    result = preprocess_image(image, options)
+
+    assert result.width * result.height <= 3_000_000
+    assert result.width >= 1990
+
+
+def test_downscale_keeps_min_text_height():
+    """縮小後の文字の高さが下限を下回らないこと"""
+    image = _lines_image((4000, 3000), 20)
+    options = ImagePreprocessOptions(max_megapixels=1.0, min_text_height=16)
+
+    scale = resolve_scale(image, options)
+
+    assert scale == pytest.approx(0.8)
+
+
+def test_small_image_not_scaled():
+    """上限以下の画像は縮小されないこと"""
+    image = _lines_image((800, 600), 10)
+
+    assert resolve_scale(image, ImagePreprocessOptions(max_megapixels=1.0)) == 1.0
+
+
+def test_grayscale_conversion():
+    """色に意味がない画像のみグレースケールへ変換されること"""
+    gray_like = _lines_image((200, 100), 10)
+    colorful = _lines_image((200, 100), 10, background="white", ink="red")
+
+    assert is_effectively_grayscale(gray_like) is True
+    assert is_effectively_grayscale(colorful) is False
+    assert preprocess_image(gray_like, ImagePreprocessOptions()).mode == "L"
+    assert preprocess_image(colorful, ImagePreprocessOptions()).mode == "RGB"
+
+
+def test_grayscale_disabled():
+    """auto_grayscale が無効の場合は色空間を変えないこと"""
+    image = _lines_image((200, 100), 10)
+    options = ImagePreprocessOptions(auto_grayscale=False)
+
+    assert preprocess_image(image, options).mode == "RGB"
+
+
+def test_options_from_config():
+    """ConfigManagerから設定が生成されること"""
+    config = Mock()
+    config.get_max_megapixels.return_value = 2.5
+    config.get_max_image_bytes.return_value = 1024
+    config.get_min_text_height.return_value = 10
+    config.get_auto_grayscale.return_value = False
+    config.get_auto_crop.return_value = False
+    config.get_crop_padding.return_value = 4
+    config.get_enhance_mode.return_value = "binarize"
+    config.get_binarize_bits.return_value = 8
+
+    options = ImagePreprocessOptions.from_config(config)
+
+    assert options == ImagePreprocessOptions(
+        2.5, 1024, 10, False, False, 4, "binarize", 8
+    )
+
+
+def test_find_content_box_with_padding():
+    """文字のある範囲に余白を加えた範囲が求められること"""
+    image = _lines_image((400, 300), 10)
+
+    assert find_content_box(image, padding=5) == (5, 5, 396, 285)
+
+
+def test_find_content_box_dark_background():
+    """暗い背景の画像でも文字のある範囲が求められること"""
+    image = Image.new("L", (200, 100), 20)
+    image.paste(230, (50, 40, 80, 60))
+
+    assert find_content_box(image) == (50, 40, 80, 60)
+
+
+def test_find_content_box_background_only():
+    """背景のみの画像では None を返すこと"""
+    assert find_content_box(Image.new("RGB", (100, 100), "white")) is None
+
+
+def test_crop_margins_returns_offset():
+    """余白を切り取った画像と元画像での位置が返されること"""
+    image = Image.new("RGB", (300, 200), "white")
+    image.paste((0, 0, 0), (100, 60, 150, 90))
+
+    cropped, offset = crop_margins(image, ImagePreprocessOptions(crop_padding=10))
+
+    assert cropped.size == (70, 50)
+    assert offset == (90, 50)
+
+
+def test_crop_margins_disabled():
+    """auto_crop が無効の場合は切り取らないこと"""
+    image = Image.new("RGB", (300, 200), "white")
+    image.paste((0, 0, 0), (100, 60, 150, 90))
+
+    cropped, offset = crop_margins(image, ImagePreprocessOptions(auto_crop=False))
+
+    assert cropped is image
+    assert offset == (0, 0)
+
+
+def _low_contrast_image():
+    # 左から右へ明るさが変化する背景（照明のむら相当）に、背景よりわずかに暗い文字行
+    image = Image.new("L", (200, 100))
+    image.putdata([120 + x // 4 for _ in range(100) for x in range(200)])
+    draw = ImageDraw.Draw(image)
+    for left in (20, 120):
+        draw.rectangle((left, 40, left + 40, 50), fill=100 + left // 4)
+    return image
+
+
+def test_stretch_contrast_expands_range():
+    """輝度の分布が0〜255へ引き伸ばされること"""
+    stretched = stretch_contrast(_low_contrast_image())
+
+    assert stretched.mode == "L"
+    assert stretched.getextrema() == (0, 255)
+
+
+def test_binarize_adaptive_keeps_text_under_uneven_light():
+    """背景の明るさにむらがあっても文字のみが黒になること"""
+    binary = binarize_adaptive(_low_contrast_image(), bits=8)
+
+    assert binary.mode == "L"
+    assert binary.getpixel((30, 45)) == 0
+    assert binary.getpixel((130, 45)) == 0
+    assert binary.getpixel((30, 80)) == 255
+    assert binary.getpixel((190, 10)) == 255
+
+
+def test_binarize_adaptive_dark_background():
+    """暗い背景の画像は白地に黒文字へ変換されること"""
+    image = Image.new("L", (100, 60), 30)
+    image.paste(200, (20, 20, 60, 30))
+
+    binary = binarize_adaptive(image, bits=1)
+
+    assert binary.mode == "1"
+    assert binary.getpixel((40, 25)) == 0
+    assert binary.getpixel((80, 50)) == 255
+
+
+@pytest.mark.parametrize(
+    "mode,expected_mode", [("off", "RGB"), ("contrast", "L"), ("binarize", "1")]
+)
+def test_enhance_image_modes(mode, expected_mode):
+    """画質補正モードに応じた画像が返されること"""
+    image = _lines_image((100, 100), 10)
+
+    assert enhance_image(image, mode).mode == expected_mode
+
+
+def test_preprocess_image_binarize_option():
+    """設定で二値化を指定した場合は前処理で二値化されること"""
+    options = ImagePreprocessOptions(enhance="binarize", binarize_bits=1)
+
+    assert preprocess_image(_lines_image((100, 100), 10), options).mode == "1"
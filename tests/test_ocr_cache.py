@@ -0,0 +1,99 @@
+import sqlite3
+from unittest.mock import Mock
+
+import pytest
+
+from utils.ocr_cache import OCRResultCache, create_ocr_cache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    instance = OCRResultCache(tmp_path / "cache.sqlite3", max_size_bytes=30)
+    yield instance
+    instance.close()
+
+
+def test_make_key_depends_on_detection_type():
+    """検出タイプが異なれば別のキーになること"""
+    text_key = OCRResultCache.make_key(b"image", "text_detection")
+    document_key = OCRResultCache.make_key(b"image", "document_text_detection")
+
+    assert text_key != document_key
+    assert text_key == OCRResultCache.make_key(b"image", "text_detection")
+
+
+def test_get_and_put_counts_hits_and_misses(cache):
+    """ヒット・ミスが集計されること"""
+    assert cache.get("key") is None
+    cache.put("key", "テキスト")
+
+    assert cache.get("key") == "テキスト"
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_get_returns_text_when_access_update_fails(cache):
+    """最終参照の更新に失敗してもキャッシュ済みのテキストを返すこと"""
+    cache.put("key", "テキスト")
+    conn = cache._conn
+
+    def execute(sql, *args):
+        if sql.startswith("UPDATE"):
+            raise sqlite3.OperationalError("database is locked")
+        return conn.execute(sql, *args)
+
+    cache._conn = Mock(wraps=conn)
+    cache._conn.execute.side_effect = execute
+
+    assert cache.get("key") == "テキスト"
+    cache._conn.rollback.assert_called_once()
+    cache._conn = conn
+
+
+def test_lru_eviction(cache):
+    """上限を超えた場合に最終参照が古いものから削除されること"""
+    cache.put("a", "a" * 10)
+    cache.put("b", "b" * 10)
+    cache.get("a")  # aを最近参照したことにする
+    cache.put("c", "c" * 15)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "a" * 10
+    assert cache.get("c") == "c" * 15
+    assert cache.total_size == 25
+
+
+def test_persistence(tmp_path):
+    """再オープン後もキャッシュが残っていること"""
+    path = tmp_path / "cache.sqlite3"
+    first = OCRResultCache(path, max_size_bytes=1024)
+    first.put("key", "永続化")
+    first.close()
+
+    second = OCRResultCache(path, max_size_bytes=1024)
+    assert second.get("key") == "永続化"
+    assert second.total_size == len("永続化".encode("utf-8"))
+    second.close()
+
+
+def test_create_ocr_cache_disabled():
+    """無効化されている場合は None を返すこと"""
+    config = Mock()
+    config.get_ocr_cache_enabled.return_value = False
+
+    assert create_ocr_cache(config) is None
+
+
+def test_create_ocr_cache_absolute_directory(tmp_path):
+    """絶対パスで指定したディレクトリにキャッシュが作成されること"""
+    config = Mock()
+    config.get_ocr_cache_enabled.return_value = True
+    config.get_ocr_cache_directory.return_value = str(tmp_path / "ocr")
+    config.get_ocr_cache_max_size_mb.return_value = 1
+
+    cache = create_ocr_cache(config)
+
+    assert cache is not None
+    assert cache.db_path == tmp_path / "ocr" / "ocr_cache.sqlite3"
+    assert cache.max_size_bytes == 1024 * 1024
+    cache.close()
@@ -0,0 +1,129 @@
+import threading
+
+import pytest
+
+from service.ocr_job_runner import JobProgress, OCRJobRunner
+
+
+class FakeRoot:
+    """root.after の呼び出しを記録し、手動で実行できるTkルートの代替"""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, ms, callback):
+        self.callbacks.append(callback)
+
+    def run_pending(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+def _fail(value: object) -> None:
+    """呼び出されてはならないコールバック"""
+    pytest.fail(f"予期しないコールバックの呼び出し: {value!r}")
+
+
+def _wait_until_finished(runner, root):
+    runner._thread.join(timeout=5)
+    while runner.is_running:
+        root.run_pending()
+
+
+@pytest.fixture
+def root():
+    return FakeRoot()
+
+
+def test_job_result_delivered_on_poll(root):
+    """ジョブの結果がポーリング時にコールバックへ渡されること"""
+    runner = OCRJobRunner(root)
+    results = []
+    progresses = []
+
+    def job(context):
+        context.report_progress(1, 2)
+        return "完了"
+
+    assert runner.submit(job, results.append, _fail, progresses.append)
+    _wait_until_finished(runner, root)
+
+    assert results == ["完了"]
+    assert progresses[0].done == 1
+    assert progresses[0].total == 2
+
+
+def test_items_delivered_in_order_before_done(root):
+    """途中結果が通知順にコールバックへ渡され、その後に完了が通知されること"""
+    runner = OCRJobRunner(root)
+    events = []
+
+    def job(context):
+        for index in range(3):
+            context.post_item(index)
+        return "完了"
+
+    runner.submit(
+        job,
+        lambda result: events.append(("done", result)),
+        _fail,
+        on_item=lambda item: events.append(("item", item)),
+    )
+    _wait_until_finished(runner, root)
+
+    assert events == [("item", 0), ("item", 1), ("item", 2), ("done", "完了")]
+
+
+def test_job_error_delivered(root):
+    """ジョブの例外がエラーコールバックへ渡されること"""
+    runner = OCRJobRunner(root)
+    errors = []
+
+    def job(context):
+        raise RuntimeError("失敗")
+
+    runner.submit(job, _fail, errors.append)
+    _wait_until_finished(runner, root)
+
+    assert str(errors[0]) == "失敗"
+
+
+def test_only_one_job_at_a_time(root):
+    """実行中は新しいジョブを受け付けないこと"""
+    runner = OCRJobRunner(root)
+    release = threading.Event()
+
+    runner.submit(lambda context: release.wait(5), lambda result: None, _fail)
+    assert runner.submit(lambda context: None, _fail, _fail) is False
+
+    release.set()
+    _wait_until_finished(runner, root)
+    assert runner.is_running is False
+
+
+def test_cancel_sets_event(root):
+    """中止要求がジョブのコンテキストに伝わること"""
+    runner = OCRJobRunner(root)
+    started = threading.Event()
+    results = []
+
+    def job(context):
+        started.set()
+        return context.cancel_event.wait(5)
+
+    runner.submit(job, results.append, _fail)
+    started.wait(5)
+    runner.cancel()
+    _wait_until_finished(runner, root)
+
+    assert results == [True]
+
+
+@pytest.mark.parametrize(
+    "done,total,elapsed,expected",
+    [(0, 10, 1.0, None), (2, 10, 4.0, 16.0), (10, 10, 5.0, 0.0)],
+)
+def test_eta_seconds(done, total, elapsed, expected):
+    """経過時間と処理済み件数から残り時間を推定すること"""
+    assert JobProgress(done, total, elapsed).eta_seconds == expected
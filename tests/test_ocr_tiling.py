@@ -0,0 +1,105 @@
+import pytest
+from unittest.mock import Mock
+
+from utils.ocr_tiling import (
+    OCRWord,
+    TileOptions,
+    deduplicate_words,
+    merge_tile_words,
+    plan_tiles,
+    words_to_text,
+)
+
+
+def test_plan_tiles_covers_image_with_overlap():
+    """タイルが画像全体を重なり付きで覆うこと"""
+    options = TileOptions(tile_size=2000, overlap=200)
+
+    tiles = plan_tiles(5000, 1500, options)
+
+    assert tiles == [(0, 0, 2000, 1500), (1800, 0, 3800, 1500), (3000, 0, 5000, 1500)]
+
+
+def test_plan_tiles_small_image_single_tile():
+    """タイルより小さい画像は1タイルになること"""
+    assert plan_tiles(800, 600, TileOptions(tile_size=2000)) == [(0, 0, 800, 600)]
+
+
+@pytest.mark.parametrize(
+    "mode,size,expected",
+    [
+        ("off", (10000, 10000), False),
+        ("auto", (4000, 4000), False),
+        ("auto", (6000, 4000), True),
+        ("always", (1500, 1500), False),
+        ("always", (2500, 1500), True),
+    ],
+)
+def test_should_tile(mode, size, expected):
+    """モードと画像サイズに応じてタイル分割を判定すること"""
+    options = TileOptions(mode=mode, min_megapixels=20.0, tile_size=2000)
+
+    assert options.should_tile(*size) is expected
+
+
+def test_duplicate_words_in_overlap_removed():
+    """重なり部分で両方のタイルに含まれる単語が1つにまとめられること"""
+    tiles = [(0, 0, 100, 50), (80, 0, 180, 50)]
+    tile_words = [
+        [OCRWord("left", 10, 10, 40, 30, 0), OCRWord("mid", 82, 10, 95, 30, 0)],
+        [OCRWord("mid", 83, 10, 95, 30, 1), OCRWord("right", 120, 10, 160, 30, 1)],
+    ]
+
+    words = deduplicate_words(tiles, tile_words, (180, 50))
+
+    assert sorted(word.text for word in words) == ["left", "mid", "right"]
+
+
+def test_clipped_word_replaced_by_complete_word():
+    """タイルの境界で切れた単語は捨て、完全に含む側の単語を採用すること"""
+    tiles = [(0, 0, 100, 50), (60, 0, 160, 50)]
+    tile_words = [
+        [OCRWord("wor", 70, 10, 99, 30, 0)],
+        [OCRWord("word", 70, 10, 110, 30, 1)],
+    ]
+
+    words = deduplicate_words(tiles, tile_words, (160, 50))
+
+    assert [word.text for word in words] == ["word"]
+
+
+def test_words_to_text_reading_order():
+    """単語が行ごとに上から下・左から右の順に連結されること"""
+    words = [
+        OCRWord("world", 60, 10, 110, 30),
+        OCRWord("Hello", 0, 12, 50, 30),
+        OCRWord("日本", 0, 50, 20, 70),
+        OCRWord("語", 22, 50, 32, 70),
+    ]
+
+    assert words_to_text(words) == "Hello world\n日本語"
+
+
+def test_merge_tile_words():
+    """タイルごとの単語が重複なく読み順のテキストになること"""
+    tiles = [(0, 0, 100, 100), (0, 80, 100, 180)]
+    tile_words = [
+        [OCRWord("一行目", 10, 10, 60, 30, 0), OCRWord("二行目", 10, 85, 60, 95, 0)],
+        [OCRWord("二行目", 10, 85, 60, 95, 1), OCRWord("三行目", 10, 140, 60, 160, 1)],
+    ]
+
+    assert merge_tile_words(tiles, tile_words, (100, 180)) == "一行目\n二行目\n三行目"
+
+
+def test_options_from_config():
+    """ConfigManagerから設定が生成されること"""
+    config = Mock()
+    config.get_tile_mode.return_value = "auto"
+    config.get_tile_min_megapixels.return_value = 12.0
+    config.get_tile_size.return_value = 1500
+    config.get_tile_overlap.return_value = 150
+    config.get_tile_max_workers.return_value = 2
+
+    options = TileOptions.from_config(config)
+
+    assert options == TileOptions("auto", 12.0, 1500, 150, 2)
@@ -0,0 +1,711 @@
+import io
+import sqlite3
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import fitz
+import pytest
+from PIL import Image
+
+from service.pdf_processor import (
+    PAGE_SOURCE_CACHE,
+    PAGE_SOURCE_OCR,
+    PdfProcessOptions,
+    PdfProcessStats,
+    _encode_pixmap,
+    _prepare_page,
+    _render_page_pixmap,
+    format_page_result,
+    hash_page_content,
+    iter_pdf_pages,
+    measure_ink_coverage,
+    process_pdf_files,
+    resolve_render_dpi,
+)
+from utils import concurrency_limiter
+from utils.ocr_cache import OCRResultCache
+
+
+@pytest.fixture(autouse=True)
+def reset_concurrency_limiter():
+    """テストごとに共有の同時実行数の制御を初期化"""
+    concurrency_limiter.reset_shared_concurrency_limiter()
+    yield
+    concurrency_limiter.reset_shared_concurrency_limiter()
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    # 3ページのテスト用PDFを作成
+    path = tmp_path / "sample.pdf"
+    with fitz.open() as doc:
+        for i in range(3):
+            page = doc.new_page(width=200, height=200)
+            page.insert_text((20, 50), f"page {i + 1}")
+        doc.save(path)
+    return str(path)
+
+
+@pytest.fixture
+def ocr_service():
+    service = Mock()
+    service.cache = None
+    service.perform_ocr_batch_bytes.side_effect = lambda contents, **_: [
+        f"テキスト{i + 1}" for i in range(len(contents))
+    ]
+    return service
+
+
+def test_process_pdf_files_batches_pages(pdf_path, ocr_service):
+    """全ページが1回のバッチOCRで処理されること"""
+    text = process_pdf_files([pdf_path], ocr_service)
+
+    ocr_service.perform_ocr_batch_bytes.assert_called_once()
+    assert len(ocr_service.perform_ocr_batch_bytes.call_args.args[0]) == 3
+    assert text == (
+        "テキスト1\n--- 1ページ目 ---\n\n"
+        "テキスト2\n--- 2ページ目 ---\n\n"
+        "テキスト3\n--- 3ページ目 ---"
+    )
+
+
+def test_process_pdf_files_batch_size(pdf_path, ocr_service):
+    """batch_sizeごとにAPI呼び出しが分割されること"""
+    options = PdfProcessOptions(batch_size=2)
+    process_pdf_files([pdf_path], ocr_service, options=options)
+
+    assert ocr_service.perform_ocr_batch_bytes.call_count == 2
+
+
+def test_process_pdf_files_page_failure_isolated(pdf_path, ocr_service):
+    """失敗したページのみフェイルバック文言になること"""
+    ocr_service.perform_ocr_batch_bytes.side_effect = lambda contents, **_: [
+        "成功",
+        RuntimeError("失敗"),
+        "成功",
+    ]
+
+    text = process_pdf_files([pdf_path], ocr_service)
+
+    assert "成功\n--- 1ページ目 ---" in text
+    assert "[テキストを検出できませんでした]\n--- 2ページ目 ---" in text
+    assert "成功\n--- 3ページ目 ---" in text
+
+
+def test_process_pdf_files_max_pages(pdf_path, ocr_service):
+    """最大ページ数を超えた場合に警告が付与されること"""
+    text = process_pdf_files([pdf_path, pdf_path], ocr_service, max_pages=4)
+
+    assert "--- 1ページ目 ---" in text
+    assert text.endswith("（4ページまで処理しました）")
+    assert (
+        sum(len(c.args[0]) for c in ocr_service.perform_ocr_batch_bytes.call_args_list) == 4
+    )
+
+
+def test_process_pdf_files_concurrent_keeps_page_order(tmp_path):
+    """並列実行時も完了順に関係なくページ順で出力されること"""
+    # ページ幅で画像を判別し、先頭ページほど応答を遅くする
+    path = tmp_path / "widths.pdf"
+    with fitz.open() as doc:
+        for width in (100, 150, 200):
+            doc.new_page(width=width, height=100)
+        doc.save(path)
+
+    delays = {100: 0.2, 150: 0.1, 200: 0.0}
+    service = Mock()
+    service.cache = None
+
+    def slow_batch(contents, on_throttle=None):
+        width = Image.open(io.BytesIO(contents[0])).size[0]
+        time.sleep(delays[width])
+        return [f"幅{width}"]
+
+    service.perform_ocr_batch_bytes.side_effect = slow_batch
+
+    options = PdfProcessOptions(
+        batch_size=1, max_workers=3, render_dpi=72, blank_page_threshold=0
+    )
+    text = process_pdf_files([str(path)], service, options=options)
+
+    assert text == (
+        "幅100\n--- 1ページ目 ---\n\n幅150\n--- 2ページ目 ---\n\n幅200\n--- 3ページ目 ---"
+    )
+
+
+def test_pdf_process_options_from_config():
+    """ConfigManagerからオプションが生成されること"""
+    config = Mock()
+    config.get_pdf_batch_size.return_value = 8
+    config.get_pdf_max_workers.return_value = 2
+    config.get_pdf_concurrency_mode.return_value = "fixed"
+    config.get_pdf_initial_workers.return_value = 1
+    config.get_pdf_latency_budget.return_value = 5.0
+    config.get_pdf_text_layer_mode.return_value = "never"
+    config.get_pdf_text_layer_min_chars.return_value = 5
+    config.get_pdf_render_dpi.return_value = 200
+    config.get_pdf_dpi_mode.return_value = "adaptive"
+    config.get_pdf_max_render_pixels.return_value = 1000
+    config.get_pdf_colorspace.return_value = "rgb"
+    config.get_pdf_render_alpha.return_value = True
+    config.get_pdf_image_format.return_value = "jpeg"
+    config.get_pdf_jpeg_quality.return_value = 70
+    config.get_pdf_blank_page_threshold.return_value = 0.01
+    config.get_pdf_auto_crop.return_value = False
+    config.get_crop_padding.return_value = 4
+    config.get_pdf_enhance_mode.return_value = "contrast"
+    config.get_binarize_bits.return_value = 8
+    config.get_pdf_page_cache.return_value = False
+
+    options = PdfProcessOptions.from_config(config)
+
+    assert options.batch_size == 8
+    assert options.max_workers == 2
+    assert options.concurrency_mode == "fixed"
+    assert options.initial_workers == 1
+    assert options.latency_budget == 5.0
+    assert options.text_layer_mode == "never"
+    assert options.text_layer_min_chars == 5
+    assert options.render_dpi == 200
+    assert options.dpi_mode == "adaptive"
+    assert options.max_render_pixels == 1000
+    assert options.colorspace == "rgb"
+    assert options.render_alpha is True
+    assert options.image_format == "jpeg"
+    assert options.jpeg_quality == 70
+    assert options.blank_page_threshold == 0.01
+    assert options.auto_crop is False
+    assert options.crop_padding == 4
+    assert options.enhance == "contrast"
+    assert options.binarize_bits == 8
+    assert options.page_cache is False
+
+
+@pytest.mark.parametrize(
+    "colorspace,render_alpha,expected_mode",
+    [("gray", False, "L"), ("rgb", False, "RGB"), ("rgb", True, "RGBA")],
+)
+def test_render_page_colorspace(pdf_path, colorspace, render_alpha, expected_mode):
+    """設定の解像度・色空間で画像化されること"""
+    options = PdfProcessOptions(
+        render_dpi=144, colorspace=colorspace, render_alpha=render_alpha
+    )
+    with fitz.open(pdf_path) as doc:
+        pixmap = _render_page_pixmap(doc.load_page(0), options)
+        image = Image.open(io.BytesIO(_encode_pixmap(pixmap, options)))
+
+    assert image.mode == expected_mode
+    assert image.size == (400, 400)
+
+
+def test_adaptive_dpi_respects_pixel_budget(tmp_path):
+    """adaptiveモードでは大きなページの画素数が上限内に収まること"""
+    path = tmp_path / "large.pdf"
+    with fitz.open() as doc:
+        doc.new_page(width=72 * 20, height=72 * 20)
+        doc.new_page(width=72, height=72)
+        doc.save(path)
+    options = PdfProcessOptions(
+        render_dpi=300, dpi_mode="adaptive", max_render_pixels=1_000_000
+    )
+
+    with fitz.open(path) as doc:
+        large = _render_page_pixmap(doc.load_page(0), options)
+        small_dpi = resolve_render_dpi(doc.load_page(1), options)
+
+    assert large.width * large.height <= 1_000_000
+    assert large.width >= 990
+    assert small_dpi == 300
+
+
+@pytest.fixture
+def mixed_pdf_path(tmp_path):
+    # 1ページ目はテキストレイヤーあり、2ページ目はテキストレイヤーなし（スキャン相当）
+    path = tmp_path / "mixed.pdf"
+    with fitz.open() as doc:
+        page = doc.new_page(width=300, height=200)
+        page.insert_text((20, 50), "born digital text layer page")
+        page = doc.new_page(width=300, height=200)
+        page.draw_rect(fitz.Rect(20, 40, 200, 60), color=(0, 0, 0), fill=(0, 0, 0))
+        doc.save(path)
+    return str(path)
+
+
+def test_text_layer_auto_skips_ocr(mixed_pdf_path, ocr_service):
+    """autoモードではテキストレイヤーのあるページをOCRしないこと"""
+    stats = PdfProcessStats()
+
+    text = process_pdf_files([mixed_pdf_path], ocr_service, stats=stats)
+
+    assert "born digital text layer page" in text
+    assert "テキスト1\n--- 2ページ目 ---" in text
+    assert len(ocr_service.perform_ocr_batch_bytes.call_args.args[0]) == 1
+    assert stats.text_layer_pages == 1
+    assert stats.ocr_pages == 1
+    assert stats.api_calls == 1
+
+
+def test_text_layer_never_uses_ocr(mixed_pdf_path, ocr_service):
+    """neverモードでは全ページをOCRすること"""
+    stats = PdfProcessStats()
+    options = PdfProcessOptions(text_layer_mode="never")
+
+    process_pdf_files([mixed_pdf_path], ocr_service, options=options, stats=stats)
+
+    assert len(ocr_service.perform_ocr_batch_bytes.call_args.args[0]) == 2
+    assert stats.text_layer_pages == 0
+    assert stats.ocr_pages == 2
+
+
+def test_text_layer_always_skips_api(mixed_pdf_path, ocr_service):
+    """alwaysモードではAPIを呼び出さず、テキストのないページは失敗扱いになること"""
+    stats = PdfProcessStats()
+    options = PdfProcessOptions(text_layer_mode="always")
+
+    text = process_pdf_files(
+        [mixed_pdf_path], ocr_service, options=options, stats=stats
+    )
+
+    ocr_service.perform_ocr_batch_bytes.assert_not_called()
+    assert "[テキストを検出できませんでした]\n--- 2ページ目 ---" in text
+    assert stats.text_layer_pages == 1
+    assert stats.failed_pages == 1
+
+
+@pytest.fixture
+def blank_pdf_path(tmp_path):
+    # 2ページ目のみ空白（ごく小さな汚れあり）のPDFを作成
+    path = tmp_path / "blank.pdf"
+    with fitz.open() as doc:
+        page = doc.new_page(width=200, height=200)
+        page.insert_text((20, 50), "page 1")
+        page = doc.new_page(width=200, height=200)
+        page.draw_rect(fitz.Rect(100, 100, 101, 101), color=(0, 0, 0), fill=(0, 0, 0))
+        page = doc.new_page(width=200, height=200)
+        page.insert_text((20, 50), "page 3")
+        doc.save(path)
+    return str(path)
+
+
+def test_blank_page_skips_api(blank_pdf_path, ocr_service):
+    """空白ページはAPIへ送信せず、空白ページとして集計されること"""
+    stats = PdfProcessStats()
+
+    pages = list(iter_pdf_pages([blank_pdf_path], ocr_service, stats=stats))
+
+    assert len(ocr_service.perform_ocr_batch_bytes.call_args.args[0]) == 2
+    assert [page.source for page in pages] == ["ocr", "blank", "ocr"]
+    assert pages[1].text == "[空白ページ]"
+    assert stats.blank_pages == 1
+    assert stats.ocr_pages == 2
+    assert "空白: 1ページ" in stats.summary()
+
+
+def test_blank_page_threshold_zero_disables(blank_pdf_path, ocr_service):
+    """閾値0では空白判定を行わず全ページをOCRすること"""
+    stats = PdfProcessStats()
+    options = PdfProcessOptions(blank_page_threshold=0)
+
+    list(iter_pdf_pages([blank_pdf_path], ocr_service, options=options, stats=stats))
+
+    assert len(ocr_service.perform_ocr_batch_bytes.call_args.args[0]) == 3
+    assert stats.blank_pages == 0
+
+
+@pytest.mark.parametrize(
+    "auto_crop,expected_size", [(True, (72, 42)), (False, (200, 200))]
+)
+def test_auto_crop_trims_page_margins(tmp_path, auto_crop, expected_size):
+    """画像化したページの周囲の余白を切り取ってから送信すること"""
+    path = tmp_path / "margins.pdf"
+    with fitz.open() as doc:
+        page = doc.new_page(width=200, height=200)
+        page.draw_rect(fitz.Rect(60, 80, 110, 100), color=(0, 0, 0), fill=(0, 0, 0))
+        doc.save(path)
+    sizes = []
+    service = Mock()
+    service.cache = None
+
+    def record(contents, on_throttle=None):
+        sizes.extend(Image.open(io.BytesIO(content)).size for content in contents)
+        return ["テキスト"] * len(contents)
+
+    service.perform_ocr_batch_bytes.side_effect = record
+    options = PdfProcessOptions(render_dpi=72, auto_crop=auto_crop, crop_padding=10)
+
+    process_pdf_files([str(path)], service, options=options)
+
+    assert sizes == [expected_size]
+
+
+def test_binarize_sends_one_bit_png(pdf_path, ocr_service):
+    """binarizeモードでは二値化した1ビットのPNGを送信すること"""
+    options = PdfProcessOptions(enhance="binarize", colorspace="rgb")
+
+    process_pdf_files([pdf_path], ocr_service, options=options)
+
+    contents = ocr_service.perform_ocr_batch_bytes.call_args.args[0]
+    assert [Image.open(io.BytesIO(content)).mode for content in contents] == ["1"] * 3
+
+
+@pytest.mark.parametrize("colorspace,render_alpha", [("gray", False), ("rgb", True)])
+def test_measure_ink_coverage(colorspace, render_alpha):
+    """暗い画素の割合が色空間・アルファチャネルに関係なく求められること"""
+    options = PdfProcessOptions(
+        render_dpi=72, colorspace=colorspace, render_alpha=render_alpha
+    )
+    with fitz.open() as doc:
+        page = doc.new_page(width=100, height=100)
+        page.draw_rect(fitz.Rect(0, 0, 50, 20), color=(0, 0, 0), fill=(0, 0, 0))
+        coverage = measure_ink_coverage(_render_page_pixmap(page, options))
+
+    assert coverage == pytest.approx(0.1, abs=0.01)
+
+
+@pytest.mark.parametrize(
+    "background,ink,expected",
+    [
+        (None, (0.8, 0.8, 0.8), 0.1),  # 白地に薄い灰色
+        (None, (1.0, 0.85, 0.0), 0.1),  # 白地に色付き
+        ((0.55, 0.55, 0.55), (0.25, 0.25, 0.25), 0.1),  # 灰色の地に暗い文字
+        ((0.55, 0.55, 0.55), None, 0.0),  # 灰色の地のみ
+    ],
+)
+def test_measure_ink_coverage_relative_to_background(background, ink, expected):
+    """インクの割合を背景の明るさからの差で求めること"""
+    options = PdfProcessOptions(render_dpi=72)
+    with fitz.open() as doc:
+        page = doc.new_page(width=100, height=100)
+        if background is not None:
+            page.draw_rect(page.rect, color=background, fill=background)
+        if ink is not None:
+            page.draw_rect(fitz.Rect(0, 0, 50, 20), color=ink, fill=ink)
+        coverage = measure_ink_coverage(_render_page_pixmap(page, options))
+
+    assert coverage == pytest.approx(expected, abs=0.01)
+
+
+def test_light_text_page_not_blank(tmp_path, ocr_service):
+    """白地に薄い灰色の文字だけのページを空白と判定しないこと"""
+    path = tmp_path / "light.pdf"
+    with fitz.open() as doc:
+        page = doc.new_page(width=200, height=200)
+        page.insert_text((20, 50), "light text", color=(0.75, 0.75, 0.75))
+        doc.save(path)
+    stats = PdfProcessStats()
+
+    pages = list(
+        iter_pdf_pages(
+            [str(path)],
+            ocr_service,
+            options=PdfProcessOptions(text_layer_mode="never"),
+            stats=stats,
+        )
+    )
+
+    assert [page.source for page in pages] == ["ocr"]
+    assert stats.blank_pages == 0
+
+
+def test_process_pdf_files_reports_progress(pdf_path, ocr_service):
+    """処理済みページ数と総ページ数が通知されること"""
+    progress = []
+    options = PdfProcessOptions(batch_size=2)
+
+    process_pdf_files(
+        [pdf_path],
+        ocr_service,
+        options=options,
+        progress_callback=lambda done, total: progress.append((done, total)),
+    )
+
+    assert progress == [(0, 3), (2, 3), (3, 3)]
+
+
+def test_process_pdf_files_cancel_stops_requests(pdf_path, ocr_service):
+    """中止後は新たなAPI呼び出しを行わないこと"""
+    import threading
+
+    cancel_event = threading.Event()
+
+    def cancel_after_first(contents, on_throttle=None):
+        cancel_event.set()
+        return ["1ページ目"] * len(contents)
+
+    ocr_service.perform_ocr_batch_bytes.side_effect = cancel_after_first
+    options = PdfProcessOptions(batch_size=1, max_workers=1)
+
+    text = process_pdf_files(
+        [pdf_path], ocr_service, options=options, cancel_event=cancel_event
+    )
+
+    assert ocr_service.perform_ocr_batch_bytes.call_count == 1
+    assert text.startswith("1ページ目\n--- 1ページ目 ---")
+    assert text.endswith("（処理を中止しました）")
+
+
+@pytest.fixture
+def cached_ocr_service(tmp_path, ocr_service):
+    cache = OCRResultCache(tmp_path / "cache.sqlite3", 1024 * 1024)
+    ocr_service.cache = cache
+    ocr_service.detection_type = "text_detection"
+    yield ocr_service
+    cache.close()
+
+
+def _write_pdf(path, texts):
+    with fitz.open() as doc:
+        for text in texts:
+            page = doc.new_page(width=200, height=200)
+            page.insert_text((20, 50), text)
+        doc.save(path)
+    return str(path)
+
+
+def test_page_cache_skips_rendering_on_rerun(pdf_path, cached_ocr_service):
+    """再実行時はキャッシュ済みのページを画像化・API呼び出しせずに返すこと"""
+    first = process_pdf_files([pdf_path], cached_ocr_service)
+    cached_ocr_service.perform_ocr_batch_bytes.reset_mock()
+    stats = PdfProcessStats()
+
+    with patch("service.pdf_processor._render_page_pixmap") as render:
+        pages = list(iter_pdf_pages([pdf_path], cached_ocr_service, stats=stats))
+
+    render.assert_not_called()
+    cached_ocr_service.perform_ocr_batch_bytes.assert_not_called()
+    assert [page.source for page in pages] == [PAGE_SOURCE_CACHE] * 3
+    assert "\n\n".join(format_page_result(page) for page in pages) == first
+    assert stats.cached_pages == 3
+    assert "キャッシュ: 3ページ" in stats.summary()
+
+
+def test_page_cache_hits_identical_page_in_other_pdf(tmp_path, cached_ocr_service):
+    """別のPDFに含まれる同一内容のページもキャッシュから取得すること"""
+    first = _write_pdf(tmp_path / "first.pdf", ["cover", "first body"])
+    second = _write_pdf(tmp_path / "second.pdf", ["cover", "second body"])
+    process_pdf_files([first], cached_ocr_service)
+    stats = PdfProcessStats()
+
+    pages = list(iter_pdf_pages([second], cached_ocr_service, stats=stats))
+
+    assert [page.source for page in pages] == [PAGE_SOURCE_CACHE, PAGE_SOURCE_OCR]
+    assert stats.cached_pages == 1
+    assert stats.ocr_pages == 1
+
+
+def test_page_cache_keyed_by_render_settings(pdf_path, cached_ocr_service):
+    """画像化の設定が異なる場合はキャッシュを使用しないこと"""
+    process_pdf_files([pdf_path], cached_ocr_service)
+    stats = PdfProcessStats()
+    options = PdfProcessOptions(render_dpi=200)
+
+    list(iter_pdf_pages([pdf_path], cached_ocr_service, options=options, stats=stats))
+
+    assert stats.cached_pages == 0
+    assert stats.ocr_pages == 3
+
+
+def test_page_cache_disabled(pdf_path, cached_ocr_service):
+    """page_cache が無効の場合はキャッシュを参照しないこと"""
+    options = PdfProcessOptions(page_cache=False)
+    process_pdf_files([pdf_path], cached_ocr_service, options=options)
+    stats = PdfProcessStats()
+
+    list(iter_pdf_pages([pdf_path], cached_ocr_service, options=options, stats=stats))
+
+    assert stats.cached_pages == 0
+    assert cached_ocr_service.cache.total_size == 0
+
+
+def test_page_cache_lookup_error_renders_page(pdf_path, cached_ocr_service):
+    """キャッシュの参照に失敗した場合は画像化してOCRすること"""
+    cached_ocr_service.cache = Mock(wraps=cached_ocr_service.cache)
+    cached_ocr_service.cache.get.side_effect = sqlite3.OperationalError(
+        "database is locked"
+    )
+    stats = PdfProcessStats()
+
+    pages = list(iter_pdf_pages([pdf_path], cached_ocr_service, stats=stats))
+
+    assert [page.source for page in pages] == [PAGE_SOURCE_OCR] * 3
+    assert stats.failed_pages == 0
+    cached_ocr_service.cache.put.assert_not_called()
+
+
+def test_page_cache_write_error_keeps_ocr_result(pdf_path, cached_ocr_service):
+    """キャッシュへの保存に失敗してもOCR結果を返して処理を続けること"""
+    cached_ocr_service.cache = Mock(wraps=cached_ocr_service.cache)
+    cached_ocr_service.cache.put.side_effect = sqlite3.OperationalError("disk full")
+    stats = PdfProcessStats()
+
+    pages = list(iter_pdf_pages([pdf_path], cached_ocr_service, stats=stats))
+
+    assert [page.text for page in pages] == ["テキスト1", "テキスト2", "テキスト3"]
+    assert stats.ocr_pages == 3
+
+
+def test_hash_page_content(tmp_path):
+    """描画内容が同じページは同じ値、異なるページは異なる値になること"""
+    path = _write_pdf(tmp_path / "pages.pdf", ["same", "same", "other"])
+    with fitz.open(path) as doc:
+        digests = [hash_page_content(page) for page in doc]
+
+    assert digests[0] == digests[1]
+    assert digests[0] != digests[2]
+
+
+def test_adaptive_concurrency_decreases_on_throttling(pdf_path, ocr_service):
+    """スロットリングを観測すると同時実行数が減り、履歴が記録されること"""
+    from google.api_core import exceptions as api_exceptions
+
+    def throttled(contents, on_throttle=None):
+        error = RuntimeError("OCR処理中にエラーが発生しました")
+        error.__cause__ = api_exceptions.TooManyRequests("quota")
+        return [error] * len(contents)
+
+    ocr_service.perform_ocr_batch_bytes.side_effect = throttled
+    options = PdfProcessOptions(batch_size=1, max_workers=4, initial_workers=4)
+    stats = PdfProcessStats()
+
+    pages = list(iter_pdf_pages([pdf_path], ocr_service, options=options, stats=stats))
+
+    assert len(pages) == 3
+    assert stats.concurrency_history[0].limit == 4
+    assert stats.concurrency_history[-1].reason == "decrease"
+    assert stats.concurrency_history[-1].limit < 4
+    assert "同時実行数: 4→" in stats.summary()
+
+
+def test_adaptive_concurrency_decreases_on_retried_throttling(tmp_path, ocr_service):
+    """再試行で成功した呼び出しのスロットリングでも同時実行数を減らし、増やさないこと"""
+    path = _write_pdf(tmp_path / "many.pdf", [f"page {i}" for i in range(6)])
+
+    def throttled_then_ok(contents, on_throttle=None):
+        assert on_throttle is not None
+        on_throttle()
+        return ["text"] * len(contents)
+
+    ocr_service.perform_ocr_batch_bytes.side_effect = throttled_then_ok
+    options = PdfProcessOptions(batch_size=1, max_workers=8, initial_workers=4)
+    stats = PdfProcessStats()
+
+    pages = list(iter_pdf_pages([path], ocr_service, options=options, stats=stats))
+
+    assert [page.source for page in pages] == [PAGE_SOURCE_OCR] * 6
+    assert [change.reason for change in stats.concurrency_history[1:]] == [
+        "decrease"
+    ] * (len(stats.concurrency_history) - 1)
+    assert stats.concurrency_history[-1].limit == 1
+
+
+def test_adaptive_concurrency_never_exceeds_limit(tmp_path, ocr_service):
+    """実行中のバッチ数が同時実行数の上限を超えないこと"""
+    path = _write_pdf(tmp_path / "many.pdf", [f"page {i}" for i in range(8)])
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def slow_batch(contents, on_throttle=None):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return ["text"] * len(contents)
+
+    ocr_service.perform_ocr_batch_bytes.side_effect = slow_batch
+    options = PdfProcessOptions(
+        batch_size=1, max_workers=8, initial_workers=2, latency_budget=0.0
+    )
+
+    pages = list(iter_pdf_pages([path], ocr_service, options=options))
+
+    assert len(pages) == 8
+    assert peak == 2
+
+
+def test_adaptive_concurrency_carries_over_jobs(pdf_path, ocr_service):
+    """調整した同時実行数を次のジョブへ引き継ぐこと"""
+    options = PdfProcessOptions(batch_size=1, max_workers=8, initial_workers=1)
+    first = PdfProcessStats()
+    second = PdfProcessStats()
+
+    list(iter_pdf_pages([pdf_path], ocr_service, options=options, stats=first))
+    list(iter_pdf_pages([pdf_path], ocr_service, options=options, stats=second))
+
+    assert first.concurrency_history[-1].limit > 1
+    assert second.concurrency_history[0].limit == first.concurrency_history[-1].limit
+    assert second.concurrency_history[0].reason == "initial"
+
+
+def test_fixed_concurrency_keeps_no_history(pdf_path, ocr_service):
+    """fixedモードでは同時実行数の履歴を記録しないこと"""
+    options = PdfProcessOptions(batch_size=1, concurrency_mode="fixed")
+    stats = PdfProcessStats()
+
+    list(iter_pdf_pages([pdf_path], ocr_service, options=options, stats=stats))
+
+    assert stats.concurrency_history == []
+    assert "同時実行数" not in stats.summary()
+
+
+def test_iter_pdf_pages_yields_page_results(pdf_path, ocr_service):
+    """ページ単位の結果がページ順に返されること"""
+    options = PdfProcessOptions(batch_size=2)
+
+    pages = list(iter_pdf_pages([pdf_path], ocr_service, options=options))
+
+    assert [page.page_num for page in pages] == [1, 2, 3]
+    assert all(page.file_path == pdf_path for page in pages)
+    assert all(page.source == PAGE_SOURCE_OCR for page in pages)
+    assert all(page.seconds >= 0 for page in pages)
+
+
+def test_iter_pdf_pages_streams_before_job_finishes(pdf_path, ocr_service):
+    """後続バッチの完了を待たずに先頭ページが返されること"""
+    options = PdfProcessOptions(batch_size=1, max_workers=1)
+
+    pages = iter_pdf_pages([pdf_path], ocr_service, options=options)
+    first = next(pages)
+
+    assert first.page_num == 1
+    assert ocr_service.perform_ocr_batch_bytes.call_count < 3
+    pages.close()
+
+
+def test_iter_pdf_pages_streams_while_rendering(tmp_path, ocr_service):
+    """並列実行時も、後続ページの画像化中に完了したバッチの結果を返すこと"""
+    path = _write_pdf(tmp_path / "many.pdf", [f"page {i}" for i in range(12)])
+    options = PdfProcessOptions(batch_size=1, max_workers=8)
+    prepared = []
+
+    def slow_prepare(page, *args):
+        time.sleep(0.02)
+        prepared.append(page.number)
+        return _prepare_page(page, *args)
+
+    with patch("service.pdf_processor._prepare_page", side_effect=slow_prepare):
+        pages = iter_pdf_pages([path], ocr_service, options=options)
+        first = next(pages)
+        prepared_before_first = len(prepared)
+        pages.close()
+
+    assert first.page_num == 1
+    assert prepared_before_first <= 3
+
+
+def test_encode_pixmap_jpeg_drops_alpha(pdf_path):
+    """JPEG指定時はアルファチャネルを除去してエンコードされること"""
+    options = PdfProcessOptions(
+        colorspace="rgb", render_alpha=True, image_format="jpeg", jpeg_quality=80
+    )
+    with fitz.open(pdf_path) as doc:
+        pixmap = _render_page_pixmap(doc.load_page(0), options)
+        content = _encode_pixmap(pixmap, options)
+
+    image = Image.open(io.BytesIO(content))
+    assert image.format == "JPEG"
+    assert image.mode == "RGB"
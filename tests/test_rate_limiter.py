@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+from unittest.mock import Mock
+
+from utils import rate_limiter
+from utils.rate_limiter import TokenBucket, get_shared_rate_limiter
+
+
+class FakeClock:
+    """sleep で時刻が進む時計"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_burst_acquired_without_waiting(clock):
+    """バケット容量までは待機せずに取得できること"""
+    bucket = TokenBucket(rate=10, burst=5, clock=clock, sleep=clock.sleep)
+
+    waits = [bucket.acquire() for _ in range(5)]
+
+    assert waits == [0.0] * 5
+    assert clock.now == 0.0
+
+
+def test_acquire_waits_for_refill(clock):
+    """トークンが不足している場合は補充まで待機すること"""
+    bucket = TokenBucket(rate=10, burst=5, clock=clock, sleep=clock.sleep)
+    for _ in range(5):
+        bucket.acquire()
+
+    waited = bucket.acquire(2)
+
+    assert waited == pytest.approx(0.2)
+    assert bucket.waited_seconds == pytest.approx(0.2)
+
+
+def test_steady_rate_at_ceiling(clock):
+    """連続した取得が設定したレートに収まること"""
+    bucket = TokenBucket(rate=10, burst=1, clock=clock, sleep=clock.sleep)
+
+    for _ in range(21):
+        bucket.acquire()
+
+    assert clock.now == pytest.approx(2.0)
+
+
+def test_request_larger_than_burst(clock):
+    """容量を超える数の要求も満杯になった時点で取得でき、平均レートを守ること"""
+    bucket = TokenBucket(rate=10, burst=4, clock=clock, sleep=clock.sleep)
+
+    bucket.acquire(16)
+    bucket.acquire(1)
+
+    assert clock.now == pytest.approx(1.3)
+
+
+def test_concurrent_acquire():
+    """複数スレッドから同時に取得しても合計数が一致すること"""
+    bucket = TokenBucket(rate=0.001, burst=100)
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert bucket._tokens == pytest.approx(50, abs=5)
+
+
+def test_shared_rate_limiter():
+    """共有レート制限が設定から生成されて再利用され、無効時は None となること"""
+    rate_limiter.reset_shared_rate_limiter()
+    config = Mock()
+    config.get_rate_limit_enabled.return_value = True
+    config.get_rate_limit_requests_per_second.return_value = 5.0
+    config.get_rate_limit_burst.return_value = 8
+
+    limiter = get_shared_rate_limiter(config)
+
+    assert limiter is not None
+    assert limiter is get_shared_rate_limiter(config)
+    assert (limiter.rate, limiter.burst) == (5.0, 8)
+    config.get_rate_limit_enabled.return_value = False
+    assert get_shared_rate_limiter(config) is None
+    rate_limiter.reset_shared_rate_limiter()
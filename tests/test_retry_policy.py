@@ -0,0 +1,126 @@
+import random
+
+import pytest
+from unittest.mock import Mock
+from google.api_core import exceptions as api_exceptions
+
+from external_service.retry_policy import RetryPolicy, call_with_retry
+
+
+@pytest.fixture
+def policy():
+    return RetryPolicy(
+        max_attempts=3,
+        initial_backoff=1.0,
+        max_backoff=2.0,
+        backoff_multiplier=2.0,
+        request_timeout=5.0,
+        deadline=60.0,
+    )
+
+
+def _fail_on_sleep(delay: float) -> None:
+    """待機してはならない場合の sleep"""
+    pytest.fail(f"予期しない待機: {delay}秒")
+
+
+def test_retry_recovers_from_transient_error(policy):
+    """一時的なエラーの後に成功した場合は結果を返すこと"""
+    func = Mock(side_effect=[api_exceptions.ServiceUnavailable("503"), "ok"])
+    sleeps = []
+
+    result = call_with_retry(func, policy, "test", sleep=sleeps.append)
+
+    assert result == "ok"
+    assert func.call_count == 2
+    assert len(sleeps) == 1
+    assert 0 <= sleeps[0] <= 1.0
+
+
+def test_retry_gives_up_after_max_attempts(policy):
+    """最大試行回数を超えた場合は最後のエラーを送出すること"""
+    func = Mock(side_effect=api_exceptions.DeadlineExceeded("timeout"))
+
+    with pytest.raises(api_exceptions.DeadlineExceeded):
+        call_with_retry(func, policy, "test", sleep=lambda delay: None)
+
+    assert func.call_count == 3
+
+
+def test_non_retryable_error_raised_immediately(policy):
+    """再試行対象外のエラーは即座に送出すること"""
+    func = Mock(side_effect=api_exceptions.InvalidArgument("bad image"))
+
+    with pytest.raises(api_exceptions.InvalidArgument):
+        call_with_retry(func, policy, "test", sleep=_fail_on_sleep)
+
+    assert func.call_count == 1
+
+
+def test_retry_stops_at_deadline(policy):
+    """待機すると全体の期限を超える場合は再試行しないこと"""
+    policy.deadline = 0.0
+    func = Mock(side_effect=api_exceptions.ResourceExhausted("quota"))
+
+    with pytest.raises(api_exceptions.ResourceExhausted):
+        call_with_retry(func, policy, "test", sleep=_fail_on_sleep)
+
+    assert func.call_count == 1
+
+
+def test_throttled_attempts_reported(policy):
+    """スロットリング・期限切れの試行ごとに on_throttle を呼び出すこと"""
+    func = Mock(
+        side_effect=[
+            api_exceptions.ResourceExhausted("quota"),
+            api_exceptions.ServiceUnavailable("503"),
+            api_exceptions.DeadlineExceeded("timeout"),
+            "ok",
+        ]
+    )
+    policy.max_attempts = 4
+    on_throttle = Mock()
+
+    result = call_with_retry(
+        func, policy, "test", sleep=lambda delay: None, on_throttle=on_throttle
+    )
+
+    assert result == "ok"
+    assert on_throttle.call_count == 2
+
+
+def test_timeout_passed_per_attempt(policy):
+    """試行ごとのタイムアウトが期限の残り時間以下で渡されること"""
+    func = Mock(return_value="ok")
+
+    call_with_retry(func, policy, "test")
+
+    assert 0 < func.call_args.args[0] <= 5.0
+
+
+def test_backoff_is_capped_and_jittered(policy):
+    """待機時間が指数的に伸び、上限で頭打ちになること"""
+    rng = random.Random(0)
+
+    delays = [
+        policy.backoff(attempt, rng) for attempt in range(1, 6) for _ in range(50)
+    ]
+
+    assert all(0 <= delay <= 2.0 for delay in delays)
+    assert len(set(delays)) > 1
+    assert max(policy.backoff(1, rng) for _ in range(50)) <= 1.0
+
+
+def test_policy_from_config():
+    """ConfigManagerからポリシーが生成されること"""
+    config = Mock()
+    config.get_retry_max_attempts.return_value = 5
+    config.get_retry_initial_backoff.return_value = 0.2
+    config.get_retry_max_backoff.return_value = 4.0
+    config.get_retry_backoff_multiplier.return_value = 3.0
+    config.get_retry_request_timeout.return_value = 10.0
+    config.get_retry_deadline.return_value = 30.0
+
+    policy = RetryPolicy.from_config(config)
+
+    assert policy == RetryPolicy(5, 0.2, 4.0, 3.0, 10.0, 30.0)
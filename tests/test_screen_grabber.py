@@ -0,0 +1,94 @@
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+from PIL import Image
+
+from utils.screen_grabber import (
+    FallbackScreenGrabber,
+    PillowScreenGrabber,
+    PyAutoGUIScreenGrabber,
+    ScreenGrabber,
+    create_screen_grabber,
+)
+
+
+def test_pillow_grab_converts_region_to_bbox():
+    """pyautogui形式の範囲（left, top, width, height）をImageGrabのbboxへ変換すること"""
+    with patch("utils.screen_grabber.ImageGrab.grab") as mock_grab:
+        mock_grab.return_value = Image.new("RGB", (200, 100))
+        image = PillowScreenGrabber().grab((10, 20, 200, 100))
+
+    mock_grab.assert_called_once_with(bbox=(10, 20, 210, 120))
+    assert image.size == (200, 100)
+
+
+def test_pillow_grab_returns_rgb():
+    """透過付きの撮影画像はRGBへ変換すること"""
+    with patch(
+        "utils.screen_grabber.ImageGrab.grab",
+        return_value=Image.new("RGBA", (10, 10)),
+    ) as mock_grab:
+        image = PillowScreenGrabber().grab()
+
+    mock_grab.assert_called_once_with(bbox=None)
+    assert image.mode == "RGB"
+
+
+def test_pyautogui_grab_passes_region():
+    """pyautoguiへは範囲をそのまま渡すこと"""
+    with patch("pyautogui.screenshot") as mock_screenshot:
+        PyAutoGUIScreenGrabber().grab((10, 20, 200, 100))
+        PyAutoGUIScreenGrabber().grab()
+
+    assert mock_screenshot.call_args_list[0].kwargs == {"region": (10, 20, 200, 100)}
+    assert mock_screenshot.call_args_list[1].kwargs == {}
+
+
+def test_fallback_switches_after_failure():
+    """優先する方式が失敗した場合は代替の方式で撮影し、以降も代替の方式を使うこと"""
+    primary = Mock(name="primary")
+    primary.name = "pillow"
+    primary.grab.side_effect = OSError("X connection failed")
+    fallback = Mock(name="fallback")
+    fallback.name = "pyautogui"
+    grabber = FallbackScreenGrabber(primary, fallback)
+
+    assert grabber.grab() is fallback.grab.return_value
+    grabber.grab((0, 0, 10, 10))
+
+    primary.grab.assert_called_once()
+    assert fallback.grab.call_count == 2
+    assert grabber.name == "pyautogui"
+
+
+def test_incomplete_grabber_cannot_be_instantiated():
+    """grab を実装しない撮影方式はインスタンス化できないこと"""
+
+    class IncompleteGrabber(ScreenGrabber):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        IncompleteGrabber()  # type: ignore[abstract]
+
+
+@pytest.mark.parametrize(
+    "backend,expected",
+    [
+        ("pillow", PillowScreenGrabber),
+        ("pyautogui", PyAutoGUIScreenGrabber),
+        ("auto", FallbackScreenGrabber),
+    ],
+)
+def test_create_screen_grabber(backend, expected):
+    """撮影方式の名前に対応するインスタンスを生成すること"""
+    assert isinstance(create_screen_grabber(backend), expected)
+
+
+@pytest.mark.skipif(not os.environ.get("DISPLAY"), reason="Xサーバー（Xvfb等）が必要")
+def test_pillow_grab_from_x_server():
+    """Xサーバーの画面をプロセス内で撮影できること"""
+    image = PillowScreenGrabber().grab((0, 0, 32, 16))
+
+    assert image.size == (32, 16)
+    assert image.mode == "RGB"
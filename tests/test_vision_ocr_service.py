@@ -1,3 +1,5 @@
+import sqlite3
+
 import pytest
 from unittest.mock import Mock, patch
 
@@ -28,6 +30,30 @@ def mock_config():
     with patch("external_service.vision_ocr_service.ConfigManager") as mock_cfg:
         instance = mock_cfg.return_value
         instance.get_detection_type.return_value = "text_detection"
+        instance.get_ocr_cache_enabled.return_value = False
+        instance.get_image_encoding.return_value = "png"
+        instance.get_image_quality.return_value = 85
+        instance.get_png_compress_level.return_value = 1
+        instance.get_max_megapixels.return_value = 6.0
+        instance.get_max_image_bytes.return_value = 4 * 1024 * 1024
+        instance.get_min_text_height.return_value = 12
+        instance.get_auto_grayscale.return_value = True
+        instance.get_auto_crop.return_value = True
+        instance.get_crop_padding.return_value = 10
+        instance.get_enhance_mode.return_value = "off"
+        instance.get_binarize_bits.return_value = 1
+        instance.get_tile_mode.return_value = "off"
+        instance.get_tile_min_megapixels.return_value = 20.0
+        instance.get_tile_size.return_value = 2000
+        instance.get_tile_overlap.return_value = 200
+        instance.get_tile_max_workers.return_value = 4
+        instance.get_retry_max_attempts.return_value = 3
+        instance.get_retry_initial_backoff.return_value = 0.0
+        instance.get_retry_max_backoff.return_value = 0.0
+        instance.get_retry_backoff_multiplier.return_value = 2.0
+        instance.get_retry_request_timeout.return_value = 30.0
+        instance.get_retry_deadline.return_value = 60.0
+        instance.get_rate_limit_enabled.return_value = False
         yield instance
 
 
@@ -143,3 +169,527 @@ def test_client_initialization_error():
                 VisionOCRService()
 
             assert "Vision APIクライアントの初期化に失敗しました" in str(exc_info.value)
+
+
+def _make_response(text="", error_message=""):
+    response = Mock()
+    response.error.message = error_message
+    if text:
+        annotation = Mock()
+        annotation.description = text
+        response.text_annotations = [annotation]
+    else:
+        response.text_annotations = []
+    return response
+
+
+def test_perform_ocr_batch_single_call(
+    vision_service, mock_vision_client, sample_image
+):
+    # 複数画像が1回のbatch_annotate_imagesで処理されること
+    instance = mock_vision_client.from_service_account_info.return_value
+    instance.batch_annotate_images.return_value.responses = [
+        _make_response("1ページ目"),
+        _make_response("2ページ目"),
+    ]
+
+    results = vision_service.perform_ocr_batch([sample_image, sample_image])
+
+    assert results == ["1ページ目", "2ページ目"]
+    instance.batch_annotate_images.assert_called_once()
+    requests = instance.batch_annotate_images.call_args.kwargs["requests"]
+    assert len(requests) == 2
+
+
+def test_perform_ocr_bytes_sends_content_as_is(vision_service, mock_vision_client):
+    # エンコード済みのバイト列がそのままAPIへ送信されること
+    instance = mock_vision_client.from_service_account_info.return_value
+    instance.text_detection.return_value = _make_response("バイト列")
+
+    result = vision_service.perform_ocr_bytes(b"encoded-image")
+
+    assert result == "バイト列"
+    sent_image = instance.text_detection.call_args.kwargs["image"]
+    assert sent_image.content == b"encoded-image"
+
+
+def test_perform_ocr_uses_configured_encoding(
+    mock_vision_client, mock_credentials, mock_config, sample_image
+):
+    # 設定のエンコード方式で画像が送信されること
+    mock_config.get_image_encoding.return_value = "jpeg"
+    instance = mock_vision_client.from_service_account_info.return_value
+    instance.text_detection.return_value = _make_response("JPEG")
+
+    service = VisionOCRService()
+    service.perform_ocr(sample_image)
+
+    sent_image = instance.text_detection.call_args.kwargs["image"]
+    assert sent_image.content[:3] == b"\xff\xd8\xff"
+
+
+def test_prepare_image_fits_byte_budget(
+    mock_vision_client, mock_credentials, mock_config
+):
+    # エンコード後のバイト数が上限を超える場合は上限内まで縮小されること
+    import random
+
+    mock_config.get_max_image_bytes.return_value = 20 * 1024
+    rng = random.Random(0)
+    noise = bytes(rng.randrange(256) for _ in range(300 * 300 * 3))
+    image = Image.frombytes("RGB", (300, 300), noise)
+
+    encoded = VisionOCRService().prepare_image(image)
+
+    assert encoded.size <= 20 * 1024
+    assert encoded.width < 300
+
+
+def test_prepare_image_crops_margins(mock_vision_client, mock_credentials, mock_config):
+    # 周囲の余白が切り取られ、元画像での位置が記録されること
+    image = Image.new("L", (400, 300), 255)
+    image.paste(0, (100, 50, 200, 80))
+
+    encoded = VisionOCRService().prepare_image(image)
+
+    assert (encoded.width, encoded.height) == (120, 50)
+    assert encoded.offset == (90, 40)
+    assert encoded.to_source(10, 10) == (100, 50)
+
+
+def _make_word_response(words):
+    # (文字列, left, top, right, bottom) の単語を含むレスポンス
+    response = _make_response(" ".join(text for text, *_ in words))
+    for text, left, top, right, bottom in words:
+        annotation = Mock()
+        annotation.description = text
+        annotation.bounding_poly.vertices = [
+            Mock(x=left, y=top),
+            Mock(x=right, y=top),
+            Mock(x=right, y=bottom),
+            Mock(x=left, y=bottom),
+        ]
+        response.text_annotations.append(annotation)
+    return response
+
+
+def test_perform_ocr_tiled(mock_vision_client, mock_credentials, mock_config):
+    # タイルごとの結果が重複を除いて読み順に連結されること
+    mock_config.get_tile_mode.return_value = "always"
+    mock_config.get_tile_size.return_value = 100
+    mock_config.get_tile_overlap.return_value = 40
+    # 応答をタイル順に返すため逐次実行にする
+    mock_config.get_tile_max_workers.return_value = 1
+    instance = mock_vision_client.from_service_account_info.return_value
+
+    def detect(image, **kwargs):
+        return responses.pop(0)
+
+    # 160x50の画像 → (0-100), (60-160) の2タイル
+    responses = [
+        _make_word_response([("Hello", 5, 10, 40, 30), ("big", 65, 10, 90, 30)]),
+        _make_word_response([("big", 5, 10, 30, 30), ("world", 50, 10, 95, 30)]),
+    ]
+    instance.text_detection.side_effect = detect
+
+    text = VisionOCRService().perform_ocr(Image.new("RGB", (160, 50), "white"))
+
+    assert text == "Hello big world"
+    assert instance.text_detection.call_count == 2
+
+
+def test_perform_ocr_batch_bytes_tiles_large_pages(
+    mock_vision_client, mock_credentials, mock_config
+):
+    # タイル分割の対象となる大きな画像はバッチに含めずタイル分割OCRで処理すること
+    import io
+
+    mock_config.get_tile_mode.return_value = "always"
+    mock_config.get_tile_size.return_value = 100
+    instance = mock_vision_client.from_service_account_info.return_value
+    instance.batch_annotate_images.return_value.responses = [_make_response("小")]
+
+    def encode(size):
+        buffer = io.BytesIO()
+        Image.new("L", size, 255).save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    service = VisionOCRService()
+    with patch.object(service, "perform_ocr_tiled", return_value="大") as tiled:
+        results = service.perform_ocr_batch_bytes([encode((160, 50)), encode((80, 50))])
+
+    assert results == ["大", "小"]
+    assert tiled.call_args.args[0].size == (160, 50)
+    requests = instance.batch_annotate_images.call_args.kwargs["requests"]
+    assert len(requests) == 1
+
+
+def test_perform_ocr_tiled_maps_cropped_coordinates(
+    mock_vision_client, mock_credentials, mock_config
+):
+    # 余白を切り取ったタイルの単語座標が画像全体の座標へ戻されること
+    import io
+
+    mock_config.get_tile_mode.return_value = "always"
+    mock_config.get_tile_size.return_value = 100
+    mock_config.get_tile_overlap.return_value = 40
+    mock_config.get_crop_padding.return_value = 0
+    mock_config.get_tile_max_workers.return_value = 1
+    instance = mock_vision_client.from_service_account_info.return_value
+    sent_sizes = []
+
+    def detect(image, **kwargs):
+        sent_sizes.append(Image.open(io.BytesIO(image.content)).size)
+        return responses.pop(0)
+
+    # 各タイルの中央付近にのみ文字相当の黒い矩形がある
+    image = Image.new("L", (160, 50), 255)
+    image.paste(0, (20, 10, 50, 30))
+    image.paste(0, (110, 10, 140, 30))
+    responses = [
+        _make_word_response([("left", 0, 0, 30, 20)]),
+        _make_word_response([("right", 0, 0, 30, 20)]),
+    ]
+    instance.text_detection.side_effect = detect
+
+    service = VisionOCRService()
+    words = [
+        service._detect_tile_words(image.crop(box), box, index)
+        for index, box in enumerate([(0, 0, 100, 50), (60, 0, 160, 50)])
+    ]
+
+    assert sent_sizes == [(30, 20), (30, 20)]
+    assert (words[0][0].left, words[0][0].top) == (20, 10)
+    assert (words[1][0].left, words[1][0].right) == (110, 140)
+
+
+def test_perform_ocr_retries_transient_error(vision_service, mock_vision_client):
+    # 一時的なエラーは再試行され、試行ごとのタイムアウトが指定されること
+    from google.api_core import exceptions as api_exceptions
+
+    instance = mock_vision_client.from_service_account_info.return_value
+    instance.text_detection.side_effect = [
+        api_exceptions.ServiceUnavailable("503"),
+        _make_response("再試行"),
+    ]
+
+    assert vision_service.perform_ocr_bytes(b"image") == "再試行"
+    assert instance.text_detection.call_count == 2
+    kwargs = instance.text_detection.call_args.kwargs
+    assert kwargs["retry"] is None
+    assert 0 < kwargs["timeout"] <= 30.0
+
+
+def test_batch_acquires_rate_limit_per_image(vision_service, mock_vision_client):
+    # バッチ送信時は画像数分のトークンを取得すること
+    limiter = Mock()
+    vision_service._rate_limiter = limiter
+    instance = mock_vision_client.from_service_account_info.return_value
+    instance.batch_annotate_images.return_value.responses = [
+        _make_response("1"),
+        _make_response("2"),
+        _make_response("3"),
+    ]
+
+    vision_service.perform_ocr_batch_bytes([b"1", b"2", b"3"])
+
+    limiter.acquire.assert_called_once_with(3)
+
+
+def test_perform_ocr_batch_bytes(vision_service, mock_vision_client):
+    # エンコード済みの複数画像が1回のbatch_annotate_imagesで処理されること
+    instance = mock_vision_client.from_service_account_info.return_value
+    instance.batch_annotate_images.return_value.responses = [
+        _make_response("1ページ目"),
+        _make_response("2ページ目"),
+    ]
+
+    results = vision_service.perform_ocr_batch_bytes([b"page1", b"page2"])
+
+    assert results == ["1ページ目", "2ページ目"]
+    requests = instance.batch_annotate_images.call_args.kwargs["requests"]
+    assert [request.image.content for request in requests] == [b"page1", b"page2"]
+
+
+def test_perform_ocr_batch_bytes_reports_throttled_attempts(
+    vision_service, mock_vision_client
+):
+    # 再試行で成功した場合もスロットリングの試行を on_throttle へ通知すること
+    from google.api_core import exceptions as api_exceptions
+
+    instance = mock_vision_client.from_service_account_info.return_value
+    instance.batch_annotate_images.side_effect = [
+        api_exceptions.ResourceExhausted("quota"),
+        Mock(responses=[_make_response("1ページ目")]),
+    ]
+    on_throttle = Mock()
+
+    results = vision_service.perform_ocr_batch_bytes([b"page1"], on_throttle)
+
+    assert results == ["1ページ目"]
+    on_throttle.assert_called_once_with()
+
+
+def test_perform_ocr_batch_splits_by_limit(
+    vision_service, mock_vision_client, sample_image
+):
+    # MAX_BATCH_SIZEを超える画像は複数回の呼び出しに分割されること
+    from external_service.vision_ocr_service import MAX_BATCH_SIZE
+
+    instance = mock_vision_client.from_service_account_info.return_value
+    instance.batch_annotate_images.side_effect = lambda requests: Mock(
+        responses=[_make_response("テキスト") for _ in requests]
+    )
+
+    results = vision_service.perform_ocr_batch([sample_image] * (MAX_BATCH_SIZE + 1))
+
+    assert len(results) == MAX_BATCH_SIZE + 1
+    assert instance.batch_annotate_images.call_count == 2
+
+
+def test_split_batches_by_count_and_bytes():
+    # 枚数と合計バイト数の上限ごとに分割し、上限を超える1枚は単独で送ること
+    from external_service.vision_ocr_service import (
+        MAX_BATCH_BYTES,
+        MAX_BATCH_SIZE,
+        split_batches,
+    )
+
+    assert split_batches([]) == []
+    assert split_batches([1] * (MAX_BATCH_SIZE + 1)) == [
+        (0, MAX_BATCH_SIZE),
+        (MAX_BATCH_SIZE, MAX_BATCH_SIZE + 1),
+    ]
+    half = MAX_BATCH_BYTES // 2
+    assert split_batches([half, half, 1, MAX_BATCH_BYTES + 1, 1]) == [
+        (0, 2),
+        (2, 3),
+        (3, 4),
+        (4, 5),
+    ]
+
+
+def test_perform_ocr_batch_bytes_splits_by_bytes(vision_service, mock_vision_client):
+    # 合計バイト数の上限を超える画像は複数回の呼び出しに分割されること
+    from external_service.vision_ocr_service import MAX_BATCH_BYTES
+
+    instance = mock_vision_client.from_service_account_info.return_value
+    instance.batch_annotate_images.side_effect = lambda **kwargs: Mock(
+        responses=[_make_response("テキスト") for _ in kwargs["requests"]]
+    )
+    vision_service._preprocess.max_image_bytes = MAX_BATCH_BYTES
+    content = b"x" * (MAX_BATCH_BYTES // 2)
+
+    results = vision_service.perform_ocr_batch_bytes([content] * 3)
+
+    assert results == ["テキスト"] * 3
+    assert [
+        len(c.kwargs["requests"]) for c in instance.batch_annotate_images.call_args_list
+    ] == [2, 1]
+
+
+def test_perform_ocr_batch_rejected_request_sent_one_by_one(
+    vision_service, mock_vision_client
+):
+    # APIにリクエストを拒否された場合は1枚ずつ送信し直し、問題の画像のみ失敗すること
+    from google.api_core import exceptions as api_exceptions
+
+    def annotate(**kwargs):
+        contents = [request.image.content for request in kwargs["requests"]]
+        if len(contents) > 1 or contents == [b"bad"]:
+            raise api_exceptions.InvalidArgument("request too large")
+        return Mock(responses=[_make_response(contents[0].decode())])
+
+    instance = mock_vision_client.from_service_account_info.return_value
+    instance.batch_annotate_images.side_effect = annotate
+
+    results = vision_service.perform_ocr_batch_bytes([b"page1", b"bad", b"page3"])
+
+    assert results[0] == "page1"
+    assert isinstance(results[1], RuntimeError)
+    assert results[2] == "page3"
+    assert instance.batch_annotate_images.call_count == 4
+
+
+def test_perform_ocr_batch_isolates_page_errors(
+    vision_service, mock_vision_client, sample_image
+):
+    # 1枚の失敗が他の画像の結果に影響しないこと
+    instance = mock_vision_client.from_service_account_info.return_value
+    instance.batch_annotate_images.return_value.responses = [
+        _make_response("成功"),
+        _make_response(error_message="画像エラー"),
+        _make_response(),
+    ]
+
+    results = vision_service.perform_ocr_batch([sample_image] * 3)
+
+    assert results[0] == "成功"
+    assert isinstance(results[1], RuntimeError)
+    assert "Vision API エラー" in str(results[1])
+    assert isinstance(results[2], RuntimeError)
+
+
+def test_perform_ocr_batch_call_failure(
+    vision_service, mock_vision_client, sample_image
+):
+    # API呼び出し自体の失敗は全画像の例外として返ること
+    instance = mock_vision_client.from_service_account_info.return_value
+    instance.batch_annotate_images.side_effect = Exception("接続エラー")
+
+    results = vision_service.perform_ocr_batch([sample_image] * 2)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.fixture
+def cached_service(mock_vision_client, mock_credentials, mock_config, tmp_path):
+    from utils.ocr_cache import OCRResultCache
+
+    cache = OCRResultCache(tmp_path / "cache.sqlite3", max_size_bytes=1024 * 1024)
+    yield VisionOCRService(cache=cache)
+    cache.close()
+
+
+def test_perform_ocr_uses_cache(cached_service, mock_vision_client, sample_image):
+    # 同じ画像の2回目はAPIを呼び出さずキャッシュから返ること
+    instance = mock_vision_client.from_service_account_info.return_value
+    instance.text_detection.return_value = _make_response("キャッシュ対象")
+
+    assert cached_service.perform_ocr(sample_image) == "キャッシュ対象"
+    assert cached_service.perform_ocr(sample_image) == "キャッシュ対象"
+
+    assert instance.text_detection.call_count == 1
+    assert cached_service.cache.hits == 1
+    assert cached_service.cache.misses == 1
+
+
+def test_perform_ocr_batch_sends_only_cache_misses(
+    cached_service, mock_vision_client, sample_image
+):
+    # キャッシュ済みの画像はバッチリクエストから除外されること
+    instance = mock_vision_client.from_service_account_info.return_value
+    instance.text_detection.return_value = _make_response("白")
+    instance.batch_annotate_images.return_value.responses = [_make_response("黒")]
+    cached_service.perform_ocr(sample_image)
+
+    black_image = Image.new("RGB", (100, 100), color="black")
+    results = cached_service.perform_ocr_batch([sample_image, black_image])
+
+    assert results == ["白", "黒"]
+    requests = instance.batch_annotate_images.call_args.kwargs["requests"]
+    assert len(requests) == 1
+
+
+def test_cache_write_error_keeps_ocr_result(
+    cached_service, mock_vision_client, sample_image
+):
+    # キャッシュへの保存に失敗してもAPIの結果を返すこと
+    instance = mock_vision_client.from_service_account_info.return_value
+    instance.text_detection.return_value = _make_response("単体")
+    instance.batch_annotate_images.return_value.responses = [_make_response("バッチ")]
+    black_image = Image.new("RGB", (100, 100), color="black")
+
+    with patch.object(
+        cached_service.cache, "put", side_effect=sqlite3.OperationalError("locked")
+    ):
+        assert cached_service.perform_ocr(sample_image) == "単体"
+        assert cached_service.perform_ocr_batch([black_image]) == ["バッチ"]
+
+
+def test_cache_read_error_treated_as_miss(
+    cached_service, mock_vision_client, sample_image
+):
+    # キャッシュの参照に失敗した場合はキャッシュなしとしてAPIを呼び出すこと
+    instance = mock_vision_client.from_service_account_info.return_value
+    instance.text_detection.return_value = _make_response("単体")
+    instance.batch_annotate_images.return_value.responses = [_make_response("バッチ")]
+    black_image = Image.new("RGB", (100, 100), color="black")
+
+    with patch.object(
+        cached_service.cache, "get", side_effect=sqlite3.OperationalError("locked")
+    ):
+        assert cached_service.perform_ocr(sample_image) == "単体"
+        assert cached_service.perform_ocr_batch([black_image]) == ["バッチ"]
+
+    assert instance.text_detection.call_count == 1
+
+
+@pytest.fixture
+def shared_service_env(mock_vision_client, mock_credentials, mock_config):
+    from external_service import vision_ocr_service
+
+    vision_ocr_service.reset_shared_ocr_service()
+    with patch(
+        "external_service.vision_ocr_service.get_env_file_signature",
+        return_value=("/path/.env", 1, 100),
+    ) as mock_signature:
+        yield mock_signature
+    vision_ocr_service.reset_shared_ocr_service()
+
+
+def test_shared_service_is_reused(shared_service_env, mock_vision_client):
+    # 同じ条件での取得は同一インスタンスを返し、クライアントを再生成しないこと
+    from external_service.vision_ocr_service import get_shared_ocr_service
+
+    first = get_shared_ocr_service("text_detection")
+    second = get_shared_ocr_service("text_detection")
+
+    assert first is second
+    assert mock_vision_client.from_service_account_info.call_count == 1
+
+
+def test_shared_service_detection_type_change_keeps_client(
+    shared_service_env, mock_vision_client
+):
+    # 検出タイプの変更時はクライアントを引き継いで再生成すること
+    from external_service.vision_ocr_service import get_shared_ocr_service
+
+    first = get_shared_ocr_service("text_detection")
+    second = get_shared_ocr_service("document_text_detection")
+
+    assert first is not second
+    assert second.detection_type == "document_text_detection"
+    assert second.client is first.client
+    assert mock_vision_client.from_service_account_info.call_count == 1
+
+
+def test_shared_service_rebuilt_on_credentials_change(
+    shared_service_env, mock_vision_client
+):
+    # .envが更新された場合はクライアントを再生成すること
+    from external_service.vision_ocr_service import get_shared_ocr_service
+
+    first = get_shared_ocr_service("text_detection")
+    shared_service_env.return_value = ("/path/.env", 2, 120)
+    second = get_shared_ocr_service("text_detection")
+
+    assert first is not second
+    assert mock_vision_client.from_service_account_info.call_count == 2
+
+
+def test_warm_up_connects_channel_and_refreshes_token(vision_service):
+    # チャネル接続の待機と認証トークンの取得が行われること
+    credentials = Mock()
+    credentials.valid = False
+    vision_service.client.transport._credentials = credentials
+
+    with patch(
+        "external_service.vision_ocr_service.grpc.channel_ready_future"
+    ) as mock_ready:
+        vision_service.warm_up(timeout=1.0)
+
+    mock_ready.assert_called_once_with(vision_service.client.transport.grpc_channel)
+    mock_ready.return_value.result.assert_called_once_with(timeout=1.0)
+    credentials.refresh.assert_called_once()
+
+
+def test_warm_up_shared_service_logs_failure(shared_service_env):
+    # ウォームアップの失敗は例外を送出しないこと
+    from external_service.vision_ocr_service import warm_up_shared_ocr_service
+
+    with patch(
+        "external_service.vision_ocr_service.grpc.channel_ready_future",
+        side_effect=Exception("接続エラー"),
+    ):
+        warm_up_shared_ocr_service("text_detection")
@@ -0,0 +1,187 @@
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+DEFAULT_LATENCY_BUDGET = 10.0
+DEFAULT_LATENCY_PERCENTILE = 0.95
+DEFAULT_DECREASE_FACTOR = 0.5
+DEFAULT_WINDOW = 20
+
+
+@dataclass
+class ConcurrencyChange:
+    """同時実行数の変更履歴
+
+    Attributes:
+        elapsed: 制御開始からの経過秒数
+        limit: 変更後の同時実行数
+        reason: 変更理由（initial / increase / decrease）
+    """
+
+    elapsed: float
+    limit: int
+    reason: str
+
+
+class AdaptiveConcurrencyLimiter:
+    """応答時間とスロットリングに応じて同時実行数を調整する（AIMD）
+
+    直近の応答時間のパーセンタイルが予算内であれば、現在の同時実行数分の結果を
+    観測するごとに1ずつ増やす。RESOURCE_EXHAUSTEDや期限切れを観測した場合は
+    decrease_factor 倍に減らす。減らした時点より前に開始した呼び出しの失敗は
+    同じ過負荷によるものとみなし、重ねて減らさない。
+    複数スレッドから同時に利用できる。
+
+    Attributes:
+        min_limit: 同時実行数の下限
+        max_limit: 同時実行数の上限
+        latency_budget: 応答時間の予算（秒）
+        history: 同時実行数の変更履歴
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        latency_budget: float = DEFAULT_LATENCY_BUDGET,
+        percentile: float = DEFAULT_LATENCY_PERCENTILE,
+        decrease_factor: float = DEFAULT_DECREASE_FACTOR,
+        window: int = DEFAULT_WINDOW,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.latency_budget = latency_budget
+        self._percentile = percentile
+        self._decrease_factor = decrease_factor
+        self._clock = clock
+        self._started = clock()
+        self._limit = min(self.max_limit, max(self.min_limit, initial))
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._samples_since_change = 0
+        self._last_decrease = float("-inf")
+        self._lock = threading.Lock()
+        self.history: list[ConcurrencyChange] = [
+            ConcurrencyChange(0.0, self._limit, "initial")
+        ]
+
+    @property
+    def limit(self) -> int:
+        """現在の同時実行数の上限"""
+        return self._limit
+
+    def now(self) -> float:
+        """呼び出しの開始時刻の記録に用いる現在時刻"""
+        return self._clock()
+
+    def latency_percentile(self) -> Optional[float]:
+        """直近の応答時間のパーセンタイル（観測がない場合は None）"""
+        with self._lock:
+            return self._percentile_locked()
+
+    def on_success(self, latency: float) -> None:
+        """呼び出しの成功と応答時間を記録"""
+        with self._lock:
+            self._latencies.append(latency)
+            self._samples_since_change += 1
+            # 現在の同時実行数分の結果を観測するまでは判断しない（1往復に1回の加算）
+            if self._samples_since_change < self._limit:
+                return
+            percentile = self._percentile_locked()
+            if percentile is not None and percentile <= self.latency_budget:
+                self._set_limit(self._limit + 1, "increase")
+            self._samples_since_change = 0
+
+    def on_throttle(self, started: float) -> None:
+        """スロットリング・期限切れを記録
+
+        Args:
+            started: 失敗した呼び出しの開始時刻（now() の値）
+        """
+        with self._lock:
+            if started < self._last_decrease:
+                return
+            self._last_decrease = self._clock()
+            decreased = math.floor(self._limit * self._decrease_factor)
+            self._set_limit(decreased, "decrease")
+            self._samples_since_change = 0
+            self._latencies.clear()
+
+    def history_since(self, index: int) -> list[ConcurrencyChange]:
+        """index 番目以降の変更履歴を、その時点の同時実行数を先頭に付けて返す"""
+        with self._lock:
+            changes = self.history[index:]
+            if index <= 0:
+                return changes
+            base = self.history[index - 1]
+        return [ConcurrencyChange(base.elapsed, base.limit, "initial"), *changes]
+
+    def summary(self) -> str:
+        """ログ出力用の変更履歴の要約"""
+        return summarize_history(self.history)
+
+    def _percentile_locked(self) -> Optional[float]:
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, math.ceil(len(ordered) * self._percentile) - 1)
+        return ordered[max(0, index)]
+
+    def _set_limit(self, limit: int, reason: str) -> None:
+        limit = min(self.max_limit, max(self.min_limit, limit))
+        if limit == self._limit:
+            return
+        self._limit = limit
+        self.history.append(
+            ConcurrencyChange(self._clock() - self._started, limit, reason)
+        )
+
+
+_shared_lock = threading.Lock()
+_shared_limiter: Optional[AdaptiveConcurrencyLimiter] = None
+_shared_signature: Optional[tuple[int, int, float]] = None
+
+
+def get_shared_concurrency_limiter(
+    initial: int, max_limit: int, latency_budget: float
+) -> AdaptiveConcurrencyLimiter:
+    """プロセス全体で共有する同時実行数の制御を取得
+
+    ジョブをまたいで調整した同時実行数を引き継ぐ。設定が変わった場合のみ再生成する。
+    """
+    global _shared_limiter, _shared_signature
+
+    signature = (initial, max_limit, latency_budget)
+    with _shared_lock:
+        if _shared_limiter is None or signature != _shared_signature:
+            _shared_limiter = AdaptiveConcurrencyLimiter(
+                initial=initial, max_limit=max_limit, latency_budget=latency_budget
+            )
+            _shared_signature = signature
+        return _shared_limiter
+
+
+def reset_shared_concurrency_limiter() -> None:
+    """共有の同時実行数の制御を破棄（次回取得時に初期値から再生成）"""
+    global _shared_limiter, _shared_signature
+
+    with _shared_lock:
+        _shared_limiter = None
+        _shared_signature = None
+
+
+def summarize_history(history: list[ConcurrencyChange]) -> str:
+    """同時実行数の変更履歴を「初期→最終（最大, 増減回数）」の形式で要約"""
+    if not history:
+        return ""
+    limits = [change.limit for change in history]
+    increases = sum(change.reason == "increase" for change in history)
+    decreases = sum(change.reason == "decrease" for change in history)
+    return (
+        f"{limits[0]}→{limits[-1]}（最大{max(limits)}, "
+        f"増加{increases}回, 減少{decreases}回）"
+    )
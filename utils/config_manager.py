@@ -108,6 +108,21 @@ class ConfigManager:
         except ValueError as e:
             raise ConfigError(f"Invalid screen capture settings: {e}") from e
 
+    def get_freeze_screen(self) -> bool:
+        """範囲選択の開始時に画面全体を撮影し、静止画上で範囲を選択するかを取得"""
+        return self.config.getboolean("ScreenCapture", "freeze_screen", fallback=True)
+
+    def get_screen_grab_backend(self) -> str:
+        """画面の撮影方式を取得
+
+        Returns:
+            str: 'auto'（Pillowで撮影し、失敗時はpyautogui）、'pillow'、'pyautogui'
+        """
+        value = self.config.get("ScreenCapture", "grab_backend", fallback="auto")
+        if value not in ("auto", "pillow", "pyautogui"):
+            return "auto"
+        return value
+
     def get_input_mode(self) -> bool:
         """入力モード（追記/上書き）を取得
 
@@ -186,10 +201,266 @@ class ConfigManager:
         """PopplerのパスをPDF変換用に取得"""
         return self.config.get("PDF", "poppler_path", fallback="")
 
+    def get_image_encoding(self) -> str:
+        """OCR送信用画像のエンコード方式を取得
+
+        Returns:
+            str: 'png'、'fast_png'（低圧縮で高速）、'jpeg'、'webp'、'auto'（画像の内容で選択）
+        """
+        value = self.config.get("VisionOCR", "image_encoding", fallback="auto")
+        if value not in ("png", "fast_png", "jpeg", "webp", "auto"):
+            return "auto"
+        return value
+
+    def get_image_quality(self) -> int:
+        """JPEG・WebPでエンコードする際の品質（1〜100）を取得"""
+        value = self.config.getint("VisionOCR", "image_quality", fallback=85)
+        return min(100, max(1, value))
+
+    def get_png_compress_level(self) -> int:
+        """fast_pngでエンコードする際の圧縮レベル（0〜9）を取得"""
+        value = self.config.getint("VisionOCR", "png_compress_level", fallback=1)
+        return min(9, max(0, value))
+
+    def get_max_megapixels(self) -> float:
+        """OCR送信前に縮小する目安の画素数（百万画素単位、0で無効）を取得"""
+        return self.config.getfloat("VisionOCR", "max_megapixels", fallback=6.0)
+
+    def get_max_image_bytes(self) -> int:
+        """OCR送信画像のエンコード後のバイト数の上限を取得"""
+        value = self.config.getint("VisionOCR", "max_image_kb", fallback=4096)
+        return max(1, value) * 1024
+
+    def get_min_text_height(self) -> int:
+        """縮小後も維持する文字の高さの下限（ピクセル）を取得"""
+        return max(1, self.config.getint("VisionOCR", "min_text_height", fallback=12))
+
+    def get_auto_grayscale(self) -> bool:
+        """色に意味がない画像をグレースケールへ変換するかを取得"""
+        return self.config.getboolean("VisionOCR", "auto_grayscale", fallback=True)
+
+    def get_auto_crop(self) -> bool:
+        """OCR送信前に文字のない周囲の余白を切り取るかを取得"""
+        return self.config.getboolean("VisionOCR", "auto_crop", fallback=True)
+
+    def get_crop_padding(self) -> int:
+        """余白を切り取った範囲の周囲に残す余白（ピクセル）を取得"""
+        return max(0, self.config.getint("VisionOCR", "crop_padding", fallback=10))
+
+    def get_enhance_mode(self) -> str:
+        """OCR送信前の画質補正モードを取得
+
+        Returns:
+            str: 'off'（補正しない）、'contrast'（コントラスト補正）、
+                'binarize'（コントラスト補正後に適応的二値化）
+        """
+        value = self.config.get("VisionOCR", "enhance", fallback="off")
+        if value not in ("off", "contrast", "binarize"):
+            return "off"
+        return value
+
+    def get_binarize_bits(self) -> int:
+        """二値化した画像のビット深度（1 / 8）を取得"""
+        value = self.config.getint("VisionOCR", "binarize_bits", fallback=1)
+        if value not in (1, 8):
+            return 1
+        return value
+
+    def get_tile_mode(self) -> str:
+        """大きな画像のタイル分割OCRのモードを取得
+
+        Returns:
+            str: 'off'（分割しない）、'auto'（tile_min_megapixels超で分割）、
+                'always'（tile_sizeを超える画像は常に分割）
+        """
+        value = self.config.get("VisionOCR", "tile_mode", fallback="off")
+        if value not in ("off", "auto", "always"):
+            return "off"
+        return value
+
+    def get_tile_min_megapixels(self) -> float:
+        """autoモードでタイル分割する画素数の下限（百万画素単位）を取得"""
+        return self.config.getfloat("VisionOCR", "tile_min_megapixels", fallback=20.0)
+
+    def get_tile_size(self) -> int:
+        """タイルの一辺の長さ（ピクセル）を取得"""
+        return max(1, self.config.getint("VisionOCR", "tile_size", fallback=2000))
+
+    def get_tile_overlap(self) -> int:
+        """隣り合うタイルの重なり幅（ピクセル）を取得"""
+        return max(0, self.config.getint("VisionOCR", "tile_overlap", fallback=200))
+
+    def get_tile_max_workers(self) -> int:
+        """タイル分割OCRで同時に実行するAPI呼び出しの最大数を取得"""
+        return max(1, self.config.getint("VisionOCR", "tile_max_workers", fallback=4))
+
+    def get_retry_max_attempts(self) -> int:
+        """Vision API呼び出しの最大試行回数（初回を含む）を取得"""
+        return max(1, self.config.getint("VisionRetry", "max_attempts", fallback=4))
+
+    def get_retry_initial_backoff(self) -> float:
+        """初回の再試行までの待機時間の上限（秒）を取得"""
+        return self.config.getfloat("VisionRetry", "initial_backoff", fallback=0.5)
+
+    def get_retry_max_backoff(self) -> float:
+        """再試行の待機時間の上限（秒）を取得"""
+        return self.config.getfloat("VisionRetry", "max_backoff", fallback=8.0)
+
+    def get_retry_backoff_multiplier(self) -> float:
+        """再試行ごとの待機時間の倍率を取得"""
+        return self.config.getfloat("VisionRetry", "backoff_multiplier", fallback=2.0)
+
+    def get_retry_request_timeout(self) -> float:
+        """Vision API呼び出し1回あたりのタイムアウト（秒）を取得"""
+        return self.config.getfloat("VisionRetry", "request_timeout", fallback=30.0)
+
+    def get_retry_deadline(self) -> float:
+        """再試行を含めたVision API呼び出し全体の期限（秒）を取得"""
+        return self.config.getfloat("VisionRetry", "deadline", fallback=60.0)
+
+    def get_rate_limit_enabled(self) -> bool:
+        """Vision API呼び出しのレート制限の有効/無効を取得"""
+        return self.config.getboolean("VisionRateLimit", "enabled", fallback=True)
+
+    def get_rate_limit_requests_per_second(self) -> float:
+        """Vision APIへ送信する1秒あたりの画像数の上限を取得"""
+        value = self.config.getfloat(
+            "VisionRateLimit", "requests_per_second", fallback=25.0
+        )
+        return max(0.01, value)
+
+    def get_rate_limit_burst(self) -> int:
+        """レート制限で一度に送信できる画像数（バケット容量）を取得"""
+        return max(1, self.config.getint("VisionRateLimit", "burst", fallback=32))
+
     def get_pdf_max_pages(self) -> int:
         """OCR処理するPDFの最大ページ数を取得"""
         return self.config.getint("PDF", "max_pages", fallback=20)
 
+    def get_pdf_batch_size(self) -> int:
+        """1回のAPI呼び出しにまとめるPDFページ数を取得"""
+        return max(1, self.config.getint("PDF", "batch_size", fallback=16))
+
+    def get_pdf_max_workers(self) -> int:
+        """PDFのOCR処理で同時に実行するAPI呼び出しの最大数（adaptiveモードでは上限）を取得"""
+        return max(1, self.config.getint("PDF", "max_workers", fallback=8))
+
+    def get_pdf_concurrency_mode(self) -> str:
+        """PDFのOCR処理の同時実行数の制御モードを取得
+
+        Returns:
+            str: 'fixed'（常にmax_workers）、'adaptive'（応答時間とスロットリングで調整）
+        """
+        value = self.config.get("PDF", "concurrency_mode", fallback="adaptive")
+        if value not in ("fixed", "adaptive"):
+            return "adaptive"
+        return value
+
+    def get_pdf_initial_workers(self) -> int:
+        """adaptiveモードの同時実行数の初期値を取得"""
+        return max(1, self.config.getint("PDF", "initial_workers", fallback=2))
+
+    def get_pdf_latency_budget(self) -> float:
+        """adaptiveモードで同時実行数を増やす応答時間（p95）の上限（秒）を取得"""
+        return self.config.getfloat("PDF", "latency_budget", fallback=10.0)
+
+    def get_pdf_text_layer_mode(self) -> str:
+        """PDFのテキストレイヤー利用モードを取得
+
+        Returns:
+            str: 'never'（常にOCR）、'auto'（文字数が十分なら利用）、'always'（OCRしない）
+        """
+        value = self.config.get("PDF", "text_layer_mode", fallback="auto")
+        if value not in ("never", "auto", "always"):
+            return "auto"
+        return value
+
+    def get_pdf_text_layer_min_chars(self) -> int:
+        """テキストレイヤーを採用する最小文字数を取得"""
+        return self.config.getint("PDF", "text_layer_min_chars", fallback=20)
+
+    def get_pdf_render_dpi(self) -> int:
+        """PDFページを画像化する解像度（DPI）を取得"""
+        return max(1, self.config.getint("PDF", "render_dpi", fallback=150))
+
+    def get_pdf_dpi_mode(self) -> str:
+        """PDF画像化の解像度モードを取得
+
+        Returns:
+            str: 'fixed'（常にrender_dpi）、'adaptive'（画素数上限に収まるよう自動調整）
+        """
+        value = self.config.get("PDF", "dpi_mode", fallback="fixed")
+        if value not in ("fixed", "adaptive"):
+            return "fixed"
+        return value
+
+    def get_pdf_max_render_pixels(self) -> int:
+        """adaptiveモードで1ページに許容する最大画素数を取得"""
+        return max(1, self.config.getint("PDF", "max_render_pixels", fallback=4000000))
+
+    def get_pdf_colorspace(self) -> str:
+        """PDF画像化の色空間を取得
+
+        Returns:
+            str: 'gray'（グレースケール）または 'rgb'
+        """
+        value = self.config.get("PDF", "colorspace", fallback="gray")
+        if value not in ("gray", "rgb"):
+            return "gray"
+        return value
+
+    def get_pdf_render_alpha(self) -> bool:
+        """PDF画像化でアルファチャネルを残すかを取得"""
+        return self.config.getboolean("PDF", "render_alpha", fallback=False)
+
+    def get_pdf_image_format(self) -> str:
+        """画像化したPDFページのエンコード形式を取得
+
+        Returns:
+            str: 'png'（可逆）または 'jpeg'（送信サイズ小）
+        """
+        value = self.config.get("PDF", "image_format", fallback="png")
+        if value not in ("png", "jpeg"):
+            return "png"
+        return value
+
+    def get_pdf_jpeg_quality(self) -> int:
+        """PDFページをJPEGでエンコードする際の品質（1〜100）を取得"""
+        value = self.config.getint("PDF", "jpeg_quality", fallback=90)
+        return min(100, max(1, value))
+
+    def get_pdf_blank_page_threshold(self) -> float:
+        """空白ページとみなすインク（暗い画素）の割合の上限を取得（0で判定しない）"""
+        value = self.config.getfloat("PDF", "blank_page_threshold", fallback=0.0002)
+        return min(1.0, max(0.0, value))
+
+    def get_pdf_auto_crop(self) -> bool:
+        """画像化したPDFページの周囲の余白を切り取るかを取得"""
+        return self.config.getboolean("PDF", "auto_crop", fallback=True)
+
+    def get_pdf_enhance_mode(self) -> str:
+        """画像化したPDFページの画質補正モード（off / contrast / binarize）を取得"""
+        value = self.config.get("PDF", "enhance", fallback="off")
+        if value not in ("off", "contrast", "binarize"):
+            return "off"
+        return value
+
+    def get_pdf_page_cache(self) -> bool:
+        """PDFページの画像化前にページ単位のOCR結果キャッシュを参照するかを取得"""
+        return self.config.getboolean("PDF", "page_cache", fallback=True)
+
+    def get_ocr_cache_enabled(self) -> bool:
+        """OCR結果キャッシュの有効/無効を取得"""
+        return self.config.getboolean("OCRCache", "enabled", fallback=True)
+
+    def get_ocr_cache_directory(self) -> str:
+        """OCR結果キャッシュの保存先を取得（相対パスはユーザーデータフォルダ基準）"""
+        return self.config.get("OCRCache", "directory", fallback="cache")
+
+    def get_ocr_cache_max_size_mb(self) -> int:
+        """OCR結果キャッシュの最大サイズ（MB）を取得"""
+        return max(1, self.config.getint("OCRCache", "max_size_mb", fallback=50))
+
     def set_input_mode(self, is_append: bool) -> None:
         """入力モードを保存
 
@@ -10,6 +10,8 @@ DEFAULT_APP_TITLE = "VisionOCR"
 DEFAULT_TRANSPARENCY = 0.3
 DEFAULT_OUTLINE_WIDTH = 3
 MIN_SCREENSHOT_SIZE = 5
+# ドラッグ中の選択矩形を再描画する間隔（ミリ秒、約60fps）
+SELECTION_REDRAW_INTERVAL_MS = 16
 
 
 class UIColors:
@@ -28,6 +30,9 @@ class UILayout:
     FRAME_PADDING = 5
     HIGHLIGHT_FONT = ("Helvetica", 10, "bold")
     HIGHLIGHT_BORDER_WIDTH = 3
+    SELECTION_LABEL_FONT = ("Helvetica", 12, "bold")
+    SELECTION_LABEL_MARGIN = 4
+    CAPTURE_HINT_MARGIN = 20
 
 
 class TextPosition:
@@ -52,6 +57,7 @@ class UILabels:
     BTN_REMOVE_LINEBREAK = "改行除去"
     BTN_REMOVE_SPACE = "スペース除去"
     BTN_REMOVE_SEPARATOR = "区切り削除"
+    BTN_CANCEL = "中止"
     MODE_APPEND = "追記"
     MODE_OVERWRITE = "上書き"
     DETECTION_TEXT = "文章形式"
@@ -84,6 +90,7 @@ class UIMessages:
     WARN_NO_COPY_TEXT = "コピーするテキストがありません。"
     WARN_SCREENSHOT_TOO_SMALL = "スクリーンショットの範囲が小さすぎます。"
     WARN_NO_TEXT_DETECTED = "テキストを検出できませんでした。"
+    WARN_JOB_RUNNING = "処理中です。完了または中止してから再実行してください。"
 
     # エラー（テンプレート）
     ERR_WINDOW_CONFIG_LOAD = "ウィンドウ設定の読み込みに失敗: {error}"
@@ -101,10 +108,24 @@ class UIMessages:
     ERR_FILE_PERMISSION = "ファイルへのアクセス権限がありません。"
     ERR_FILE_OS = "ファイル操作エラー: {error}"
 
+    # 範囲選択
+    CAPTURE_HINT = (
+        "ドラッグで範囲を選択（Shift+ドラッグで範囲を追加、Enterで確定、Escで中止）"
+    )
+    CAPTURE_SIZE = "{width} × {height}"
+    CAPTURE_REGION_FAILED = "[範囲{index}: OCR失敗]"
+
     # PDF処理
     PDF_PAGE_FOOTER = "--- {page_num}ページ目 ---"
     PDF_OCR_FAILED = "[テキストを検出できませんでした]"
+    PDF_BLANK_PAGE = "[空白ページ]"
     PDF_PAGE_LIMIT_WARNING = "（{max_pages}ページまで処理しました）"
+    PDF_CANCELLED = "（処理を中止しました）"
+
+    # 進捗表示
+    PROGRESS_PAGES = "{done}/{total}ページ"
+    PROGRESS_ETA = "残り約{eta}秒"
+    PROGRESS_OCR_RUNNING = "OCR処理中..."
 
     # 座標エラー（プログラム内部用、ユーザー表示ではない）
     COORD_INVALID = "スクリーンショットの座標が正しく設定されていません"
@@ -25,6 +25,11 @@ def _user_env_dir() -> Path:
     return base / _get_app_dir_name()
 
 
+def get_user_data_dir() -> Path:
+    """ユーザーごとのアプリケーションデータフォルダ（.envやキャッシュの保存先）"""
+    return _user_env_dir()
+
+
 def _project_env_path() -> Path:
     return Path(__file__).parent.parent / ENV_FILE_NAME
 
@@ -73,6 +78,16 @@ def get_google_credentials() -> dict:
     return json.loads(credentials_json)
 
 
+def get_env_file_signature() -> tuple[str, int, int] | None:
+    """.envファイルの変更検出用シグネチャ（パス・更新時刻・サイズ）を取得"""
+    env_path = _resolve_env_path()
+    try:
+        stat = env_path.stat()
+    except OSError:
+        return None
+    return str(env_path), stat.st_mtime_ns, stat.st_size
+
+
 def load_env_variables() -> dict[str, str]:
     env_path = _resolve_env_path()
     if not env_path.exists():
@@ -0,0 +1,138 @@
+import io
+import time
+from dataclasses import dataclass
+
+from PIL import Image
+
+from utils.config_manager import ConfigManager
+
+# エンコード方式
+ENCODING_PNG = "png"
+ENCODING_FAST_PNG = "fast_png"
+ENCODING_JPEG = "jpeg"
+ENCODING_WEBP = "webp"
+ENCODING_AUTO = "auto"
+
+DEFAULT_QUALITY = 85
+DEFAULT_PNG_COMPRESS_LEVEL = 1
+
+# autoモードで色数を数える縮小画像の一辺の長さ
+_AUTO_SAMPLE_SIZE = 256
+# autoモードでPNGを選ぶ色数の上限（画面キャプチャや文書など色数の少ない画像）
+_AUTO_MAX_PNG_COLORS = 256
+
+
+@dataclass
+class ImageEncodingOptions:
+    """アップロード用画像のエンコード設定
+
+    Attributes:
+        strategy: エンコード方式（png / fast_png / jpeg / webp / auto）
+        quality: JPEG・WebPの品質（1〜100）
+        png_compress_level: fast_pngのzlib圧縮レベル（0〜9、小さいほど高速）
+    """
+
+    strategy: str = ENCODING_AUTO
+    quality: int = DEFAULT_QUALITY
+    png_compress_level: int = DEFAULT_PNG_COMPRESS_LEVEL
+
+    @classmethod
+    def from_config(cls, config: ConfigManager) -> "ImageEncodingOptions":
+        """config.iniの[VisionOCR]セクションから設定を生成"""
+        return cls(
+            strategy=config.get_image_encoding(),
+            quality=config.get_image_quality(),
+            png_compress_level=config.get_png_compress_level(),
+        )
+
+
+@dataclass
+class EncodedImage:
+    """エンコード結果
+
+    Attributes:
+        content: エンコード済みのバイト列
+        format: 画像形式（PNG / JPEG / WEBP）
+        seconds: エンコードに要した秒数
+        width: 画像の幅（ピクセル）
+        height: 画像の高さ（ピクセル）
+        offset: 余白を切り取った場合の元画像での左上の位置
+        scale: 元画像に対する縮小率
+    """
+
+    content: bytes
+    format: str
+    seconds: float
+    width: int = 0
+    height: int = 0
+    offset: tuple[int, int] = (0, 0)
+    scale: float = 1.0
+
+    @property
+    def size(self) -> int:
+        """エンコード後のバイト数"""
+        return len(self.content)
+
+    def to_source(self, x: float, y: float) -> tuple[float, float]:
+        """エンコード後の画像の座標を元画像の座標へ変換"""
+        return (self.offset[0] + x / self.scale, self.offset[1] + y / self.scale)
+
+    def summary(self) -> str:
+        """ログ出力用の文字列"""
+        return (
+            f"{self.format} {self.width}x{self.height} {self.size / 1024:.1f}KB, "
+            f"エンコード時間 {self.seconds * 1000:.1f}ms"
+        )
+
+
+def _is_low_color(image: Image.Image) -> bool:
+    """縮小画像の色数が少ない（文字や図形が主体の）画像かを判定"""
+    # 補間で中間色が生じないよう最近傍法で間引く
+    size = (min(image.width, _AUTO_SAMPLE_SIZE), min(image.height, _AUTO_SAMPLE_SIZE))
+    sample = image.resize(size, Image.Resampling.NEAREST)
+    return sample.getcolors(maxcolors=_AUTO_MAX_PNG_COLORS) is not None
+
+
+def resolve_strategy(image: Image.Image, options: ImageEncodingOptions) -> str:
+    """autoモードの場合は画像の内容からエンコード方式を決定
+
+    透過や色数の少ない画像は文字の輪郭を保つため高速PNG、
+    写真などの色数の多い画像はJPEGを選ぶ。
+    """
+    if options.strategy != ENCODING_AUTO:
+        return options.strategy
+    if "A" in image.getbands() or _is_low_color(image):
+        return ENCODING_FAST_PNG
+    return ENCODING_JPEG
+
+
+def encode_image(image: Image.Image, options: ImageEncodingOptions) -> EncodedImage:
+    """PIL Imageを設定のエンコード方式でバイト列へ変換"""
+    started = time.perf_counter()
+    strategy = resolve_strategy(image, options)
+    buffer = io.BytesIO()
+
+    if strategy == ENCODING_JPEG:
+        if image.mode not in ("L", "RGB"):
+            image = image.convert("RGB")
+        image.save(buffer, format="JPEG", quality=options.quality)
+        image_format = "JPEG"
+    elif strategy == ENCODING_WEBP:
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        image.save(buffer, format="WEBP", quality=options.quality)
+        image_format = "WEBP"
+    elif strategy == ENCODING_FAST_PNG:
+        image.save(buffer, format="PNG", compress_level=options.png_compress_level)
+        image_format = "PNG"
+    else:
+        image.save(buffer, format="PNG")
+        image_format = "PNG"
+
+    return EncodedImage(
+        content=buffer.getvalue(),
+        format=image_format,
+        seconds=time.perf_counter() - started,
+        width=image.width,
+        height=image.height,
+    )
@@ -0,0 +1,276 @@
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+from PIL import Image, ImageChops, ImageFilter, ImageOps
+
+from utils.config_manager import ConfigManager
+
+DEFAULT_MAX_MEGAPIXELS = 6.0
+DEFAULT_MAX_IMAGE_BYTES = 4 * 1024 * 1024
+DEFAULT_MIN_TEXT_HEIGHT = 12
+DEFAULT_CROP_PADDING = 10
+DEFAULT_BINARIZE_BITS = 1
+
+# 画質補正モード
+ENHANCE_OFF = "off"
+ENHANCE_CONTRAST = "contrast"
+ENHANCE_BINARIZE = "binarize"
+
+# 文字の高さ・色の判定に使う縮小画像の一辺の長さ
+_SAMPLE_SIZE = 512
+# 有彩色とみなすチャネル間の差
+_COLOR_TOLERANCE = 24
+# 有彩色の画素がこの割合未満ならグレースケールへ変換する
+_MAX_COLOR_PIXEL_RATIO = 0.01
+# 文字行とみなす最小の高さ（これ未満の連続行は罫線やノイズとして除外）
+_MIN_LINE_ROWS = 3
+# 文字行の高さのうち、縮小の下限に用いるパーセンタイル（小さい文字を優先）
+_LINE_HEIGHT_PERCENTILE = 0.25
+# 余白とみなす背景との明るさの差（圧縮ノイズ・スキャンのむらを無視する）
+_CROP_TOLERANCE = 32
+
+# コントラスト補正で切り捨てる最も暗い・明るい画素の割合（%）
+_CONTRAST_CUTOFF = 1
+# 適応的二値化で周囲の平均を求める範囲の半径（ピクセル）
+_BINARIZE_RADIUS = 15
+# 周囲の平均よりこの値以上暗い画素を文字とみなす
+_BINARIZE_OFFSET = 10
+
+# 画像内の範囲（left, top, right, bottom）
+Box = tuple[int, int, int, int]
+
+
+@dataclass
+class ImagePreprocessOptions:
+    """OCR送信前の画像前処理の設定
+
+    Attributes:
+        max_megapixels: 縮小の目安となる画素数の上限（百万画素単位、0以下で無効）
+        max_image_bytes: エンコード後のバイト数の上限（超える場合は必ず縮小）
+        min_text_height: 縮小後も維持する文字の高さの下限（ピクセル）
+        auto_grayscale: 色に意味がない画像をグレースケールへ変換する場合 True
+        auto_crop: 文字のない周囲の余白を切り取る場合 True
+        crop_padding: 切り取った範囲の周囲に残す余白（ピクセル）
+        enhance: 画質補正モード（off / contrast / binarize）
+        binarize_bits: binarizeモードの出力のビット深度（1 / 8）
+    """
+
+    max_megapixels: float = DEFAULT_MAX_MEGAPIXELS
+    max_image_bytes: int = DEFAULT_MAX_IMAGE_BYTES
+    min_text_height: int = DEFAULT_MIN_TEXT_HEIGHT
+    auto_grayscale: bool = True
+    auto_crop: bool = True
+    crop_padding: int = DEFAULT_CROP_PADDING
+    enhance: str = ENHANCE_OFF
+    binarize_bits: int = DEFAULT_BINARIZE_BITS
+
+    @classmethod
+    def from_config(cls, config: ConfigManager) -> "ImagePreprocessOptions":
+        """config.iniの[VisionOCR]セクションから設定を生成"""
+        return cls(
+            max_megapixels=config.get_max_megapixels(),
+            max_image_bytes=config.get_max_image_bytes(),
+            min_text_height=config.get_min_text_height(),
+            auto_grayscale=config.get_auto_grayscale(),
+            auto_crop=config.get_auto_crop(),
+            crop_padding=config.get_crop_padding(),
+            enhance=config.get_enhance_mode(),
+            binarize_bits=config.get_binarize_bits(),
+        )
+
+
+def _sample(image: Image.Image) -> Image.Image:
+    """判定用の縮小画像（補間で中間色が生じないよう最近傍法で間引く）"""
+    size = (min(image.width, _SAMPLE_SIZE), min(image.height, _SAMPLE_SIZE))
+    return image.resize(size, Image.Resampling.NEAREST)
+
+
+def is_effectively_grayscale(image: Image.Image) -> bool:
+    """有彩色の画素がほとんどなく、グレースケールにしても情報が失われないかを判定"""
+    if image.mode in ("1", "L", "LA", "I", "F"):
+        return True
+
+    red, green, blue = _sample(image.convert("RGB")).split()
+    chroma = ImageChops.lighter(
+        ImageChops.difference(red, green), ImageChops.difference(green, blue)
+    )
+    histogram = chroma.histogram()
+    colored = sum(histogram[_COLOR_TOLERANCE:])
+    return colored < sum(histogram) * _MAX_COLOR_PIXEL_RATIO
+
+
+def estimate_text_height(image: Image.Image) -> Optional[int]:
+    """行ごとの文字の有無から文字の高さ（ピクセル）を推定
+
+    背景と異なる明るさの画素を含む行の連続を文字行とみなし、
+    小さい文字を潰さないよう行の高さの下位パーセンタイルを返す。
+    文字行が見つからない場合は None を返す。
+    """
+    # 行方向の解像度のみ必要なため、横方向は間引いてから判定する
+    sample_width = min(image.width, _SAMPLE_SIZE)
+    gray = image.convert("L").resize(
+        (sample_width, image.height), Image.Resampling.NEAREST
+    )
+    # 暗い背景（ダークモードなど）では明るい画素を文字とみなす
+    dark_background = sum(
+        count * value for value, count in enumerate(gray.histogram())
+    ) < (128 * gray.width * gray.height)
+    threshold = 128
+    ink = gray.point(
+        [
+            255 if (v > threshold if dark_background else v < threshold) else 0
+            for v in range(256)
+        ]
+    )
+    # 幅1へ平均化すると各行の文字画素の割合が得られる
+    rows = list(ink.resize((1, ink.height), Image.Resampling.BOX).tobytes())
+
+    heights: list[int] = []
+    run = 0
+    for value in rows + [0]:
+        if value > 0:
+            run += 1
+            continue
+        if run >= _MIN_LINE_ROWS:
+            heights.append(run)
+        run = 0
+
+    if not heights:
+        return None
+    heights.sort()
+    return heights[int((len(heights) - 1) * _LINE_HEIGHT_PERCENTILE)]
+
+
+def find_content_box(image: Image.Image, padding: int = 0) -> Optional[Box]:
+    """周囲の余白を除いた、背景と異なる画素を含む範囲を求める
+
+    背景色は最も多い明るさとし、二値化と外接矩形の算出はPillowのC実装で行う。
+    範囲の周囲に padding ピクセルの余白を残す（画像の外にははみ出さない）。
+    背景以外の画素がない場合は None を返す。
+    """
+    gray = image if image.mode == "L" else image.convert("L")
+    histogram = _sample(gray).histogram()
+    background = histogram.index(max(histogram))
+
+    box = gray.point(
+        [255 if abs(v - background) > _CROP_TOLERANCE else 0 for v in range(256)]
+    ).getbbox()
+    if box is None:
+        return None
+    left, top, right, bottom = box
+    return (
+        max(0, left - padding),
+        max(0, top - padding),
+        min(gray.width, right + padding),
+        min(gray.height, bottom + padding),
+    )
+
+
+def crop_margins(
+    image: Image.Image, options: ImagePreprocessOptions
+) -> tuple[Image.Image, tuple[int, int]]:
+    """周囲の余白を切り取り、切り取った画像と元画像での左上の位置を返す
+
+    透過のある画像・余白のない画像・背景のみの画像はそのまま返す。
+    """
+    if not options.auto_crop or "A" in image.getbands():
+        return image, (0, 0)
+    box = find_content_box(image, options.crop_padding)
+    if box is None or box == (0, 0, image.width, image.height):
+        return image, (0, 0)
+    return image.crop(box), (box[0], box[1])
+
+
+def resolve_scale(image: Image.Image, options: ImagePreprocessOptions) -> float:
+    """画素数の上限と文字の高さの下限から縮小率（1.0以下）を決定"""
+    if options.max_megapixels <= 0:
+        return 1.0
+    max_pixels = options.max_megapixels * 1_000_000
+    pixels = image.width * image.height
+    if pixels <= max_pixels:
+        return 1.0
+
+    scale = math.sqrt(max_pixels / pixels)
+    text_height = estimate_text_height(image)
+    if text_height is not None and text_height * scale < options.min_text_height:
+        scale = min(1.0, options.min_text_height / text_height)
+    return scale
+
+
+def scale_image(image: Image.Image, scale: float) -> Image.Image:
+    """指定した倍率で縮小（1.0以上の場合はそのまま返す）"""
+    if scale >= 1.0:
+        return image
+    size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    # reducing_gap で整数倍の縮小を先に行い、大きな画像の縮小を高速化する
+    return image.resize(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+
+def convert_grayscale(
+    image: Image.Image, options: ImagePreprocessOptions
+) -> Image.Image:
+    """色に意味がない画像をグレースケールへ変換（透過のある画像は変換しない）"""
+    if (
+        options.auto_grayscale
+        and "A" not in image.getbands()
+        and is_effectively_grayscale(image)
+    ):
+        return image.convert("L")
+    return image
+
+
+def stretch_contrast(image: Image.Image) -> Image.Image:
+    """輝度の分布を0〜255へ引き伸ばしたグレースケール画像を返す
+
+    外れ値の影響を避けるため、最も暗い・明るい画素をそれぞれ _CONTRAST_CUTOFF %
+    切り捨ててから引き伸ばす。
+    """
+    gray = image if image.mode == "L" else image.convert("L")
+    return ImageOps.autocontrast(gray, cutoff=_CONTRAST_CUTOFF)
+
+
+def binarize_adaptive(
+    image: Image.Image, bits: int = DEFAULT_BINARIZE_BITS
+) -> Image.Image:
+    """周囲の平均との明るさの差で文字と背景を判定し、白地に黒文字へ二値化
+
+    照明のむらや背景の濃淡があっても文字を残せるよう、画素ごとの閾値に
+    半径 _BINARIZE_RADIUS の平均を用いる。暗い背景の画像は反転してから判定する。
+    bits が1の場合はモード"1"、8の場合は0/255のグレースケール画像を返す。
+    """
+    gray = stretch_contrast(image)
+    histogram = gray.histogram()
+    if sum(count * value for value, count in enumerate(histogram)) < (
+        128 * gray.width * gray.height
+    ):
+        gray = ImageOps.invert(gray)
+
+    mean = gray.filter(ImageFilter.BoxBlur(_BINARIZE_RADIUS))
+    # 周囲の平均より暗い量（明るい画素は0に切り詰められる）
+    darkness = ImageChops.subtract(mean, gray)
+    binary = darkness.point([0 if v >= _BINARIZE_OFFSET else 255 for v in range(256)])
+    return binary.convert("1") if bits == 1 else binary
+
+
+def enhance_image(
+    image: Image.Image, mode: str, binarize_bits: int = DEFAULT_BINARIZE_BITS
+) -> Image.Image:
+    """画質補正（コントラスト補正・二値化）を行う（透過のある画像は補正しない）"""
+    if mode == ENHANCE_OFF or "A" in image.getbands():
+        return image
+    if mode == ENHANCE_BINARIZE:
+        return binarize_adaptive(image, binarize_bits)
+    return stretch_contrast(image)
+
+
+def preprocess_image(
+    image: Image.Image, options: ImagePreprocessOptions
+) -> Image.Image:
+    """OCR送信前に画素数の上限までの縮小・グレースケール変換・画質補正を行う
+
+    二値化した画像の縮小で中間色が生じないよう、画質補正は縮小後に行う。
+    """
+    image = convert_grayscale(image, options)
+    image = scale_image(image, resolve_scale(image, options))
+    return enhance_image(image, options.enhance, options.binarize_bits)
@@ -0,0 +1,154 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from utils.config_manager import ConfigManager
+from utils.env_loader import get_user_data_dir
+
+CACHE_FILE_NAME = "ocr_cache.sqlite3"
+
+
+class OCRResultCache:
+    """OCR結果の永続キャッシュ
+
+    画像バイト列と検出タイプのハッシュをキーとしてSQLiteに保存する。
+    合計サイズが上限を超えた場合は最終参照が古いものから削除する（LRU）。
+    複数スレッドから同時に利用できる。
+
+    Attributes:
+        hits: キャッシュヒット数
+        misses: キャッシュミス数
+    """
+
+    def __init__(self, db_path: Path | str, max_size_bytes: int) -> None:
+        self.db_path: Path = Path(db_path)
+        self.max_size_bytes: int = max_size_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_cache ("
+            "key TEXT PRIMARY KEY, text TEXT NOT NULL, "
+            "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_last_access ON ocr_cache (last_access)"
+        )
+        self._conn.commit()
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_cache")
+        self._total_size: int = row.fetchone()[0]
+
+    @staticmethod
+    def make_key(content: bytes, detection_type: str) -> str:
+        """画像バイト列と検出タイプからキャッシュキーを生成"""
+        digest = hashlib.sha256(detection_type.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """キャッシュ済みのテキストを取得（存在しない場合は None）"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text FROM ocr_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            try:
+                self._conn.execute(
+                    "UPDATE ocr_cache SET last_access = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                # 最終参照の更新に失敗しても取得したテキストは返す
+                self._conn.rollback()
+                logging.warning(f"OCRキャッシュの最終参照を更新できませんでした: {e}")
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, text: str) -> None:
+        """テキストを保存し、上限を超えた分を古い順に削除"""
+        size = len(text.encode("utf-8"))
+        with self._lock:
+            total_size = self._total_size
+            try:
+                previous = self._conn.execute(
+                    "SELECT size FROM ocr_cache WHERE key = ?", (key,)
+                ).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO ocr_cache (key, text, size, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, text, size, time.time()),
+                )
+                self._total_size += size - (previous[0] if previous else 0)
+                self._evict()
+                self._conn.commit()
+            except sqlite3.Error:
+                # 書き込み途中の変更を破棄し、合計サイズを元に戻す
+                self._conn.rollback()
+                self._total_size = total_size
+                raise
+
+    def clear(self) -> None:
+        """キャッシュを全件削除"""
+        with self._lock:
+            self._conn.execute("DELETE FROM ocr_cache")
+            self._conn.commit()
+            self._total_size = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def total_size(self) -> int:
+        """保存済みテキストの合計バイト数"""
+        return self._total_size
+
+    def _evict(self) -> None:
+        """合計サイズが上限以下になるまで最終参照が古いものから削除"""
+        while self._total_size > self.max_size_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM ocr_cache ORDER BY last_access LIMIT 32"
+            ).fetchall()
+            if not rows:
+                self._total_size = 0
+                return
+            for key, size in rows:
+                if self._total_size <= self.max_size_bytes:
+                    return
+                self._conn.execute("DELETE FROM ocr_cache WHERE key = ?", (key,))
+                self._total_size -= size
+
+
+def _resolve_cache_directory(directory: str) -> Path:
+    path = Path(directory)
+    if not path.is_absolute():
+        path = get_user_data_dir() / path
+    return path
+
+
+def create_ocr_cache(config: ConfigManager) -> Optional[OCRResultCache]:
+    """config.iniの[OCRCache]セクションに従ってキャッシュを生成
+
+    無効化されている場合や生成に失敗した場合は None を返す。
+    """
+    if not config.get_ocr_cache_enabled():
+        return None
+
+    try:
+        directory = _resolve_cache_directory(config.get_ocr_cache_directory())
+        max_size_bytes = config.get_ocr_cache_max_size_mb() * 1024 * 1024
+        return OCRResultCache(directory / CACHE_FILE_NAME, max_size_bytes)
+    except (OSError, sqlite3.Error) as e:
+        logging.warning(f"OCRキャッシュを初期化できませんでした: {e}")
+        return None
@@ -0,0 +1,218 @@
+import math
+from dataclasses import dataclass
+from typing import Sequence
+
+from utils.config_manager import ConfigManager
+
+# タイル分割モード
+TILE_MODE_OFF = "off"
+TILE_MODE_AUTO = "auto"
+TILE_MODE_ALWAYS = "always"
+
+DEFAULT_TILE_MIN_MEGAPIXELS = 20.0
+DEFAULT_TILE_SIZE = 2000
+DEFAULT_TILE_OVERLAP = 200
+DEFAULT_TILE_MAX_WORKERS = 4
+
+# タイルの内側の辺からこの距離以内にかかる単語は途中で切れているとみなす
+_EDGE_MARGIN = 2
+# 異なるタイルの単語を同一とみなす重なり率（IoU）
+_DUPLICATE_IOU = 0.5
+# 重複判定に用いる格子の一辺の長さ
+_GRID_SIZE = 128
+
+# タイルの範囲（left, top, right, bottom）
+TileBox = tuple[int, int, int, int]
+
+
+@dataclass
+class TileOptions:
+    """タイル分割OCRの設定
+
+    Attributes:
+        mode: タイル分割モード（off / auto / always）
+        min_megapixels: autoモードでタイル分割する画素数の下限（百万画素単位）
+        tile_size: タイルの一辺の長さ（ピクセル）
+        overlap: 隣り合うタイルの重なり幅（最も長い単語より大きくする）
+        max_workers: 同時に実行するAPI呼び出しの最大数
+    """
+
+    mode: str = TILE_MODE_OFF
+    min_megapixels: float = DEFAULT_TILE_MIN_MEGAPIXELS
+    tile_size: int = DEFAULT_TILE_SIZE
+    overlap: int = DEFAULT_TILE_OVERLAP
+    max_workers: int = DEFAULT_TILE_MAX_WORKERS
+
+    @classmethod
+    def from_config(cls, config: ConfigManager) -> "TileOptions":
+        """config.iniの[VisionOCR]セクションから設定を生成"""
+        return cls(
+            mode=config.get_tile_mode(),
+            min_megapixels=config.get_tile_min_megapixels(),
+            tile_size=config.get_tile_size(),
+            overlap=config.get_tile_overlap(),
+            max_workers=config.get_tile_max_workers(),
+        )
+
+    def should_tile(self, width: int, height: int) -> bool:
+        """画像をタイル分割してOCRするかを判定"""
+        if self.mode == TILE_MODE_ALWAYS:
+            return width > self.tile_size or height > self.tile_size
+        if self.mode == TILE_MODE_AUTO:
+            return width * height > self.min_megapixels * 1_000_000
+        return False
+
+
+@dataclass
+class OCRWord:
+    """画像全体の座標系に変換した単語
+
+    Attributes:
+        text: 単語の文字列
+        left, top, right, bottom: 外接矩形
+        tile_index: 単語を検出したタイルの番号
+    """
+
+    text: str
+    left: float
+    top: float
+    right: float
+    bottom: float
+    tile_index: int = 0
+
+    @property
+    def width(self) -> float:
+        return self.right - self.left
+
+    @property
+    def height(self) -> float:
+        return self.bottom - self.top
+
+    @property
+    def center_y(self) -> float:
+        return (self.top + self.bottom) / 2
+
+    @property
+    def area(self) -> float:
+        return max(0.0, self.width) * max(0.0, self.height)
+
+
+def _tile_positions(length: int, tile_size: int, overlap: int) -> list[int]:
+    """1次元方向のタイルの開始位置（最後のタイルは端に揃える）"""
+    if length <= tile_size:
+        return [0]
+    step = tile_size - overlap
+    count = math.ceil((length - overlap) / step)
+    return [min(index * step, length - tile_size) for index in range(count)]
+
+
+def plan_tiles(width: int, height: int, options: TileOptions) -> list[TileBox]:
+    """画像を重なりのあるタイルへ分割する範囲を左上から行順に返す"""
+    tile_size = max(1, options.tile_size)
+    overlap = min(max(0, options.overlap), tile_size - 1)
+    return [
+        (left, top, min(left + tile_size, width), min(top + tile_size, height))
+        for top in _tile_positions(height, tile_size, overlap)
+        for left in _tile_positions(width, tile_size, overlap)
+    ]
+
+
+def _is_clipped(word: OCRWord, box: TileBox, image_size: tuple[int, int]) -> bool:
+    """単語がタイルの内側の辺（画像の端以外）で切れているかを判定"""
+    left, top, right, bottom = box
+    width, height = image_size
+    return (
+        (left > 0 and word.left - left <= _EDGE_MARGIN)
+        or (top > 0 and word.top - top <= _EDGE_MARGIN)
+        or (right < width and right - word.right <= _EDGE_MARGIN)
+        or (bottom < height and bottom - word.bottom <= _EDGE_MARGIN)
+    )
+
+
+def _iou(a: OCRWord, b: OCRWord) -> float:
+    width = min(a.right, b.right) - max(a.left, b.left)
+    height = min(a.bottom, b.bottom) - max(a.top, b.top)
+    if width <= 0 or height <= 0:
+        return 0.0
+    intersection = width * height
+    return intersection / (a.area + b.area - intersection)
+
+
+def _grid_cells(word: OCRWord) -> list[tuple[int, int]]:
+    return [
+        (x, y)
+        for x in range(int(word.left // _GRID_SIZE), int(word.right // _GRID_SIZE) + 1)
+        for y in range(int(word.top // _GRID_SIZE), int(word.bottom // _GRID_SIZE) + 1)
+    ]
+
+
+def deduplicate_words(
+    tiles: Sequence[TileBox],
+    tile_words: Sequence[Sequence[OCRWord]],
+    image_size: tuple[int, int],
+) -> list[OCRWord]:
+    """重なり部分で重複・分断された単語を除去
+
+    タイルの内側の辺で切れた単語は捨て、完全に含まれる他のタイルの結果を採用する。
+    異なるタイルで検出された外接矩形の重なりが大きい単語は1つにまとめる。
+    """
+    candidates = [
+        word
+        for box, words in zip(tiles, tile_words)
+        for word in words
+        if not _is_clipped(word, box, image_size)
+    ]
+    candidates.sort(key=lambda word: word.area, reverse=True)
+
+    kept: list[OCRWord] = []
+    grid: dict[tuple[int, int], list[OCRWord]] = {}
+    for word in candidates:
+        cells = _grid_cells(word)
+        neighbors = {id(other): other for cell in cells for other in grid.get(cell, [])}
+        if any(
+            other.tile_index != word.tile_index and _iou(word, other) >= _DUPLICATE_IOU
+            for other in neighbors.values()
+        ):
+            continue
+        kept.append(word)
+        for cell in cells:
+            grid.setdefault(cell, []).append(word)
+    return kept
+
+
+def _needs_space(previous: str, following: str) -> bool:
+    """英数字の単語の間のみ空白を挿入（日本語は詰めて連結）"""
+    return bool(previous) and previous[-1].isascii() and following[:1].isascii()
+
+
+def words_to_text(words: Sequence[OCRWord]) -> str:
+    """単語を行ごとにまとめ、上から下・左から右の読み順で連結"""
+    lines: list[list[OCRWord]] = []
+    for word in sorted(words, key=lambda word: word.center_y):
+        if lines:
+            line = lines[-1]
+            line_center = sum(other.center_y for other in line) / len(line)
+            line_height = min(other.height for other in line)
+            if abs(word.center_y - line_center) <= min(word.height, line_height) / 2:
+                line.append(word)
+                continue
+        lines.append([word])
+
+    texts: list[str] = []
+    for line in lines:
+        text = ""
+        for word in sorted(line, key=lambda word: word.left):
+            if _needs_space(text, word.text):
+                text += " "
+            text += word.text
+        texts.append(text)
+    return "\n".join(texts)
+
+
+def merge_tile_words(
+    tiles: Sequence[TileBox],
+    tile_words: Sequence[Sequence[OCRWord]],
+    image_size: tuple[int, int],
+) -> str:
+    """タイルごとの単語を重複を除いて読み順のテキストへまとめる"""
+    return words_to_text(deduplicate_words(tiles, tile_words, image_size))
@@ -0,0 +1,95 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from utils.config_manager import ConfigManager
+
+_TOKEN_EPSILON = 1e-9
+
+
+class TokenBucket:
+    """トークンバケット方式のレート制限
+
+    毎秒 rate 個のトークンを最大 burst 個まで補充し、取得できるまで呼び出し元を待機させる。
+    burst を超える数を要求した場合は、バケットが満杯になった時点で取得して不足分を
+    以降の補充から差し引く（平均レートは rate を超えない）。
+    複数スレッドから同時に利用できる。
+
+    Attributes:
+        rate: 1秒あたりのトークン補充数
+        burst: バケットの容量
+        waited_seconds: 取得待ちの合計秒数
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.waited_seconds = 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 1) -> float:
+        """トークンを取得（不足している場合は補充されるまで待機）
+
+        Returns:
+            float: 待機した秒数
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                required = min(tokens, self.burst)
+                # 浮動小数点の誤差で待機が終わらないよう僅かな不足は許容する
+                if self._tokens + _TOKEN_EPSILON >= required:
+                    self._tokens -= tokens
+                    self.waited_seconds += waited
+                    return waited
+                delay = (required - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+
+_shared_lock = threading.Lock()
+_shared_limiter: Optional[TokenBucket] = None
+
+
+def get_shared_rate_limiter(config: ConfigManager) -> Optional[TokenBucket]:
+    """プロセス全体で共有するVision API呼び出しのレート制限を取得
+
+    範囲選択・PDF処理など、すべてのOCRサービスが同じバケットを使用する。
+    config.iniの[VisionRateLimit]で無効化されている場合は None を返す。
+    """
+    global _shared_limiter
+
+    if not config.get_rate_limit_enabled():
+        return None
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = TokenBucket(
+                config.get_rate_limit_requests_per_second(),
+                config.get_rate_limit_burst(),
+            )
+        return _shared_limiter
+
+
+def reset_shared_rate_limiter() -> None:
+    """共有レート制限を破棄（次回取得時に設定から再生成）"""
+    global _shared_limiter
+
+    with _shared_lock:
+        _shared_limiter = None
@@ -0,0 +1,94 @@
+import logging
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import pyautogui
+from PIL import Image, ImageGrab
+
+# 画面の撮影方式
+SCREEN_GRAB_AUTO = "auto"
+SCREEN_GRAB_PILLOW = "pillow"
+SCREEN_GRAB_PYAUTOGUI = "pyautogui"
+SCREEN_GRAB_BACKENDS = (SCREEN_GRAB_AUTO, SCREEN_GRAB_PILLOW, SCREEN_GRAB_PYAUTOGUI)
+
+# 撮影範囲（left, top, width, height）。pyautogui.screenshot の region と同じ形式
+Region = tuple[int, int, int, int]
+
+
+class ScreenGrabber(ABC):
+    """画面を撮影する方式の基底クラス"""
+
+    name = ""
+
+    @abstractmethod
+    def grab(self, region: Optional[Region] = None) -> Image.Image:
+        """画面全体（region 省略時）または指定範囲を撮影してRGB画像を返す"""
+
+
+class PillowScreenGrabber(ScreenGrabber):
+    """PillowのImageGrabでプロセス内から撮影する
+
+    LinuxではXCBでXサーバーの画面を直接読み取り、外部コマンドの起動や
+    一時ファイルへの書き出しを行わない。WindowsではGDIから取得する。
+    """
+
+    name = SCREEN_GRAB_PILLOW
+
+    def grab(self, region: Optional[Region] = None) -> Image.Image:
+        bbox = None
+        if region is not None:
+            left, top, width, height = region
+            bbox = (left, top, left + width, top + height)
+        image = ImageGrab.grab(bbox=bbox)
+        return image if image.mode == "RGB" else image.convert("RGB")
+
+
+class PyAutoGUIScreenGrabber(ScreenGrabber):
+    """pyautoguiで撮影する（Linuxでは外部コマンドで一時ファイルへ撮影する）"""
+
+    name = SCREEN_GRAB_PYAUTOGUI
+
+    def grab(self, region: Optional[Region] = None) -> Image.Image:
+        if region is None:
+            return pyautogui.screenshot()
+        return pyautogui.screenshot(region=region)
+
+
+class FallbackScreenGrabber(ScreenGrabber):
+    """優先する方式で撮影し、失敗した場合は以降も代替の方式で撮影する
+
+    XCBに対応していないPillowやXサーバー以外の環境（Wayland等）では
+    ImageGrabが失敗するため、初回の失敗で代替の方式へ切り替える。
+    """
+
+    def __init__(self, primary: ScreenGrabber, fallback: ScreenGrabber) -> None:
+        self._primary: Optional[ScreenGrabber] = primary
+        self._fallback = fallback
+
+    @property
+    def name(self) -> str:  # type: ignore[override]
+        return (self._primary or self._fallback).name
+
+    def grab(self, region: Optional[Region] = None) -> Image.Image:
+        if self._primary is not None:
+            try:
+                return self._primary.grab(region)
+            except Exception as e:
+                logging.warning(
+                    f"{self._primary.name}での画面撮影に失敗したため、"
+                    f"{self._fallback.name}に切り替えます: {e}"
+                )
+                self._primary = None
+        return self._fallback.grab(region)
+
+
+def create_screen_grabber(backend: str = SCREEN_GRAB_AUTO) -> ScreenGrabber:
+    """撮影方式の名前から撮影に使うインスタンスを生成
+
+    auto はプロセス内で撮影するPillowを優先し、失敗した場合はpyautoguiで撮影する。
+    """
+    if backend == SCREEN_GRAB_PILLOW:
+        return PillowScreenGrabber()
+    if backend == SCREEN_GRAB_PYAUTOGUI:
+        return PyAutoGUIScreenGrabber()
+    return FallbackScreenGrabber(PillowScreenGrabber(), PyAutoGUIScreenGrabber())
@@ -0,0 +1,57 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Optional
+
+from utils.constants import UILabels, UILayout, UIMessages
+
+
+class ProgressPanel:
+    """進捗バー・状態表示・中止ボタンをまとめたパネル
+
+    処理中のみ show() で表示し、完了後は hide() で非表示にする。
+    """
+
+    def __init__(self, parent: tk.Misc, on_cancel: Callable[[], None]) -> None:
+        self.frame = tk.Frame(parent)
+        self.progressbar = ttk.Progressbar(self.frame, mode="determinate")
+        self.progressbar.pack(
+            side=tk.LEFT, fill=tk.X, expand=True, padx=UILayout.BUTTON_PADDING
+        )
+        self.status_var = tk.StringVar(master=parent, value="")
+        self.status_label = tk.Label(self.frame, textvariable=self.status_var)
+        self.status_label.pack(side=tk.LEFT, padx=UILayout.BUTTON_PADDING)
+        self.cancel_button = tk.Button(
+            self.frame, text=UILabels.BTN_CANCEL, command=on_cancel
+        )
+        self.cancel_button.pack(side=tk.LEFT, padx=UILayout.BUTTON_PADDING)
+
+    def show(self, before: Optional[tk.Misc] = None, status: str = "") -> None:
+        """パネルを表示して進捗をリセット"""
+        self.progressbar.configure(value=0, maximum=1)
+        self.status_var.set(status)
+        self.cancel_button.configure(state=tk.NORMAL)
+        pack_options = {"before": before} if before is not None else {}
+        self.frame.pack(
+            fill=tk.X,
+            padx=UILayout.FRAME_PADDING,
+            pady=UILayout.FRAME_PADDING,
+            **pack_options,
+        )
+
+    def hide(self) -> None:
+        self.frame.pack_forget()
+
+    def update_progress(
+        self, done: int, total: int, eta_seconds: Optional[float] = None
+    ) -> None:
+        """処理済み件数・総件数・残り時間を表示"""
+        self.progressbar.configure(value=done, maximum=max(1, total))
+        status = UIMessages.PROGRESS_PAGES.format(done=done, total=total)
+        if eta_seconds is not None and done < total:
+            eta = UIMessages.PROGRESS_ETA.format(eta=round(eta_seconds))
+            status = f"{status}  {eta}"
+        self.status_var.set(status)
+
+    def set_cancelling(self) -> None:
+        """中止要求後はボタンを無効化"""
+        self.cancel_button.configure(state=tk.DISABLED)